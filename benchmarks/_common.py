@@ -0,0 +1,42 @@
+""" Benchmark Setup
+
+Shared by every benchmark: adds the folder holding the timeWarp package to system paths, finds the plug-in and the
+in memory stand in for Maya, and starts Maya.
+"""
+
+# Python
+import os
+import sys
+import timeit
+
+PACKAGE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Add the folder holding the timeWarp package to system paths.
+BASE_PATH = os.path.dirname(PACKAGE_PATH)
+if BASE_PATH not in sys.path:
+    sys.path.insert(0, BASE_PATH)
+
+PLUGIN_PATH = os.path.join(PACKAGE_PATH, 'plug-ins', 'WarpStatus.py')
+FAKE_MAYA_PATH = os.path.join(PACKAGE_PATH, 'tests', 'fake_maya')
+
+# Most precise clock on every mayapy, time.perf_counter doesn't exist in Maya 2020's Python 2.7.
+timer = timeit.default_timer
+
+
+def initialize_maya(fake=False):
+    """ Start Maya in this process and load the plug-in.
+
+    Args:
+        fake (bool | False): Run against tests/fake_maya instead of Maya.
+
+    Returns:
+        None
+    """
+    if fake and FAKE_MAYA_PATH not in sys.path:
+        sys.path.insert(0, FAKE_MAYA_PATH)
+
+    import maya.standalone
+    maya.standalone.initialize()
+    import maya.cmds
+
+    maya.cmds.loadPlugin(PLUGIN_PATH, quiet=True)
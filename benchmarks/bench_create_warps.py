@@ -0,0 +1,110 @@
+""" Warp Creation Benchmark
+
+Times creating many warps with a loop of create_warp against one create_warps call, including the cost of undoing
+each.
+
+Run with mayapy:
+    mayapy benchmarks/bench_create_warps.py --warps 500
+"""
+
+# Python
+import argparse
+import json
+
+import _common
+
+
+def time_loop(warp_count, frame_count):
+    """ Create warps one at a time with create_warp.
+
+    Args:
+        warp_count (int): Number of warps to create.
+        frame_count (int): Length of playback range.
+
+    Returns:
+        dict of timing results in milliseconds.
+    """
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    maya.cmds.file(new=True, force=True)
+    maya.cmds.playbackOptions(minTime=1, maxTime=frame_count)
+
+    start = _common.timer()
+    maya.cmds.undoInfo(openChunk=True)
+    for index in range(warp_count):
+        core.create_warp(warp_name='bench{}'.format(index))
+    maya.cmds.undoInfo(closeChunk=True)
+    create_ms = (_common.timer() - start) * 1000.0
+
+    start = _common.timer()
+    maya.cmds.undo()
+    undo_ms = (_common.timer() - start) * 1000.0
+
+    return {'create_ms': create_ms, 'undo_ms': undo_ms}
+
+
+def time_batch(warp_count, frame_count):
+    """ Create warps in one call with create_warps.
+
+    Args:
+        warp_count (int): Number of warps to create.
+        frame_count (int): Length of playback range.
+
+    Returns:
+        dict of timing results in milliseconds.
+    """
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    maya.cmds.file(new=True, force=True)
+    maya.cmds.playbackOptions(minTime=1, maxTime=frame_count)
+
+    specs = [{'name': 'bench{}'.format(index), 'start': 1, 'end': frame_count} for index in range(warp_count)]
+
+    start = _common.timer()
+    core.create_warps(specs)
+    create_ms = (_common.timer() - start) * 1000.0
+
+    start = _common.timer()
+    maya.cmds.undo()
+    undo_ms = (_common.timer() - start) * 1000.0
+
+    return {'create_ms': create_ms, 'undo_ms': undo_ms}
+
+
+def main(argv=None):
+    """ Run the benchmark.
+
+    Args:
+        argv (list | None): Command line arguments.
+
+    Returns:
+        dict of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--warps', type=int, default=300, help='Number of warps to create.')
+    parser.add_argument('--frames', type=int, default=120, help='Length of playback range.')
+    parser.add_argument('--output', help='Optional path to write JSON results to.')
+    args = parser.parse_args(argv)
+
+    _common.initialize_maya()
+    import maya.cmds
+    maya.cmds.undoInfo(state=True, infinity=True)
+
+    results = {'warps': args.warps,
+               'loop': time_loop(args.warps, args.frames),
+               'batch': time_batch(args.warps, args.frames)}
+    results['speedup'] = results['loop']['create_ms'] / max(results['batch']['create_ms'], 1e-6)
+
+    print(json.dumps(results, indent=4))
+
+    if args.output:
+        with open(args.output, 'w') as file_instance:
+            json.dump(results, file_instance, indent=4)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
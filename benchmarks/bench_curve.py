@@ -0,0 +1,71 @@
+""" Warp Curve Evaluation Benchmark
+
+Times vectorized evaluation of a warp curve over a long frame array. Runs on plain Python with NumPy, no Maya needed.
+
+    python benchmarks/bench_curve.py --keys 50 --frames 100000
+"""
+
+# Python
+import argparse
+import json
+
+import numpy
+
+import _common
+
+from timeWarp.scripts import curve
+
+
+def build_curve(key_count, frame_count):
+    """ Build a monotonic warp curve spanning the frame range.
+
+    Args:
+        key_count (int): Number of keys.
+        frame_count (int): Length of the frame range.
+
+    Returns:
+        WarpCurve
+    """
+    times = numpy.linspace(1.0, frame_count, key_count)
+    values = times + numpy.sin(numpy.linspace(0.0, numpy.pi * 4.0, key_count)) * (frame_count / (key_count * 4.0))
+
+    return curve.WarpCurve(times, values, pre_infinity=curve.LINEAR, post_infinity=curve.LINEAR)
+
+
+def main(argv=None):
+    """ Run the benchmark.
+
+    Args:
+        argv (list | None): Command line arguments.
+
+    Returns:
+        dict of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, default=50, help='Number of keys on the warp curve.')
+    parser.add_argument('--frames', type=int, default=100000, help='Number of frames to evaluate.')
+    parser.add_argument('--substeps', type=int, default=4, help='Samples per frame.')
+    parser.add_argument('--repeat', type=int, default=10, help='Number of timed runs.')
+    args = parser.parse_args(argv)
+
+    warp_curve = build_curve(args.keys, args.frames)
+    frames = numpy.linspace(0.0, args.frames + 1.0, args.frames * args.substeps)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = _common.timer()
+        warp_curve.evaluate(frames)
+        timings.append((_common.timer() - start) * 1000.0)
+
+    results = {'keys': args.keys,
+               'samples': len(frames),
+               'best_ms': min(timings),
+               'mean_ms': sum(timings) / len(timings)}
+
+    print(json.dumps(results, indent=4))
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+""" Startup Benchmark
+
+Times importing the timeWarp modules and loading the WarpStatus plug-in. Each run is a fresh mayapy process so
+imports are cold, and Maya's own start up is timed separately so it can be told apart.
+
+Run with mayapy:
+    mayapy benchmarks/bench_startup.py --runs 5
+"""
+
+# Python
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import _common
+
+# Modules timed in import order, each excludes the modules before it.
+MODULES = ['timeWarp.scripts.undo', 'timeWarp.scripts.membership', 'timeWarp.scripts.core',
+           'timeWarp.scripts.curve', 'timeWarp.scripts.widget', 'timeWarp.scripts.batch']
+
+
+def time_startup():
+    """ Time one cold start up in this process.
+
+    Returns:
+        dict of timing results in milliseconds.
+    """
+    import importlib
+
+    results = {}
+
+    start = _common.timer()
+    import maya.standalone
+    maya.standalone.initialize()
+    import maya.cmds
+    results['maya_ms'] = (_common.timer() - start) * 1000.0
+
+    for module in MODULES:
+        start = _common.timer()
+        importlib.import_module(module)
+        results[module] = (_common.timer() - start) * 1000.0
+
+    # Importing must not pull in Qt, only opening the UI should.
+    results['qt_imported'] = 'PySide2' in sys.modules
+
+    start = _common.timer()
+    maya.cmds.loadPlugin(_common.PLUGIN_PATH, quiet=True)
+    results['plugin_ms'] = (_common.timer() - start) * 1000.0
+
+    return results
+
+
+def main(argv=None):
+    """ Run the benchmark.
+
+    Args:
+        argv (list | None): Command line arguments.
+
+    Returns:
+        dict of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh processes to time.')
+    parser.add_argument('--output', help='Optional path to write JSON results to.')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(time_startup()))
+        return None
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.check_output([sys.executable, os.path.realpath(__file__), '--child'],
+                                         universal_newlines=True)
+        # Maya may print to stdout while starting, the results are the last line.
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    results = {'runs': args.runs, 'qt_imported': any(run['qt_imported'] for run in runs)}
+    for key in ['maya_ms'] + MODULES + ['plugin_ms']:
+        timings = sorted(run[key] for run in runs)
+        results[key] = {'best_ms': timings[0], 'median_ms': timings[len(timings) // 2]}
+
+    print(json.dumps(results, indent=4))
+
+    if args.output:
+        with open(args.output, 'w') as file_instance:
+            json.dump(results, file_instance, indent=4)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+""" Synthetic Rig Benchmark Suite
+
+Builds a parametric scene of N keyed nodes with M animated attributes each, spread over K warps and F frames,
+then times each stage of a warp's life: create_warp, get_inputs, apply_warp, get_warped_nodes, WarpStatus
+evaluation, remove_warp and bake_warp. Results are written as JSON so runs can be compared for regressions.
+
+Run with mayapy:
+    mayapy benchmarks/bench_suite.py --nodes 200 --curves 6 --warps 4 --frames 120
+
+Or without Maya against the in memory stand in from tests/fake_maya:
+    python benchmarks/bench_suite.py --fake
+"""
+
+# Python
+import argparse
+import json
+
+import _common
+
+ATTRIBUTES = ['translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ',
+              'scaleX', 'scaleY', 'scaleZ', 'visibility']
+
+
+class Timer(object):
+    """ Time a stage and the number of items it worked on."""
+
+    def __init__(self, results, name, items=1):
+        self.results = results
+        self.name = name
+        self.items = items
+        self.start = None
+
+    def __enter__(self):
+        self.start = _common.timer()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        total_ms = (_common.timer() - self.start) * 1000.0
+        self.results[self.name] = {'total_ms': total_ms, 'items': self.items,
+                                   'per_item_ms': total_ms / max(self.items, 1)}
+
+
+def build_rig(node_count, curve_count, frame_count, key_step):
+    """ Build benchmark nodes with keyed attributes.
+
+    Args:
+        node_count (int): Number of nodes to create.
+        curve_count (int): Number of keyed attributes on each node.
+        frame_count (int): Length of playback range.
+        key_step (int): Frames between keys.
+
+    Returns:
+        list of nodes.
+    """
+    import maya.cmds
+
+    attributes = ATTRIBUTES[:curve_count]
+    frames = list(range(1, frame_count + 1, key_step))
+
+    nodes = []
+    for index in range(node_count):
+        node = maya.cmds.spaceLocator(name='benchLoc{}'.format(index))[0]
+        for attribute_index, attribute in enumerate(attributes):
+            for frame in frames:
+                maya.cmds.setKeyframe(node, attribute=attribute, time=frame,
+                                      value=(index + attribute_index + frame) % 7)
+        nodes.append(node)
+
+    return nodes
+
+
+def run_suite(node_count, curve_count, warp_count, frame_count, key_step=10, method='simulation'):
+    """ Build a rig and time each warp operation on it.
+
+    Nodes are dealt out to the warps in turn, so every warp drives roughly node_count / warp_count nodes.
+
+    Args:
+        node_count (int): Number of nodes in the rig.
+        curve_count (int): Number of keyed attributes on each node.
+        warp_count (int): Number of warps.
+        frame_count (int): Length of playback range.
+        key_step (int | 10): Frames between keys on the rig's curves.
+        method (str | simulation): Bake method passed to bake_warp.
+
+    Returns:
+        dict of timing results in milliseconds.
+    """
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    maya.cmds.file(new=True, force=True)
+    maya.cmds.playbackOptions(minTime=1, maxTime=frame_count)
+    maya.cmds.undoInfo(state=True, infinity=True)
+
+    results = {}
+
+    with Timer(results, 'build_rig', node_count * curve_count):
+        nodes = build_rig(node_count, curve_count, frame_count, key_step)
+
+    with Timer(results, 'create_warp', warp_count):
+        warps = [core.create_warp(warp_name='bench{}'.format(index)) for index in range(warp_count)]
+
+    # Give every warp a key so it changes time and the bakes have something to do.
+    for warp in warps:
+        maya.cmds.setKeyframe(core.get_warp_curve(warp)[0], time=frame_count / 2.0, value=frame_count / 3.0)
+
+    groups = dict((warp, nodes[index::warp_count]) for index, warp in enumerate(warps))
+
+    with Timer(results, 'get_inputs', node_count):
+        for node in nodes:
+            core.get_inputs(node)
+
+    with Timer(results, 'apply_warp', node_count * curve_count):
+        for warp, group in groups.items():
+            maya.cmds.select(group, replace=True)
+            core.apply_warp(warp)
+
+    with Timer(results, 'get_warped_nodes', warp_count):
+        for warp in warps:
+            core.get_warped_nodes(warp)
+
+    # Reading one warped attribute per node pulls it through the warp at every frame.
+    plugs = ['{}.{}'.format(node, ATTRIBUTES[0]) for node in nodes]
+    with Timer(results, 'evaluate', frame_count):
+        for frame in range(1, frame_count + 1):
+            maya.cmds.currentTime(frame, update=True)
+            for plug in plugs:
+                maya.cmds.getAttr(plug)
+
+    with Timer(results, 'remove_warp', node_count * curve_count):
+        for warp, group in groups.items():
+            maya.cmds.select(group, replace=True)
+            core.remove_warp(warp)
+
+    # Undo the removals so the warps have curves to bake.
+    for _ in warps:
+        maya.cmds.undo()
+
+    with Timer(results, 'bake_warp', node_count * curve_count):
+        for warp in warps:
+            core.bake_warp(warp, method=method)
+
+    return results
+
+
+def main(argv=None):
+    """ Run the benchmark.
+
+    Args:
+        argv (list | None): Command line arguments.
+
+    Returns:
+        dict of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', type=int, default=200, help='Number of nodes in the rig.')
+    parser.add_argument('--curves', type=int, default=6, choices=range(1, len(ATTRIBUTES) + 1), metavar='1-10',
+                        help='Number of keyed attributes on each node.')
+    parser.add_argument('--warps', type=int, default=4, help='Number of warps the nodes are split between.')
+    parser.add_argument('--frames', type=int, default=120, help='Length of playback range.')
+    parser.add_argument('--key-step', type=int, default=10, help='Frames between keys on the rig.')
+    parser.add_argument('--method', default='simulation', choices=['simulation', 'remap', 'adaptive'],
+                        help='Bake method to time.')
+    parser.add_argument('--fake', action='store_true', help='Run against tests/fake_maya instead of Maya.')
+    parser.add_argument('--output', help='Optional path to write JSON results to.')
+    args = parser.parse_args(argv)
+
+    _common.initialize_maya(fake=args.fake)
+    import maya.cmds
+
+    results = {'maya': 'fake' if args.fake else maya.cmds.about(version=True),
+               'nodes': args.nodes, 'curves': args.curves, 'warps': args.warps, 'frames': args.frames,
+               'key_step': args.key_step, 'method': args.method,
+               'timings': run_suite(args.nodes, args.curves, args.warps, args.frames, key_step=args.key_step,
+                                    method=args.method)}
+
+    print(json.dumps(results, indent=4))
+
+    if args.output:
+        with open(args.output, 'w') as file_instance:
+            json.dump(results, file_instance, indent=4)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
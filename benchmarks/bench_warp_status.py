@@ -0,0 +1,121 @@
+""" WarpStatus Evaluation Benchmark
+
+Builds a scene with hundreds of warps, each driving a keyed locator, then reports the per-frame evaluation time
+for every Evaluation Manager mode.
+
+Run with mayapy:
+    mayapy benchmarks/bench_warp_status.py --warps 500 --frames 200
+"""
+
+# Python
+import argparse
+import json
+
+import _common
+
+EVALUATION_MODES = ['off', 'serial', 'parallel']
+
+
+def build_scene(warp_count, frame_count):
+    """ Build benchmark scene of keyed locators each driven by their own warp.
+
+    Args:
+        warp_count (int): Number of warps to create.
+        frame_count (int): Length of playback range.
+
+    Returns:
+        list of warped plugs.
+    """
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    maya.cmds.file(new=True, force=True)
+    maya.cmds.playbackOptions(minTime=1, maxTime=frame_count)
+
+    plugs = []
+    for index in range(warp_count):
+        warp = core.create_warp(warp_name='bench{}'.format(index))
+        maya.cmds.setKeyframe(core.get_warp_curve(warp)[0], time=frame_count / 2.0, value=frame_count / 3.0)
+
+        locator = maya.cmds.spaceLocator(name='benchLoc{}'.format(index))[0]
+        maya.cmds.setKeyframe(locator, attribute='translateX', time=1, value=0)
+        maya.cmds.setKeyframe(locator, attribute='translateX', time=frame_count, value=index)
+
+        maya.cmds.select(locator, replace=True)
+        core.apply_warp(warp)
+        plugs.append('{}.translateX'.format(locator))
+
+    return plugs
+
+
+def time_playback(frame_count, mode, plugs):
+    """ Step through the playback range and time each frame, reading every warped plug so it's pulled through
+    its warp like drawing the scene would.
+
+    Args:
+        frame_count (int): Length of playback range.
+        mode (str): Evaluation Manager mode.
+        plugs (list): Warped plugs to read each frame.
+
+    Returns:
+        dict of timing results in milliseconds.
+    """
+    import maya.cmds
+
+    maya.cmds.evaluationManager(mode=mode)
+    # Warm up so the evaluation graph is built before timing.
+    for frame in (1, 2):
+        maya.cmds.currentTime(frame, update=True)
+        for plug in plugs:
+            maya.cmds.getAttr(plug)
+
+    frame_times = []
+    for frame in range(1, frame_count + 1):
+        start = _common.timer()
+        maya.cmds.currentTime(frame, update=True)
+        for plug in plugs:
+            maya.cmds.getAttr(plug)
+        frame_times.append((_common.timer() - start) * 1000.0)
+
+    frame_times.sort()
+
+    return {'mean_ms': sum(frame_times) / len(frame_times),
+            'median_ms': frame_times[len(frame_times) // 2],
+            'max_ms': frame_times[-1]}
+
+
+def main(argv=None):
+    """ Run the benchmark.
+
+    Args:
+        argv (list | None): Command line arguments.
+
+    Returns:
+        dict of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--warps', type=int, default=300, help='Number of warps in the scene.')
+    parser.add_argument('--frames', type=int, default=120, help='Number of frames to evaluate.')
+    parser.add_argument('--output', help='Optional path to write JSON results to.')
+    args = parser.parse_args(argv)
+
+    _common.initialize_maya()
+    import maya.cmds
+
+    plugs = build_scene(args.warps, args.frames)
+
+    results = {'warps': args.warps, 'frames': args.frames, 'modes': {}}
+    for mode in EVALUATION_MODES:
+        results['modes'][mode] = time_playback(args.frames, mode, plugs)
+
+    print(json.dumps(results, indent=4))
+
+    if args.output:
+        with open(args.output, 'w') as file_instance:
+            json.dump(results, file_instance, indent=4)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
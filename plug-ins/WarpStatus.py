@@ -1,15 +1,116 @@
 """ Warp Status Node"""
 
-import maya.OpenMaya as om
-import maya.OpenMayaMPx as ompx
+# Python
+import array
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 
 import maya.cmds
+import maya.mel
 
 
 from timeWarp._versions import __version__, __doc__, __author__, __email__, __copyright__
 
 
-class WarpStatus(ompx.MPxNode):
+# Attributes of an animCurve holding its keys, tangents and infinity, edits to anything else keep the cache table.
+KEY_ATTRIBUTES = frozenset(["keyTimeValue", "keyTanInX", "keyTanInY", "keyTanOutX", "keyTanOutY", "keyTanInType",
+                            "keyTanOutType", "keyTanLocked", "keyWeightLocked", "keyBreakdown", "weightedTangents",
+                            "preInfinity", "postInfinity"])
+
+# Attribute messages of values and array elements changing.
+EDIT_MESSAGES = (om.MNodeMessage.kAttributeSet | om.MNodeMessage.kAttributeArrayAdded |
+                 om.MNodeMessage.kAttributeArrayRemoved)
+
+# Attribute messages of connections changing.
+CONNECTION_MESSAGES = om.MNodeMessage.kConnectionMade | om.MNodeMessage.kConnectionBroken
+
+# Scene events the cache table is sampled over.
+TABLE_EVENTS = ("playbackRangeChanged", "timeUnitChanged")
+
+
+def maya_useNewAPI():
+    """ Tell Maya this plugin uses the Python API 2.0.
+
+    Returns:
+        None
+    """
+    pass
+
+
+def get_source_node(plug):
+    """ Find the node driving a plug, looking through any unitConversion node.
+
+    Args:
+        plug (MPlug): Destination plug.
+
+    Returns:
+        MObject of the node, or None if there is none.
+    """
+    source = plug.source()
+
+    if not source.isNull and source.node().hasFn(om.MFn.kUnitConversion):
+        source = om.MFnDependencyNode(source.node()).findPlug('input', False).source()
+
+    if source.isNull:
+        return None
+
+    return source.node()
+
+
+def get_source_curve(plug):
+    """ Find the animCurve driving a plug, looking through any unitConversion node.
+
+    Args:
+        plug (MPlug): Destination plug.
+
+    Returns:
+        MObject of the curve, or None if there is none.
+    """
+    source = get_source_node(plug)
+
+    if source is None or not source.hasFn(om.MFn.kAnimCurve):
+        return None
+
+    return source
+
+
+def is_time_driven(curve):
+    """ Check if a curve plays at scene time, its input unconnected or driven by time. Curves driven by anything else,
+    like another warp, play at a time only the DG knows.
+
+    Args:
+        curve (MObject): animCurve node.
+
+    Returns:
+        Bool if driven by time.
+    """
+    source = get_source_node(om.MFnDependencyNode(curve).findPlug('input', False))
+
+    return source is None or source.hasFn(om.MFn.kTime)
+
+
+def evaluate_time_curve(curve_fn, frame, ui_unit):
+    """ Evaluate a time to time curve directly, without pulling it through the DG.
+
+    Args:
+        curve_fn (MFnAnimCurve): Function set of the curve.
+        frame (float): Frame to evaluate at.
+        ui_unit (int): MTime unit of frames.
+
+    Returns:
+        float of the curve's time in frames.
+    """
+    value = curve_fn.evaluate(om.MTime(frame, ui_unit))
+
+    # Time curves give back time, in seconds when returned as a plain value.
+    if not isinstance(value, om.MTime):
+        value = om.MTime(value, om.MTime.kSeconds)
+
+    return value.asUnits(ui_unit)
+
+
+class WarpStatus(om.MPxNode):
 
     TYPE_NAME = "WarpStatus"
     TYPE_ID = om.MTypeId(0x00000123)
@@ -21,39 +122,347 @@ class WarpStatus(ompx.MPxNode):
 
     # Output attribute
     outputAttr = None
+    memberOutputAttr = None
 
     def __init__(self, name=None):
         super(WarpStatus, self).__init__()
 
         self.nodeName = name or self.TYPE_NAME
 
+        # Lookup table of the warp curve over the playback range as (start, resolution, samples), only built while
+        # the cache is enabled. It is built and thrown away on the main thread, compute only reads it.
+        self.table = None
+        self.table_pending = False
+        self.curve_callback = None
+        self.callbacks = []
+        self.removed = False
+
+    def postConstructor(self):
+        """ Watch the cache settings and the scene, and make sure the callbacks are removed along with the node.
+
+        Returns:
+            None
+        """
+        self.watch()
+
     def compute(self, plug, data_block):
         """ Compute method to calculate the output value
 
         Args:
             plug (MPlug): Plug to compute.
-            data_block: Data block to evaluate
+            data_block (MDataBlock): Data block to evaluate
 
         Returns:
             None
         """
-        if plug == WarpStatus.outputAttr:
-
-            # Get input values
-            active_input = data_block.inputValue(WarpStatus.warpActiveAttr).asBool()
-            warp = data_block.inputValue(WarpStatus.warpInputAttr).asFloat()
-            time = data_block.inputValue(WarpStatus.timeInputAttr).asFloat()
-
-            # Calculate the output value based on the active input
-            if active_input:
-                output = warp
-            else:
-                output = time
+        attribute = plug.attribute()
 
+        if attribute == WarpStatus.outputAttr:
             # Set the output value
             output_handle = data_block.outputValue(WarpStatus.outputAttr)
-            output_handle.setFloat(output)
-            data_block.setClean(plug)
+            output_handle.setFloat(self.warped_time(data_block))
+
+        elif attribute == WarpStatus.memberOutputAttr:
+            self.compute_members(data_block, self.warped_time(data_block))
+
+        else:
+            return None
+
+        data_block.setClean(plug)
+
+    def warped_time(self, data_block):
+        """ Calculate the warped time shared by output and every member.
+
+        Args:
+            data_block (MDataBlock): Data block to evaluate
+
+        Returns:
+            float of time.
+        """
+        # Only the inputs needed for the current state are pulled, an inactive warp never evaluates its curve.
+        active_input = data_block.inputValue(WarpStatus.warpActiveAttr).asBool()
+
+        # Calculate the output value based on the active input
+        if active_input:
+            output = None
+
+            # The cache answers from its table so the warp curve isn't pulled.
+            if data_block.inputValue(WarpStatus.cacheEnabledAttr).asBool():
+                output = self.lookup(data_block.inputValue(WarpStatus.timeInputAttr).asFloat())
+
+            if output is None:
+                output = data_block.inputValue(WarpStatus.warpInputAttr).asFloat()
+        else:
+            output = data_block.inputValue(WarpStatus.timeInputAttr).asFloat()
+
+        return output
+
+    def compute_members(self, data_block, time):
+        """ Write every member output, the warped time scaled and offset by that member's settings.
+
+        Args:
+            data_block (MDataBlock): Data block to evaluate
+            time (float): Warped time.
+
+        Returns:
+            None
+        """
+        members = {}
+        member_handle = data_block.inputArrayValue(WarpStatus.memberAttr)
+        for physical_index in range(len(member_handle)):
+            member_handle.jumpToPhysicalElement(physical_index)
+            member = member_handle.inputValue()
+            members[member_handle.elementLogicalIndex()] = (member.child(WarpStatus.memberOffsetAttr).asFloat(),
+                                                            member.child(WarpStatus.memberScaleAttr).asFloat())
+
+        # Connected outputs without member settings play the warp unchanged.
+        output_plug = om.MPlug(self.thisMObject(), WarpStatus.memberOutputAttr)
+        indices = set(members).union(output_plug.getExistingArrayAttributeIndices())
+
+        output_handle = data_block.outputArrayValue(WarpStatus.memberOutputAttr)
+        builder = output_handle.builder()
+        for index in sorted(indices):
+            offset, scale = members.get(index, (0.0, 1.0))
+            builder.addElement(index).setFloat(time * scale + offset)
+
+        output_handle.set(builder)
+        output_handle.setAllClean()
+
+    def lookup(self, time):
+        """ Look up the warped time in the cache table.
+
+        Args:
+            time (float): Scene time in frames.
+
+        Returns:
+            float of warped time, or None if the time is outside of the table or there is no table yet.
+        """
+        table = self.table
+
+        if table is None:
+            return None
+
+        start, resolution, samples = table
+        last = len(samples) - 1
+        position = (time - start) * resolution
+
+        if position < 0.0 or position > last:
+            return None
+
+        if not last:
+            return samples[0]
+
+        index = min(int(position), last - 1)
+
+        return samples[index] + (samples[index + 1] - samples[index]) * (position - index)
+
+    def schedule_table(self):
+        """ Build the cache table once Maya is idle, so a run of edits builds it once and never inside compute.
+
+        Returns:
+            None
+        """
+        if self.table_pending:
+            return
+
+        import maya.utils
+
+        self.table_pending = True
+        maya.utils.executeDeferred(self.build_table)
+
+    def build_table(self):
+        """ Sample the warp curve over the playback range into the cache table, or throw the table away if the cache
+        is disabled.
+
+        Returns:
+            None
+        """
+        self.table_pending = False
+        self.clear_cache()
+
+        if self.removed:
+            return
+
+        node = self.thisMObject()
+        if not om.MPlug(node, WarpStatus.cacheEnabledAttr).asBool():
+            return
+
+        curve = self.warp_curve()
+        if curve is None:
+            return
+
+        # Key edits and input connections on the curve throw the table away.
+        self.curve_callback = om.MNodeMessage.addAttributeChangedCallback(curve, self.on_curve_changed)
+
+        # The table samples the curve at scene time, which is only what the curve plays if time drives it.
+        if not is_time_driven(curve):
+            return
+
+        curve_fn = oma.MFnAnimCurve(curve)
+        ui_unit = om.MTime.uiUnit()
+        start = oma.MAnimControl.minTime().asUnits(ui_unit)
+        end = oma.MAnimControl.maxTime().asUnits(ui_unit)
+        resolution = max(om.MPlug(node, WarpStatus.cacheResolutionAttr).asInt(), 1)
+        sample_count = int(round((end - start) * resolution)) + 1
+
+        samples = array.array('d', [evaluate_time_curve(curve_fn, start + sample / float(resolution), ui_unit)
+                                    for sample in range(sample_count)])
+        self.table = (start, resolution, samples)
+
+    def warp_curve(self):
+        """ Find the animCurve driving warpInput, looking through the unitConversion node.
+
+        Returns:
+            MObject of the curve, or None if there is none.
+        """
+        return get_source_curve(om.MPlug(self.thisMObject(), WarpStatus.warpInputAttr))
+
+    def clear_cache(self):
+        """ Throw away the cache table and stop watching the curve.
+
+        Returns:
+            None
+        """
+        if self.curve_callback is not None:
+            om.MMessage.removeCallback(self.curve_callback)
+
+        self.table = None
+        self.curve_callback = None
+
+    def watch(self):
+        """ Add the callbacks that rebuild the cache table, unless they are already there.
+
+        Returns:
+            None
+        """
+        self.removed = False
+
+        if self.callbacks:
+            return
+
+        node = self.thisMObject()
+        self.callbacks.append(om.MNodeMessage.addNodePreRemovalCallback(node, self.on_removed))
+        self.callbacks.append(om.MNodeMessage.addAttributeChangedCallback(node, self.on_settings_changed))
+        for event in TABLE_EVENTS:
+            self.callbacks.append(om.MEventMessage.addEventCallback(event, self.on_scene_changed))
+
+    def on_curve_changed(self, message, plug, other_plug, client_data):
+        """ Attribute changed callback of the warp curve, key edits and input connections throw the table away and
+        build a new one.
+
+        Args:
+            message (int): Attribute message type.
+            plug (MPlug): Changed plug.
+            other_plug (MPlug): Other plug of a connection change.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        if not message & (EDIT_MESSAGES | CONNECTION_MESSAGES):
+            return
+
+        # Key values are children of array elements, the attribute that names the edit is the top level array.
+        while plug.isChild:
+            plug = plug.parent()
+        if plug.isElement:
+            plug = plug.array()
+
+        name = om.MFnAttribute(plug.attribute()).name
+
+        if (message & EDIT_MESSAGES and name in KEY_ATTRIBUTES) or (message & CONNECTION_MESSAGES and name == "input"):
+            self.table = None
+            self.schedule_table()
+
+    def on_settings_changed(self, message, plug, other_plug, client_data):
+        """ Attribute changed callback of this node, the cache settings build a new table.
+
+        Args:
+            message (int): Attribute message type.
+            plug (MPlug): Changed plug.
+            other_plug (MPlug): Other plug of a connection change.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        if message & om.MNodeMessage.kAttributeSet and plug in (WarpStatus.cacheEnabledAttr,
+                                                                 WarpStatus.cacheResolutionAttr):
+            self.schedule_table()
+
+    def on_scene_changed(self, client_data):
+        """ Event callback of the playback range and time unit the table is sampled over.
+
+        Args:
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        if self.table is not None:
+            self.schedule_table()
+
+    def on_removed(self, node, client_data):
+        """ Pre removal callback of this node. Undoing the delete connects the warp curve again, which adds the
+        callbacks back.
+
+        Args:
+            node (MObject): This node.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        self.clear_cache()
+        self.removed = True
+
+        om.MMessage.removeCallbacks(self.callbacks)
+        self.callbacks = []
+
+    def connectionMade(self, plug, other_plug, as_source):
+        """ A new warp curve means a new table.
+
+        Args:
+            plug (MPlug): Plug on this node.
+            other_plug (MPlug): Plug on the other node.
+            as_source (bool): If this node is the source.
+
+        Returns:
+            None
+        """
+        if plug == WarpStatus.warpInputAttr:
+            self.clear_cache()
+            self.watch()
+            self.schedule_table()
+
+        return om.MPxNode.connectionMade(self, plug, other_plug, as_source)
+
+    def connectionBroken(self, plug, other_plug, as_source):
+        """ Without the warp curve the table is stale.
+
+        Args:
+            plug (MPlug): Plug on this node.
+            other_plug (MPlug): Plug on the other node.
+            as_source (bool): If this node is the source.
+
+        Returns:
+            None
+        """
+        if plug == WarpStatus.warpInputAttr:
+            self.clear_cache()
+
+        return om.MPxNode.connectionBroken(self, plug, other_plug, as_source)
+
+    def schedulingType(self):
+        """ Scheduling type for the Evaluation Manager.
+
+        Compute only reads the cache table. The table is an immutable tuple that is built and swapped in whole on the
+        main thread through executeDeferred, never inside compute, so WarpStatus nodes can be evaluated concurrently.
+
+        Returns:
+            MPxNode.kParallel
+        """
+        return om.MPxNode.kParallel
 
     @staticmethod
     def creator():
@@ -62,7 +471,7 @@ class WarpStatus(ompx.MPxNode):
         Returns:
             instance of the node
         """
-        return ompx.asMPxPtr(WarpStatus())
+        return WarpStatus()
 
     @staticmethod
     def initialize():
@@ -72,39 +481,90 @@ class WarpStatus(ompx.MPxNode):
             None
         """
         attr = om.MFnNumericAttribute()
+        compound = om.MFnCompoundAttribute()
 
         # Create active input attribute
         WarpStatus.warpActiveAttr = attr.create("warpActive", "act", om.MFnNumericData.kBoolean, True)
-        attr.setWritable(True)
-        attr.setStorable(True)
-        attr.setKeyable(True)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
         WarpStatus.addAttribute(WarpStatus.warpActiveAttr)
 
         # Create warp attribute
         WarpStatus.warpInputAttr = attr.create("warpInput", "wi", om.MFnNumericData.kFloat, 0.0)
-        attr.setWritable(True)
-        attr.setStorable(True)
-        attr.setKeyable(True)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
         WarpStatus.addAttribute(WarpStatus.warpInputAttr)
 
         # Create time attribute
         WarpStatus.timeInputAttr = attr.create("timeInput", "ti", om.MFnNumericData.kFloat, 0.0)
-        attr.setWritable(True)
-        attr.setStorable(True)
-        attr.setKeyable(True)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
         WarpStatus.addAttribute(WarpStatus.timeInputAttr)
 
+        # Create cache attributes
+        WarpStatus.cacheEnabledAttr = attr.create("cacheEnabled", "ce", om.MFnNumericData.kBoolean, False)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = False
+        attr.channelBox = True
+        WarpStatus.addAttribute(WarpStatus.cacheEnabledAttr)
+
+        WarpStatus.cacheResolutionAttr = attr.create("cacheResolution", "cr", om.MFnNumericData.kInt, 4)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = False
+        attr.setMin(1)
+        attr.channelBox = True
+        WarpStatus.addAttribute(WarpStatus.cacheResolutionAttr)
+
         # Create output attribute
         WarpStatus.outputAttr = attr.create("output", "out", om.MFnNumericData.kFloat, 0.0)
-        attr.setWritable(False)
-        attr.setStorable(False)
-        attr.setReadable(True)
+        attr.writable = False
+        attr.storable = False
+        attr.readable = True
         WarpStatus.addAttribute(WarpStatus.outputAttr)
 
-        # Attribute affects
-        WarpStatus.attributeAffects(WarpStatus.warpActiveAttr, WarpStatus.outputAttr)
-        WarpStatus.attributeAffects(WarpStatus.warpInputAttr, WarpStatus.outputAttr)
-        WarpStatus.attributeAffects(WarpStatus.timeInputAttr, WarpStatus.outputAttr)
+        # Create crowd member attributes, each member plays the warp with its own offset and scale.
+        WarpStatus.memberOffsetAttr = attr.create("memberOffset", "mo", om.MFnNumericData.kFloat, 0.0)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
+
+        WarpStatus.memberScaleAttr = attr.create("memberScale", "ms", om.MFnNumericData.kFloat, 1.0)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
+
+        WarpStatus.memberAttr = compound.create("member", "mem")
+        compound.addChild(WarpStatus.memberOffsetAttr)
+        compound.addChild(WarpStatus.memberScaleAttr)
+        compound.array = True
+        compound.usesArrayDataBuilder = True
+        WarpStatus.addAttribute(WarpStatus.memberAttr)
+
+        WarpStatus.memberOutputAttr = attr.create("memberOutput", "mout", om.MFnNumericData.kFloat, 0.0)
+        attr.writable = False
+        attr.storable = False
+        attr.readable = True
+        attr.array = True
+        attr.usesArrayDataBuilder = True
+        WarpStatus.addAttribute(WarpStatus.memberOutputAttr)
+
+        # Attribute affects. They are static so the Evaluation Manager's graph holds however warpActive changes,
+        # compute still only pulls the inputs the current state reads.
+        for output_attr in (WarpStatus.outputAttr, WarpStatus.memberOutputAttr):
+            WarpStatus.attributeAffects(WarpStatus.warpInputAttr, output_attr)
+            WarpStatus.attributeAffects(WarpStatus.timeInputAttr, output_attr)
+            WarpStatus.attributeAffects(WarpStatus.warpActiveAttr, output_attr)
+            WarpStatus.attributeAffects(WarpStatus.cacheEnabledAttr, output_attr)
+            WarpStatus.attributeAffects(WarpStatus.cacheResolutionAttr, output_attr)
+
+        WarpStatus.attributeAffects(WarpStatus.memberAttr, WarpStatus.memberOutputAttr)
+        WarpStatus.attributeAffects(WarpStatus.memberOffsetAttr, WarpStatus.memberOutputAttr)
+        WarpStatus.attributeAffects(WarpStatus.memberScaleAttr, WarpStatus.memberOutputAttr)
 
     @staticmethod
     def create_menu():
@@ -180,6 +640,10 @@ class WarpStatus(ompx.MPxNode):
 
         menu_name = "ATKMenu"
 
+        # Batch sessions, or unloading before the deferred menu was built, leave nothing to delete.
+        if maya.cmds.about(batch=True) or not maya.cmds.menuItem("ATKTimeWarpMenu", exists=True):
+            return
+
         # Check if we have other ATK tools first if so just delete time warp.
         if maya.cmds.menu(menu_name, query=True, numberOfItems=True) > 1:
             maya.cmds.deleteUI("ATKTimeWarpMenu", menuItem=True)
@@ -189,6 +653,253 @@ class WarpStatus(ompx.MPxNode):
             maya.cmds.deleteUI(menu_name)
 
 
+class WarpStack(om.MPxNode):
+    """ Composites several warp curves in a single compute.
+
+    Each layer's curve is evaluated at the time given by the layers before it, then blended by the layer weight:
+    time = time + weight * (curve(time) - time). The final time drives curves just like WarpStatus.output.
+    """
+
+    TYPE_NAME = "WarpStack"
+    TYPE_ID = om.MTypeId(0x00000124)
+
+    # Input attributes
+    timeInputAttr = None
+    layerAttr = None
+    layerInputAttr = None
+    layerEnableAttr = None
+    layerWeightAttr = None
+
+    # Output attribute
+    outputAttr = None
+
+    def __init__(self):
+        super(WarpStack, self).__init__()
+
+        # Curve function sets of each layer by logical index, refreshed when layer connections change.
+        self.curves = None
+
+    def compute(self, plug, data_block):
+        """ Compute method to composite the layers.
+
+        Args:
+            plug (MPlug): Plug to compute.
+            data_block (MDataBlock): Data block to evaluate
+
+        Returns:
+            None
+        """
+        if plug != WarpStack.outputAttr:
+            return None
+
+        if self.curves is None:
+            self.curves = self.get_layer_curves()
+
+        ui_unit = om.MTime.uiUnit()
+        time = data_block.inputValue(WarpStack.timeInputAttr).asFloat()
+
+        # The layer inputs are never pulled, they only carry dirty from the curves. Each curve is evaluated directly
+        # at the time built up by the layers before it.
+        layers = data_block.inputArrayValue(WarpStack.layerAttr)
+        for physical_index in range(len(layers)):
+            layers.jumpToPhysicalElement(physical_index)
+            layer = layers.inputValue()
+
+            curve_fn = self.curves.get(layers.elementLogicalIndex())
+            weight = layer.child(WarpStack.layerWeightAttr).asFloat()
+
+            if curve_fn is None or not weight or not layer.child(WarpStack.layerEnableAttr).asBool():
+                continue
+
+            time += weight * (evaluate_time_curve(curve_fn, time, ui_unit) - time)
+
+        output_handle = data_block.outputValue(WarpStack.outputAttr)
+        output_handle.setFloat(time)
+        data_block.setClean(plug)
+
+    def get_layer_curves(self):
+        """ Find the warp curve of every layer.
+
+        Returns:
+            dict of logical index to MFnAnimCurve.
+        """
+        curves = {}
+        layer_plug = om.MPlug(self.thisMObject(), WarpStack.layerAttr)
+
+        for index in layer_plug.getExistingArrayAttributeIndices():
+            curve = get_source_curve(layer_plug.elementByLogicalIndex(index).child(WarpStack.layerInputAttr))
+            if curve is not None:
+                curves[index] = oma.MFnAnimCurve(curve)
+
+        return curves
+
+    def connectionMade(self, plug, other_plug, as_source):
+        """ Layer curves are found again after a layer is connected.
+
+        Args:
+            plug (MPlug): Plug on this node.
+            other_plug (MPlug): Plug on the other node.
+            as_source (bool): If this node is the source.
+
+        Returns:
+            None
+        """
+        if not as_source:
+            self.curves = None
+
+        return om.MPxNode.connectionMade(self, plug, other_plug, as_source)
+
+    def connectionBroken(self, plug, other_plug, as_source):
+        """ Layer curves are found again after a layer is disconnected.
+
+        Args:
+            plug (MPlug): Plug on this node.
+            other_plug (MPlug): Plug on the other node.
+            as_source (bool): If this node is the source.
+
+        Returns:
+            None
+        """
+        if not as_source:
+            self.curves = None
+
+        return om.MPxNode.connectionBroken(self, plug, other_plug, as_source)
+
+    def schedulingType(self):
+        """ Scheduling type for the Evaluation Manager.
+
+        Compute finds the layer curves again after their connections change and keeps them on the node, state
+        outside its data block, so WarpStack nodes are evaluated one at a time.
+
+        Returns:
+            MPxNode.kSerial
+        """
+        return om.MPxNode.kSerial
+
+    @staticmethod
+    def creator():
+        """Creator function
+
+        Returns:
+            instance of the node
+        """
+        return WarpStack()
+
+    @staticmethod
+    def initialize():
+        """ Initializes attribute information
+
+        Returns:
+            None
+        """
+        attr = om.MFnNumericAttribute()
+        compound = om.MFnCompoundAttribute()
+
+        # Create time attribute
+        WarpStack.timeInputAttr = attr.create("timeInput", "ti", om.MFnNumericData.kFloat, 0.0)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
+        WarpStack.addAttribute(WarpStack.timeInputAttr)
+
+        # Create layer attributes
+        WarpStack.layerInputAttr = attr.create("layerInput", "li", om.MFnNumericData.kFloat, 0.0)
+        attr.writable = True
+        attr.storable = True
+
+        WarpStack.layerEnableAttr = attr.create("layerEnable", "le", om.MFnNumericData.kBoolean, True)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
+
+        WarpStack.layerWeightAttr = attr.create("layerWeight", "lw", om.MFnNumericData.kFloat, 1.0)
+        attr.writable = True
+        attr.storable = True
+        attr.keyable = True
+        attr.setMin(0.0)
+        attr.setMax(1.0)
+
+        WarpStack.layerAttr = compound.create("layer", "lyr")
+        compound.addChild(WarpStack.layerInputAttr)
+        compound.addChild(WarpStack.layerEnableAttr)
+        compound.addChild(WarpStack.layerWeightAttr)
+        compound.array = True
+        compound.usesArrayDataBuilder = True
+        WarpStack.addAttribute(WarpStack.layerAttr)
+
+        # Create output attribute
+        WarpStack.outputAttr = attr.create("output", "out", om.MFnNumericData.kFloat, 0.0)
+        attr.writable = False
+        attr.storable = False
+        attr.readable = True
+        WarpStack.addAttribute(WarpStack.outputAttr)
+
+        # Attribute affects
+        WarpStack.attributeAffects(WarpStack.timeInputAttr, WarpStack.outputAttr)
+        WarpStack.attributeAffects(WarpStack.layerAttr, WarpStack.outputAttr)
+        WarpStack.attributeAffects(WarpStack.layerInputAttr, WarpStack.outputAttr)
+        WarpStack.attributeAffects(WarpStack.layerEnableAttr, WarpStack.outputAttr)
+        WarpStack.attributeAffects(WarpStack.layerWeightAttr, WarpStack.outputAttr)
+
+
+class TimeWarpCommit(om.MPxCommand):
+    """ Undoable command wrapping API edits made by timeWarp.scripts.undo.commit."""
+
+    COMMAND_NAME = "timeWarpCommit"
+
+    def __init__(self):
+        super(TimeWarpCommit, self).__init__()
+
+        self.undo = None
+        self.redo = None
+
+    def doIt(self, args):
+        """ Pick up the pending edits. They are already applied so there is nothing to do yet.
+
+        Args:
+            args (MArgList): Command arguments, unused.
+
+        Returns:
+            None
+        """
+        from timeWarp.scripts import undo
+
+        self.undo, self.redo = undo.pop()
+
+    def redoIt(self):
+        """ Reapply the edits.
+
+        Returns:
+            None
+        """
+        self.redo()
+
+    def undoIt(self):
+        """ Revert the edits.
+
+        Returns:
+            None
+        """
+        self.undo()
+
+    def isUndoable(self):
+        """ Command is always undoable.
+
+        Returns:
+            True
+        """
+        return True
+
+    @staticmethod
+    def creator():
+        """Creator function
+
+        Returns:
+            instance of the command
+        """
+        return TimeWarpCommit()
+
+
 def initializePlugin(plugin):
     """ Initialize the plugin when Maya loads it.
 
@@ -203,16 +914,25 @@ def initializePlugin(plugin):
     version = __version__
     api_version = "Any"
 
-    plugin_fn = ompx.MFnPlugin(plugin, vendor, version, api_version)
+    plugin_fn = om.MFnPlugin(plugin, vendor, version, api_version)
+
+    for node in (WarpStatus, WarpStack):
+        try:
+            plugin_fn.registerNode(node.TYPE_NAME, node.TYPE_ID, node.creator, node.initialize)
+        except Exception:
+            om.MGlobal.displayError("Failed to register node: {0}".format(node.TYPE_NAME))
+            raise
+
     try:
-        plugin_fn.registerNode(WarpStatus.TYPE_NAME,
-                               WarpStatus.TYPE_ID,
-                               WarpStatus.creator,
-                               WarpStatus.initialize)
-        WarpStatus.create_menu()
+        plugin_fn.registerCommand(TimeWarpCommit.COMMAND_NAME, TimeWarpCommit.creator)
+    except Exception:
+        om.MGlobal.displayError("Failed to register command: {0}".format(TimeWarpCommit.COMMAND_NAME))
+        raise
 
-    except:
-        om.MGlobal.displayError("Failed to register node: {0}".format(WarpStatus.TYPE_NAME))
+    # Batch sessions have no menus, interactive ones build it once Maya is idle so loading isn't held up.
+    if not maya.cmds.about(batch=True):
+        import maya.utils
+        maya.utils.executeDeferred(WarpStatus.create_menu)
 
 
 def uninitializePlugin(plugin):
@@ -224,11 +944,19 @@ def uninitializePlugin(plugin):
     Returns:
         Nome
     """
-    plugin_fn = ompx.MFnPlugin(plugin)
+    plugin_fn = om.MFnPlugin(plugin)
+
+    for node in (WarpStatus, WarpStack):
+        try:
+            plugin_fn.deregisterNode(node.TYPE_ID)
+        except Exception:
+            om.MGlobal.displayError("Failed to unregister node: {0}".format(node.TYPE_NAME))
+            raise
 
     try:
-        plugin_fn.deregisterNode(WarpStatus.TYPE_ID)
-        WarpStatus.delete_menu()
+        plugin_fn.deregisterCommand(TimeWarpCommit.COMMAND_NAME)
+    except Exception:
+        om.MGlobal.displayError("Failed to unregister command: {0}".format(TimeWarpCommit.COMMAND_NAME))
+        raise
 
-    except:
-        om.MGlobal.displayError("Failed to unregister node: {0}".format(WarpStatus.TYPE_NAME))
\ No newline at end of file
+    WarpStatus.delete_menu()
@@ -0,0 +1,592 @@
+""" Time Warp Batch
+
+Command line entry point to run a warp operation over many scene files in mayapy batch mode. Each scene is handled
+by its own mayapy worker process, as many at once as there are workers, and a JSON summary of every scene is written
+at the end.
+
+    mayapy -m timeWarp.scripts.batch bake shot_010.ma shot_020.ma --workers 8 --summary bake.json
+    mayapy -m timeWarp.scripts.batch create shot_*.ma --spec crowd_warps.json
+    mayapy -m timeWarp.scripts.batch audit shot_*.ma --summary audit.json
+
+Spec files used by create and apply hold a list of warps:
+
+    {"warps": [{"name": "run", "start": 1, "end": 120, "keys": [[1, 1], [60, 40], [120, 120]],
+                "nodes": ["crowd:agent*"],
+                "members": {"0": {"nodes": ["agent1"], "offset": 0.0, "scale": 1.0}}}]}
+
+create makes each warp with create_warps, apply uses warps already in the scene named by "warp". Both then apply the
+warp to "nodes" and assign "members" by index.
+
+bake_partitioned uses the same workers from inside a session to bake one heavy warp, each worker bakes part of the
+warp's driven nodes from a saved copy of the scene and the keys are merged back.
+"""
+
+# Python
+import argparse
+import json
+import multiprocessing
+import multiprocessing.pool
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+OPERATIONS = ('create', 'apply', 'bake', 'audit')
+
+# Operations that change the scene, audit only reads it.
+SAVING_OPERATIONS = ('create', 'apply', 'bake')
+
+# Worker only operation that bakes part of a warp for bake_partitioned.
+PARTITION_OPERATION = 'bake-partition'
+
+PLUGIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'plug-ins', 'WarpStatus.py')
+
+
+def main(argv=None):
+    """ Run a warp operation over scene files.
+
+    Args:
+        argv (list | None): Command line arguments.
+
+    Returns:
+        int exit code, 0 if every scene succeeded.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('operation', choices=OPERATIONS + (PARTITION_OPERATION,),
+                        help='Warp operation to run on each scene.')
+    parser.add_argument('scenes', nargs='+', help='Maya scene files.')
+    parser.add_argument('--spec', help='JSON spec of warps, needed by create and apply.')
+    parser.add_argument('--warps', nargs='*', help='Warp nodes to bake, every warp in the scene if not given.')
+    parser.add_argument('--method', default='simulation', choices=('simulation', 'remap', 'adaptive'),
+                        help='Bake method.')
+    parser.add_argument('--tolerance', type=float, default=0.01,
+                        help='Largest value error of remap and adaptive bakes.')
+    parser.add_argument('--steps', type=int, default=1, help='Frame steps of simulation bakes.')
+    parser.add_argument('--output-dir', help='Save scenes here instead of over the original files.')
+    parser.add_argument('--dry-run', action='store_true', help="Run the operation but don't save scenes.")
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='Number of worker processes.')
+    parser.add_argument('--mayapy', default=sys.executable, help='mayapy executable for workers.')
+    parser.add_argument('--summary', help='Path to write the JSON summary to, printed if not given.')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    parser.add_argument('--partition', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.operation == PARTITION_OPERATION and not args.worker:
+        parser.error('{} is only run by bake_partitioned.'.format(PARTITION_OPERATION))
+
+    options = {'spec': load_spec(args.spec) if args.spec else None,
+               'warps': args.warps,
+               'method': args.method,
+               'tolerance': args.tolerance,
+               'steps': args.steps,
+               'output_dir': args.output_dir,
+               'dry_run': args.dry_run,
+               'partition': args.partition}
+
+    if args.operation in ('create', 'apply') and not options['spec']:
+        parser.error('{} needs a --spec file.'.format(args.operation))
+
+    # Workers are this module run again by mayapy for a single scene.
+    if args.worker:
+        result = run_worker(args.operation, args.scenes[0], options)
+        with open(args.result, 'w') as file_instance:
+            json.dump(result, file_instance)
+        return 0
+
+    summary = run_pool(args.operation, args.scenes, argv_for_worker(args), args.workers, args.mayapy)
+
+    if args.summary:
+        with open(args.summary, 'w') as file_instance:
+            json.dump(summary, file_instance, indent=4)
+    else:
+        print(json.dumps(summary, indent=4))
+
+    return 0 if not summary['failed'] else 1
+
+
+def load_spec(path):
+    """ Load a warp spec file.
+
+    Args:
+        path (str): Path to JSON spec.
+
+    Returns:
+        list of warp spec dicts.
+    """
+
+    with open(path) as file_instance:
+        spec = json.load(file_instance)
+
+    return spec['warps'] if isinstance(spec, dict) else spec
+
+
+def argv_for_worker(args):
+    """ Build the worker arguments shared by every scene.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        list of arguments.
+    """
+
+    argv = ['--method', args.method, '--tolerance', str(args.tolerance), '--steps', str(args.steps)]
+
+    if args.spec:
+        argv += ['--spec', os.path.abspath(args.spec)]
+    if args.warps:
+        argv += ['--warps'] + list(args.warps)
+    if args.output_dir:
+        argv += ['--output-dir', os.path.abspath(args.output_dir)]
+    if args.dry_run:
+        argv.append('--dry-run')
+
+    return argv
+
+
+def run_pool(operation, scenes, worker_argv, workers, mayapy):
+    """ Run every scene in its own mayapy process, a pool of threads keeps the given number running at once.
+
+    Args:
+        operation (str): Warp operation.
+        scenes (list): Maya scene files.
+        worker_argv (list): Arguments passed to each worker.
+        workers (int): Number of worker processes.
+        mayapy (str): mayapy executable.
+
+    Returns:
+        dict summary of every scene.
+    """
+    start = time.time()
+
+    results = map_threads(lambda scene: run_process(mayapy, operation, os.path.abspath(scene), worker_argv),
+                          scenes, workers)
+
+    return {'operation': operation,
+            'scenes': results,
+            'succeeded': sum(1 for result in results if result['status'] == 'ok'),
+            'failed': sum(1 for result in results if result['status'] != 'ok'),
+            'seconds': time.time() - start}
+
+
+def map_threads(function, items, workers):
+    """ Call a function on every item from a pool of threads, keeping the given number running at once.
+
+    Args:
+        function (callable): Called with each item.
+        items (list): Items to call the function on.
+        workers (int): Number of threads.
+
+    Returns:
+        list of results in the order of items.
+    """
+    pool = multiprocessing.pool.ThreadPool(max(1, min(workers, len(items))))
+
+    try:
+        return pool.map(function, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def run_process(mayapy, operation, scene, worker_argv):
+    """ Run one scene in a mayapy worker process.
+
+    Args:
+        mayapy (str): mayapy executable.
+        operation (str): Warp operation.
+        scene (str): Maya scene file.
+        worker_argv (list): Arguments shared by each worker.
+
+    Returns:
+        dict result of the scene.
+    """
+    start = time.time()
+
+    handle, result_path = tempfile.mkstemp(suffix='.json', prefix='timeWarp_')
+    os.close(handle)
+
+    # The scene goes before the options so a list of --warps can't swallow it.
+    command = ([mayapy, '-m', 'timeWarp.scripts.batch', operation, scene] + worker_argv +
+               ['--worker', '--result', result_path])
+
+    # The folder holding the timeWarp package has to be importable by the worker.
+    environment = dict(os.environ)
+    base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+    environment['PYTHONPATH'] = os.pathsep.join(filter(None, [base_path, environment.get('PYTHONPATH')]))
+
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   env=environment, universal_newlines=True)
+        output = process.communicate()[0]
+
+        result = {'scene': scene, 'status': 'error', 'error': output[-2000:]}
+        if process.returncode == 0 and os.path.getsize(result_path):
+            with open(result_path) as file_instance:
+                result = json.load(file_instance)
+
+    finally:
+        os.remove(result_path)
+
+    result['seconds'] = time.time() - start
+
+    return result
+
+
+def run_worker(operation, scene, options):
+    """ Open a scene in this mayapy process, run the operation and save it.
+
+    Args:
+        operation (str): Warp operation.
+        scene (str): Maya scene file.
+        options (dict): Operation options from the command line.
+
+    Returns:
+        dict result of the scene.
+    """
+    import traceback
+
+    result = {'scene': scene, 'status': 'ok'}
+
+    try:
+        import maya.standalone
+        maya.standalone.initialize()
+        import maya.cmds
+
+        maya.cmds.loadPlugin(PLUGIN_PATH, quiet=True)
+        maya.cmds.file(scene, open=True, force=True)
+
+        if operation == 'create':
+            result['result'] = create(options['spec'])
+        elif operation == 'apply':
+            result['result'] = apply(options['spec'])
+        elif operation == 'bake':
+            result['result'] = bake(options['warps'], options['method'], options['steps'], options['tolerance'])
+        elif operation == PARTITION_OPERATION:
+            result['result'] = bake_partition(options['partition'])
+        else:
+            result['result'] = audit()
+
+        if operation in SAVING_OPERATIONS and not options['dry_run']:
+            result['saved'] = save(scene, options['output_dir'])
+
+    except Exception:
+        result['status'] = 'error'
+        result['error'] = traceback.format_exc()
+
+    return result
+
+
+def create(spec):
+    """ Create warps from a spec and apply them.
+
+    Args:
+        spec (list): Warp spec dicts.
+
+    Returns:
+        dict of warp node to applied curve counts.
+    """
+    from timeWarp.scripts import core
+
+    warps = core.create_warps(spec)
+
+    return dict((warp, apply_spec(warp, warp_spec)) for warp, warp_spec in zip(warps, spec))
+
+
+def apply(spec):
+    """ Apply warps already in the scene from a spec.
+
+    Args:
+        spec (list): Warp spec dicts, each naming its warp node with "warp".
+
+    Returns:
+        dict of warp node to applied curve counts.
+    """
+
+    return dict((warp_spec['warp'], apply_spec(warp_spec['warp'], warp_spec)) for warp_spec in spec)
+
+
+def apply_spec(warp, warp_spec):
+    """ Apply a warp to the nodes and members of its spec.
+
+    Args:
+        warp (str): Maya warp node.
+        warp_spec (dict): Warp spec with optional "nodes" and "members".
+
+    Returns:
+        dict of added and present curve counts.
+    """
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    counts = {'added': 0, 'present': 0}
+    changes = []
+
+    # ls lists every node in the scene when given none.
+    nodes = warp_spec.get('nodes')
+    nodes = maya.cmds.ls(nodes, long=True) if nodes else []
+    if nodes:
+        maya.cmds.select(nodes, replace=True)
+        changes.append(core.apply_warp(warp))
+
+    members = warp_spec.get('members') or {}
+    if members:
+        changes.append(core.apply_warp(
+            warp,
+            members=dict((int(index), maya.cmds.ls(member['nodes'], long=True) if member.get('nodes') else [])
+                         for index, member in members.items()),
+            timings=dict((int(index), (member.get('offset', 0.0), member.get('scale', 1.0)))
+                         for index, member in members.items())))
+
+    for change in changes:
+        if change:
+            counts['added'] += change.added
+            counts['present'] += change.present
+
+    return counts
+
+
+def bake(warps, method, steps, tolerance):
+    """ Bake out warps.
+
+    Args:
+        warps (list | None): Warp nodes, every warp in the scene if not given.
+        method (str): Bake method.
+        steps (int): Frame steps of simulation bakes.
+        tolerance (float): Largest value error of remap and adaptive bakes.
+
+    Returns:
+        list of baked warp nodes.
+    """
+    from timeWarp.scripts import core
+
+    warps = warps or core.get_warp_nodes()
+
+    if method == core.BAKE_SIMULATION:
+        return core.bake_warps(warps, steps=steps) or []
+
+    return [warp for warp in warps if core.bake_warp(warp, method=method, tolerance=tolerance)]
+
+
+def audit():
+    """ Report the warps and warp stacks in the scene.
+
+    Returns:
+        dict of warp or stack node to its type, state, curve and node counts and active range.
+    """
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    report = {}
+    for warp in core.get_warp_nodes() + core.get_stack_nodes():
+        warp_range = core.get_warp_range(warp, handles=0)
+        report[warp] = {'type': maya.cmds.nodeType(warp),
+                        'active': core.is_warp_active(warp),
+                        'curves': len(core.get_driven_curves(warp)),
+                        'members': len(set(core.get_member_curves(warp).values())),
+                        'nodes': core.get_warped_count(warp),
+                        'range': [float(frame) for frame in warp_range] if warp_range else None}
+
+    return report
+
+
+def bake_partitioned(warp, workers=None, steps=1, handles=1, mayapy=None):
+    """ Bake out a warp across many mayapy workers, then delete it.
+
+    The scene is saved to a temporary file and the warp's driven nodes are split into one partition per worker.
+    Each worker opens the saved scene and bakes only its partition's curves by simulation, then the baked curves
+    replace the warped curves' keys in this session as one undo chunk.
+
+    Args:
+        warp (str): Maya warp node.
+        workers (int | None): Number of worker processes, one per core if not given.
+        steps (int | 1): How often to bake.
+        handles (int | 1): Frames baked either side of where the warp changes time.
+        mayapy (str | None): mayapy executable, the one next to this session's executable if not given.
+
+    Returns:
+        True if baked out.
+
+    Raises:
+        OperationCancelled: If the merge is cancelled from the progress bar, it's undone.
+    """
+    import shutil
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    curve_plugs = get_curve_plugs(warp)
+
+    if not curve_plugs:
+        return False
+
+    frame_range = core.get_warp_range(warp, handles=handles)
+
+    # Where a warp never changes time its curves already play correctly without it.
+    if frame_range is None:
+        core.delete_warp(warp)
+        return True
+
+    partitions = partition_curves(curve_plugs, workers or multiprocessing.cpu_count())
+    temp_dir = tempfile.mkdtemp(prefix='timeWarp_')
+
+    try:
+        scene = os.path.join(temp_dir, 'scene.ma')
+        maya.cmds.file(scene, exportAll=True, preserveReferences=True, type='mayaAscii', force=True)
+
+        jobs = []
+        for index, partition in enumerate(partitions):
+            partition_path = os.path.join(temp_dir, 'partition{}.json'.format(index))
+            with open(partition_path, 'w') as file_instance:
+                json.dump({'curves': partition, 'start': float(frame_range[0]), 'end': float(frame_range[1]),
+                           'steps': steps}, file_instance)
+            jobs.append(['--partition', partition_path])
+
+        mayapy = mayapy or get_mayapy()
+        results = map_threads(lambda job: run_process(mayapy, PARTITION_OPERATION, scene, job), jobs, len(jobs))
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    failed = [result for result in results if result['status'] != 'ok']
+    if failed:
+        maya.cmds.warning("{} of {} bake partitions failed, {} was left as it is:\n{}".format(
+            len(failed), len(results), warp, failed[0].get('error', '')))
+        return False
+
+    baked_curves = [item for result in results for item in result['result'].items()]
+
+    with core.UndoChunkContextManager():
+        with core.ProgressBarContextManager(len(baked_curves), message="Merging Keys.") as progress_bar:
+            for chunk in core.iter_chunks(baked_curves, progress_bar=progress_bar):
+                for curve_node, keys in chunk:
+                    # Workers send back the whole baked curve, keys outside the range included.
+                    core.set_curve_keys(curve_node, keys['times'], keys['values'],
+                                        in_slopes=keys['in_slopes'], out_slopes=keys['out_slopes'])
+
+        core.delete_warp(warp)
+
+    return True
+
+
+def get_curve_plugs(warp):
+    """ Get one driven plug for every curve of a warp, grouped by the node it drives.
+
+    Args:
+        warp (str): Maya warp node.
+
+    Returns:
+        dict of node to dict of animCurve node to plug.
+    """
+    import maya.cmds
+    from timeWarp.scripts import core
+
+    curve_plugs = {}
+    for curve_node in core.get_driven_curves(warp):
+        plugs = maya.cmds.listConnections(curve_node, source=False, destination=True,
+                                          skipConversionNodes=True, plugs=True) or []
+
+        # Baking one plug rekeys the curve, so any other plug it drives follows along.
+        if plugs:
+            curve_plugs.setdefault(plugs[0].split('.')[0], {})[curve_node] = plugs[0]
+
+    return curve_plugs
+
+
+def partition_curves(curve_plugs, count):
+    """ Split nodes into partitions of about the same number of curves, keeping each node's curves together.
+
+    Args:
+        curve_plugs (dict): Node to dict of animCurve node to plug.
+        count (int): Most partitions to make.
+
+    Returns:
+        list of dicts of animCurve node to plug.
+    """
+
+    partitions = [{} for _ in range(max(1, min(count, len(curve_plugs))))]
+
+    # Largest nodes first, each into the partition with the fewest curves so far.
+    for node in sorted(curve_plugs, key=lambda node: len(curve_plugs[node]), reverse=True):
+        min(partitions, key=len).update(curve_plugs[node])
+
+    return partitions
+
+
+def bake_partition(path):
+    """ Bake one partition's curves in the open scene, used by bake_partitioned workers.
+
+    Args:
+        path (str): Path to JSON partition with curves, start, end and steps.
+
+    Returns:
+        dict of animCurve node to dict of baked key times, values and slopes.
+    """
+    import maya.cmds
+    from timeWarp.scripts import curve
+
+    with open(path) as file_instance:
+        partition = json.load(file_instance)
+
+    frame_range = (partition['start'], partition['end'])
+    maya.cmds.bakeResults(list(partition['curves'].values()), sampleBy=partition['steps'], time=frame_range,
+                          simulation=True, preserveOutsideKeys=True)
+
+    # The curve is found again through the plug, bakeResults may have replaced it.
+    keys = {}
+    for curve_node, plug in partition['curves'].items():
+        baked_curve = maya.cmds.listConnections(plug, source=True, destination=False, skipConversionNodes=True,
+                                                type='animCurve')
+        baked = curve.WarpCurve.from_maya(baked_curve[0])
+        keys[curve_node] = {'times': baked.times.tolist(),
+                            'values': baked.values.tolist(),
+                            'in_slopes': baked.in_slopes.tolist(),
+                            'out_slopes': baked.out_slopes.tolist()}
+
+    return keys
+
+
+def get_mayapy():
+    """ Get the mayapy executable that belongs to this session.
+
+    Returns:
+        str path of mayapy.
+    """
+
+    executable = os.path.basename(sys.executable).lower()
+    if executable.startswith('mayapy'):
+        return sys.executable
+
+    return os.path.join(os.path.dirname(sys.executable), 'mayapy.exe' if os.name == 'nt' else 'mayapy')
+
+
+def save(scene, output_dir=None):
+    """ Save the open scene.
+
+    Args:
+        scene (str): Original scene file.
+        output_dir (str | None): Folder to save to, over the original file if not given.
+
+    Returns:
+        str path of saved scene.
+    """
+    import maya.cmds
+
+    path = scene
+    if output_dir:
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+        path = os.path.join(output_dir, os.path.basename(scene))
+
+    file_type = 'mayaBinary' if path.lower().endswith('.mb') else 'mayaAscii'
+
+    maya.cmds.file(rename=path)
+    maya.cmds.file(save=True, force=True, type=file_type)
+
+    return path
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,337 +1,2066 @@
 """ Time Warp Core """
 
 # Python
+import collections
+import json
+import os
 import re
+import time
+import timeit
 
 # Maya
 import maya.cmds
 import maya.mel
 
 from timeWarp._versions import __version__, __doc__, __author__, __email__, __copyright__
+from timeWarp.scripts import counter
+from timeWarp.scripts import membership
+from timeWarp.scripts import undo
 
-# Maya's main progress bar
-MAIN_PROGRESS_BAR = maya.mel.eval('$tmp = $gMainProgressBar')
+# Maya commands called by core, counted into progress phases.
+cmds = counter.CommandCounter(maya.cmds)
 
+# Maya's main progress bar, looked up on first use as batch sessions don't have one.
+_MAIN_PROGRESS_BAR = None
 
-def create_warp(warp_name=None, anti_warp=False):
+# Records of the latest progress phases, newest last.
+PHASE_RECORD_LIMIT = 500
+_PHASE_RECORDS = collections.deque(maxlen=PHASE_RECORD_LIMIT)
+
+# Path of a JSON file to also keep the latest phase records in, read from the environment when a phase ends.
+PHASE_LOG_VARIABLE = 'TIME_WARP_PHASE_LOG'
+
+# Long operations work through items in chunks of this size, and show progress and check for Esc at most this often.
+CHUNK_SIZE = 250
+PROGRESS_INTERVAL = 0.05
+
+# Most precise clock on every mayapy, time.perf_counter doesn't exist in Maya 2020's Python 2.7.
+timer = timeit.default_timer
+
+CANCELLED_MESSAGE = "Time Warp operation cancelled, its changes were undone."
+
+# Animation curve types a warp can drive.
+WARPABLE_CURVE_TYPES = ("animCurveTU", "animCurveTA", "animCurveTL")
+
+# Bake methods.
+BAKE_SIMULATION = 'simulation'
+BAKE_REMAP = 'remap'
+BAKE_ADAPTIVE = 'adaptive'
+BAKE_PARTITIONED = 'partitioned'
+
+# Name of the undo chunk a simulation bake keeps open while it runs.
+BAKE_CHUNK_NAME = 'timeWarpBake'
+
+# Counts of curves changed by adding to or removing from a warp. Present counts selected curves that were already in
+# the requested state and so were left alone.
+WarpChange = collections.namedtuple('WarpChange', ['added', 'present', 'removed'])
+
+# Progress yielded by tasks, the generators long operations are written as. Done counts up to total for each message.
+TaskProgress = collections.namedtuple('TaskProgress', ['message', 'done', 'total'])
+
+# Result yielded last by tasks that have one, as generators can't return values on Python 2.
+TaskResult = collections.namedtuple('TaskResult', ['value'])
+
+
+class OperationCancelled(Exception):
+    """ Raised when the user cancels a long operation from the main progress bar."""
+
+
+def create_warp(warp_name=None, anti_warp=False, samples_per_frame=1, inverse_of=None, tolerance=0.001):
     """ Create warp nodes.
 
     Args:
-        warp_name (str | None): Custom name of time warp curve.
-        anti_warp (bool | False): If warp node should be a anti warp.
+        warp_name (str | None): Custom name of time warp curve.
+        anti_warp (bool | False): If warp node should be a anti warp.
+        samples_per_frame (int | 1): How many times per frame the scene time warp is sampled for an anti warp.
+        inverse_of (str | None): Warp node to invert for the anti warp, instead of sampling the scene time warp.
+        tolerance (float | 0.001): Largest error in frames allowed when inverting a warp.
+
+    Returns:
+        maya node name of warp time curve.
+
+    Raises:
+        ValueError: If the warp given by inverse_of doesn't always move forward in time, nothing is created.
+    """
+
+    min_time = cmds.playbackOptions(query=True, minTime=True)
+    max_time = cmds.playbackOptions(query=True, maxTime=True)
+
+    curve_name = 'atk_WarpCurve'
+    connection_name = "atk_warpSettings"
+
+    if warp_name:
+        curve_name = warp_name
+        connection_name = '{}_warpSettings'.format(warp_name)
+
+    if anti_warp:
+        curve_name = '{}_AntiWarp'.format(curve_name)
+
+    # Anti warp keys are worked out before anything is created, so a warp that can't be inverted leaves nothing.
+    anti_warp_keys = None
+    if anti_warp:
+        anti_warp_keys = get_anti_warp_keys(min_time, max_time, samples_per_frame=samples_per_frame,
+                                            inverse_of=inverse_of, tolerance=tolerance)
+
+    cmds.undoInfo(openChunk=True, stateWithoutFlush=True)
+
+    try:
+        warp_node = cmds.createNode('animCurveTT', name=curve_name)
+        cmds.setAttr(warp_node + ".preInfinity", 1)
+        cmds.setAttr(warp_node + ".postInfinity", 1)
+
+        # Anti warp keys take the scene's default tangents, like setting each key by hand would.
+        if anti_warp:
+            times, values, in_slopes, out_slopes = anti_warp_keys
+            set_curve_keys(warp_node, times, values, tangent_type='global', in_slopes=in_slopes,
+                           out_slopes=out_slopes)
+        else:
+            cmds.setKeyframe(warp_node, time=min_time, value=min_time,
+                             inTangentType="spline", outTangentType="spline")
+            cmds.setKeyframe(warp_node, time=max_time, value=max_time,
+                             inTangentType="spline", outTangentType="spline")
+
+        status_node = cmds.createNode('WarpStatus', name=re.sub(curve_name, warp_node, connection_name))
+
+        # Set connections for toggle node
+        cmds.connectAttr(warp_node + ".output", status_node + ".warpInput", force=True)
+        # Connect real time to the alternate condition
+        cmds.connectAttr("time1.outTime", status_node + ".timeInput", force=True)
+
+    finally:
+        cmds.undoInfo(closeChunk=True, stateWithoutFlush=True)
+
+    return status_node
+
+
+def create_warps(specs):
+    """ Create many warp nodes in one undoable operation.
+
+    Every curve and status node is created and connected by a single DG modifier and every key is added by a single
+    curve change, so the whole batch is one undo step.
+
+    Args:
+        specs (list): Dicts describing each warp, all keys are optional:
+            name (str): Custom name of time warp curve.
+            start (float): First frame of the warp, defaults to the playback start.
+            end (float): Last frame of the warp, defaults to the playback end.
+            keys (list): Tuples of time and value in frames. Defaults to an unwarped key at start and end.
+            tangent_type (str): Name of tangent type for all keys, defaults to spline.
+
+    Returns:
+        list of maya node names of warp status nodes.
+    """
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+    if not specs:
+        return []
+
+    min_time = cmds.playbackOptions(query=True, minTime=True)
+    max_time = cmds.playbackOptions(query=True, maxTime=True)
+
+    modifier = cmds.wrap(om.MDGModifier())
+
+    nodes = []
+    for spec in specs:
+        curve_name = spec.get('name') or 'atk_WarpCurve'
+        connection_name = '{}_warpSettings'.format(curve_name) if spec.get('name') else 'atk_warpSettings'
+
+        curve_object = modifier.createNode('animCurveTT')
+        modifier.renameNode(curve_object, curve_name)
+        status_object = modifier.createNode('WarpStatus')
+        nodes.append((curve_object, status_object, connection_name))
+
+    # Nodes have to exist before they can be named after their curve, connected or keyed.
+    modifier.doIt()
+
+    time_plug = get_plugs(["time1.outTime"])[0]
+    change = oma.MAnimCurveChange()
+
+    status_nodes = []
+    for spec, (curve_object, status_object, connection_name) in zip(specs, nodes):
+        curve_fn = cmds.wrap(oma.MFnAnimCurve(curve_object))
+        status_fn = om.MFnDependencyNode(status_object)
+
+        # Same as create_warp, the settings node takes the curve's name if Maya had to make it unique.
+        curve_name = spec.get('name') or 'atk_WarpCurve'
+        modifier.renameNode(status_object, connection_name.replace(curve_name, curve_fn.name(), 1))
+
+        modifier.newPlugValueInt(curve_fn.findPlug('preInfinity', False), oma.MFnAnimCurve.kLinear)
+        modifier.newPlugValueInt(curve_fn.findPlug('postInfinity', False), oma.MFnAnimCurve.kLinear)
+        modifier.connect(curve_fn.findPlug('output', False), status_fn.findPlug('warpInput', False))
+        modifier.connect(time_plug, status_fn.findPlug('timeInput', False))
+
+        keys = spec.get('keys')
+        if not keys:
+            start = spec.get('start', min_time)
+            end = spec.get('end', max_time)
+            keys = [(start, start), (end, end)]
+
+        keys = sorted(keys)
+        add_curve_keys(curve_fn, [key[0] for key in keys], [key[1] for key in keys],
+                       spec.get('tangent_type', 'spline'), change)
+
+        status_nodes.append(status_fn)
+
+    modifier.doIt()
+
+    def undo_create():
+        change.undoIt()
+        modifier.undoIt()
+
+    def redo_create():
+        modifier.doIt()
+        change.redoIt()
+
+    undo.commit(undo_create, redo_create)
+
+    return [status_fn.name() for status_fn in status_nodes]
+
+
+def get_anti_warp_keys(start, end, samples_per_frame=1, inverse_of=None, tolerance=0.001):
+    """ Get the keys of an anti warp, which maps the scene time warp, or another warp, back onto scene frames.
+
+    With NumPy the scene time warp is sampled in one evaluation and another warp is inverted exactly. mayapy without
+    NumPy asks Maya for the time frame by frame instead, the way anti warps were always built.
+
+    Args:
+        start (float): First frame.
+        end (float): Last frame.
+        samples_per_frame (int | 1): How many times per frame the time is sampled.
+        inverse_of (str | None): Warp node to invert, instead of the scene time warp.
+        tolerance (float | 0.001): Largest error in frames allowed when inverting a warp.
+
+    Returns:
+        tuple of key times, key values, in slopes and out slopes. Slopes are None where keys are sampled.
+
+    Raises:
+        ValueError: If the warp given by inverse_of doesn't always move forward in time.
+    """
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if inverse_of and numpy is not None:
+        from timeWarp.scripts import curve
+
+        inverse = curve.WarpCurve.from_maya(get_warp_curve(inverse_of)[0]).inverse(tolerance=tolerance)
+        return inverse.times, inverse.values, inverse.in_slopes, inverse.out_slopes
+
+    sample_count = int(round((end - start) * samples_per_frame)) + 1
+    frames = [start + index / float(samples_per_frame) for index in range(sample_count)]
+
+    if inverse_of:
+        warp_plug = '{}.output'.format(get_warp_curve(inverse_of)[0])
+        times = [cmds.getAttr(warp_plug, time=frame) for frame in frames]
+
+        if any(later <= earlier for earlier, later in zip(times, times[1:])):
+            raise ValueError('Only curves that always move forward in time can be inverted.')
+    elif numpy is not None:
+        times = get_scene_time(numpy.array(frames)).tolist()
+    else:
+        times = [cmds.getAttr('time1.outTime', time=frame) for frame in frames]
+
+    # Samples landing on a time already keyed are dropped, the first one is kept.
+    keys = {}
+    for time, frame in zip(times, frames):
+        keys.setdefault(time, frame)
+    times = sorted(keys)
+
+    return times, [keys[time] for time in times], None, None
+
+
+def get_scene_time(frames):
+    """ Get the scene time warp's mapping for many frames in one evaluation.
+
+    Args:
+        frames (numpy.ndarray): Frames to sample.
+
+    Returns:
+        numpy.ndarray of scene times.
+    """
+    import numpy
+    from timeWarp.scripts import curve
+
+    # Older versions of maya don't expose the scene warp curve so we have to ask the time node frame by frame.
+    if not cmds.attributeQuery('enableTimewarp', node='time1', exists=True):
+        return numpy.array([cmds.getAttr('time1.outTime', time=frame) for frame in frames])
+
+    scene_warp = cmds.listConnections('time1.timewarpIn_Raw', source=True, destination=False,
+                                      type='animCurve')
+
+    if not scene_warp or not cmds.getAttr('time1.enableTimewarp'):
+        return numpy.array(frames, dtype=numpy.float64)
+
+    return curve.WarpCurve.from_maya(scene_warp[0]).evaluate(frames)
+
+
+def set_curve_keys(curve_node, times, values, tangent_type='linear', in_slopes=None, out_slopes=None, change=None):
+    """ Replace all keys on a curve in one bulk operation.
+
+    Args:
+        curve_node (str): Maya animCurve node.
+        times (list): Key times in frames.
+        values (list): Key values, in frames for time curves.
+        tangent_type (str | linear): Name of tangent type for all keys, global uses the scene's default.
+        in_slopes (list | None): Fixed in tangent slopes in value per frame.
+        out_slopes (list | None): Fixed out tangent slopes in value per frame.
+        change (MAnimCurveChange | None): Change to record the edits to, left for the caller to commit. The edits
+            are committed as their own undo step if not given.
+
+    Returns:
+        None
+    """
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+    selection = om.MSelectionList()
+    selection.add(curve_node)
+    curve_fn = cmds.wrap(oma.MFnAnimCurve(selection.getDependNode(0)))
+
+    commit = change is None
+    if commit:
+        change = oma.MAnimCurveChange()
+
+    add_curve_keys(curve_fn, times, values, tangent_type, change)
+
+    if in_slopes is not None or out_slopes is not None:
+        set_curve_tangents(curve_fn, in_slopes, out_slopes, change)
+
+    if commit:
+        undo.commit(change.undoIt, change.redoIt)
+
+
+def add_curve_keys(curve_fn, times, values, tangent_type, change):
+    """ Add keys to a curve in one bulk operation, replacing any keys at the same times.
+
+    Args:
+        curve_fn (MFnAnimCurve): Function set of the curve.
+        times (list): Key times in frames.
+        values (list): Key values, in frames for time curves.
+        tangent_type (str): Name of tangent type for all keys.
+        change (MAnimCurveChange): Change to record the edits to.
+
+    Returns:
+        None
+    """
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+    tangents = {'global': oma.MFnAnimCurve.kTangentGlobal,
+                'linear': oma.MFnAnimCurve.kTangentLinear,
+                'spline': oma.MFnAnimCurve.kTangentSmooth,
+                'flat': oma.MFnAnimCurve.kTangentFlat,
+                'clamped': oma.MFnAnimCurve.kTangentClamped,
+                'step': oma.MFnAnimCurve.kTangentStep}
+
+    ui_unit = om.MTime.uiUnit()
+    time_array = om.MTimeArray([om.MTime(float(time), ui_unit) for time in times])
+
+    # Values are stored in internal units, seconds for time, radians for angles and centimeters for distance.
+    scale = 1.0
+    if curve_fn.animCurveType == oma.MFnAnimCurve.kAnimCurveTT:
+        scale = om.MTime(1.0, ui_unit).asUnits(om.MTime.kSeconds)
+    elif curve_fn.animCurveType == oma.MFnAnimCurve.kAnimCurveTA:
+        scale = om.MAngle(1.0, om.MAngle.uiUnit()).asRadians()
+    elif curve_fn.animCurveType == oma.MFnAnimCurve.kAnimCurveTL:
+        scale = om.MDistance(1.0, om.MDistance.uiUnit()).asCentimeters()
+
+    value_array = om.MDoubleArray([float(value) * scale for value in values])
+
+    curve_fn.addKeys(time_array, value_array, tangents[tangent_type], tangents[tangent_type], False, change)
+
+
+def set_curve_tangents(curve_fn, in_slopes, out_slopes, change):
+    """ Set fixed tangents on every key of a curve.
+
+    Args:
+        curve_fn (MFnAnimCurve): Function set of the curve.
+        in_slopes (list | None): In tangent slopes in value per frame.
+        out_slopes (list | None): Out tangent slopes in value per frame.
+        change (MAnimCurveChange): Change to record the edits to.
+
+    Returns:
+        None
+    """
+    import math
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+    from timeWarp.scripts import curve
+
+    # Tangent angles are measured against seconds, time to time curves have seconds on both axes.
+    scale = 1.0
+    if curve_fn.animCurveType != oma.MFnAnimCurve.kAnimCurveTT:
+        scale = curve.frames_per_second()
+
+    for index in range(curve_fn.numKeys):
+        curve_fn.setTangentsLocked(index, False, change)
+
+        for slopes, is_in_tangent in ((in_slopes, True), (out_slopes, False)):
+            if slopes is None:
+                continue
+
+            weight = curve_fn.getTangentAngleWeight(index, is_in_tangent)[1]
+            angle = om.MAngle(math.atan(float(slopes[index]) * scale))
+            curve_fn.setTangent(index, angle, weight, is_in_tangent, change)
+
+
+def apply_warp(warp_node, members=None, timings=None):
+    """ Apply Warp to selected nodes, or assign nodes to the warp's members in bulk.
+
+    Args:
+        warp_node (str): Name of warp node to apply the on the selected objects
+        members (dict | None): Member index to list of nodes. Each group plays the warp through its own member
+            output, members without nodes are skipped. The selection is warped through the main output if not given.
+        timings (dict | None): Member index to tuple of offset and scale, see set_member_timings.
+
+    Returns:
+        WarpChange of curve counts if applied, else False.
+    """
+
+    try:
+        return run_task(apply_warp_task(warp_node, members=members, timings=timings))
+    except OperationCancelled:
+        cmds.warning(CANCELLED_MESSAGE)
+        return False
+
+
+def apply_warp_task(warp_node, members=None, timings=None):
+    """ Task to apply Warp a chunk at a time, see apply_warp and run_task.
+
+    Args:
+        warp_node (str): Name of warp node to apply the on the selected objects
+        members (dict | None): Member index to list of nodes, the selection is used if not given.
+        timings (dict | None): Member index to tuple of offset and scale.
+
+    Returns:
+        Generator of TaskProgress, ending with a TaskResult of WarpChange of curve counts if applied, else False.
+    """
+
+    if members is None:
+        groups = {None: cmds.ls(selection=True, dag=True, long=True)}
+    else:
+        # ls lists every node in the scene when given none, so empty members are skipped.
+        groups = dict((index, cmds.ls(nodes, dag=True, long=True)) for index, nodes in members.items() if nodes)
+
+    member_curves = {}
+    for progress in input_curves_task(groups):
+        if isinstance(progress, TaskResult):
+            member_curves = progress.value
+        else:
+            yield progress
+
+    total = sum(len(curves) for curves in member_curves.values())
+
+    if not total:
+        yield TaskResult(False)
+        return
+
+    # Only curves that aren't already driven by the same output need connecting.
+    new_curves = {}
+    for index, curves in member_curves.items():
+        output = "output" if index is None else "memberOutput[{}]".format(index)
+        current = set(get_driven_curves(warp_node, output=output))
+        new_curves[index] = [curve for curve in curves if curve not in current]
+
+    added = sum(len(curves) for curves in new_curves.values())
+
+    if added or timings:
+        for progress in connect_task(warp_node, new_curves, timings=timings):
+            yield progress
+
+    yield TaskResult(WarpChange(added=added, present=total - added, removed=0))
+
+
+def remove_warp(warp_node):
+    """ Remove Warp to selected nodes.
+
+    Args:
+        warp_node (str): Name of warp node to remove the on the selected objects
+
+    Returns:
+        WarpChange of curve counts if removed, else False.
+    """
+
+    try:
+        return run_task(remove_warp_task(warp_node))
+    except OperationCancelled:
+        cmds.warning(CANCELLED_MESSAGE)
+        return False
+
+
+def remove_warp_task(warp_node):
+    """ Task to remove Warp a chunk at a time, see remove_warp and run_task.
+
+    Args:
+        warp_node (str): Name of warp node to remove the on the selected objects
+
+    Returns:
+        Generator of TaskProgress, ending with a TaskResult of WarpChange of curve counts if removed, else False.
+    """
+
+    curves = []
+    for progress in input_curves_task({None: cmds.ls(selection=True, dag=True, long=True)}):
+        if isinstance(progress, TaskResult):
+            curves = progress.value[None]
+        else:
+            yield progress
+
+    if not curves:
+        yield TaskResult(False)
+        return
+
+    # Only curves driven by this warp need disconnecting, through the main output or any member.
+    current = set(get_driven_curves(warp_node))
+    warped_curves = [curve for curve in curves if curve in current]
+
+    if warped_curves:
+        for progress in disconnect_task(warp_node, warped_curves):
+            yield progress
+
+    yield TaskResult(WarpChange(added=0, present=len(curves) - len(warped_curves), removed=len(warped_curves)))
+
+
+def get_driven_curves(warp_node, output=None):
+    """ Get the animation curves a warp currently drives.
+
+    Args:
+        warp_node (str): Name of warp node.
+        output (str | None): Only curves driven by this attribute, like "output" or "memberOutput[2]". Curves
+            driven by any output if not given.
+
+    Returns:
+        list of animCurve nodes.
+    """
+
+    source = warp_node if output is None else "{}.{}".format(warp_node, output)
+
+    return cmds.listConnections(source, source=False, destination=True,
+                                skipConversionNodes=True, type="animCurve") or []
+
+
+def get_member_curves(warp_node):
+    """ Get the animation curves driven through a warp's member outputs.
+
+    Args:
+        warp_node (str): Name of warp node.
+
+    Returns:
+        dict of animCurve node to member index.
+    """
+
+    if not cmds.attributeQuery("memberOutput", node=warp_node, exists=True):
+        return {}
+
+    connections = cmds.listConnections("{}.memberOutput".format(warp_node), source=False, destination=True,
+                                       skipConversionNodes=True, connections=True, plugs=True) or []
+
+    # Connections come back as pairs of warp plug and curve plug.
+    member_curves = {}
+    for warp_plug, curve_plug in zip(connections[::2], connections[1::2]):
+        curve_node = curve_plug.split(".")[0]
+        if cmds.objectType(curve_node, isAType="animCurve"):
+            member_curves[curve_node] = int(re.search(r"\[(\d+)\]$", warp_plug).group(1))
+
+    return member_curves
+
+
+def get_member_timings(warp_node, indices):
+    """ Get the offset and scale of warp members.
+
+    Args:
+        warp_node (str): Name of warp node.
+        indices (list): Member indices.
+
+    Returns:
+        dict of member index to tuple of offset and scale.
+    """
+
+    return dict((index, (cmds.getAttr("{}.member[{}].memberOffset".format(warp_node, index)),
+                         cmds.getAttr("{}.member[{}].memberScale".format(warp_node, index))))
+                for index in indices)
+
+
+def set_member_timings(warp_node, timings):
+    """ Set the offset and scale of many warp members in one undoable DG modifier.
+
+    Args:
+        warp_node (str): Name of warp node.
+        timings (dict): Member index to tuple of offset in frames and scale.
+
+    Returns:
+        None
+    """
+    import maya.api.OpenMaya as om
+
+    modifier = cmds.wrap(om.MDGModifier())
+    add_member_timings(modifier, warp_node, timings)
+
+    modifier.doIt()
+    undo.commit(modifier.undoIt, modifier.doIt)
+
+
+def add_member_timings(modifier, warp_node, timings):
+    """ Add member offset and scale edits to a DG modifier.
+
+    Args:
+        modifier (MDGModifier): Modifier to add the edits to.
+        warp_node (str): Name of warp node.
+        timings (dict): Member index to tuple of offset in frames and scale.
+
+    Returns:
+        None
+    """
+    member_plug = get_plugs(["{}.member".format(warp_node)])[0]
+
+    for index, (offset, scale) in timings.items():
+        element = member_plug.elementByLogicalIndex(index)
+        modifier.newPlugValueFloat(element.child(0), float(offset))
+        modifier.newPlugValueFloat(element.child(1), float(scale))
+
+
+def input_curves_task(groups):
+    """ Task to get the animation curves upstream of groups of nodes that a warp can drive, a chunk of each group's
+    walk at a time.
+
+    Args:
+        groups (dict): Key to list of maya nodes.
+
+    Returns:
+        Generator of TaskProgress, ending with a TaskResult of dict of key to list of animCurve nodes.
+    """
+
+    curves = {}
+    yield TaskProgress("Getting Input Nodes.", 0, len(groups))
+
+    for done, (key, nodes) in enumerate(groups.items()):
+        input_nodes = {}
+        for progress in walk_inputs_task(nodes):
+            if isinstance(progress, TaskResult):
+                input_nodes = progress.value
+            else:
+                yield TaskProgress("Getting Input Nodes.", done, len(groups))
+
+        curves[key] = [node for node, node_type in input_nodes.items() if node_type in WARPABLE_CURVE_TYPES]
+        yield TaskProgress("Getting Input Nodes.", done + 1, len(groups))
+
+    yield TaskResult(curves)
+
+
+def connect_task(warp_node, member_curves, timings=None):
+    """ Task to connect curves to a warp a chunk at a time, in one undoable DG modifier.
+
+    Each chunk is done as it's added, and everything is undone again if the task is closed before it finishes.
+
+    Args:
+        warp_node (str): Name of warp node.
+        member_curves (dict): Member index to list of animCurve nodes to drive, index None for the main output.
+        timings (dict | None): Member index to tuple of offset in frames and scale.
+
+    Returns:
+        Generator of TaskProgress.
+    """
+    import maya.api.OpenMaya as om
+
+    # Warp stacks only have the main output.
+    output_plug = get_plugs(["{}.output".format(warp_node)])[0]
+    if any(index is not None for index in member_curves):
+        member_plug = get_plugs(["{}.memberOutput".format(warp_node)])[0]
+
+    modifier = cmds.wrap(om.MDGModifier())
+
+    if timings:
+        add_member_timings(modifier, warp_node, timings)
+
+    total = sum(len(curves) for curves in member_curves.values())
+    done = 0
+    finished = False
+
+    try:
+        yield TaskProgress("Adding Input Nodes.", done, total)
+
+        for index, curves in member_curves.items():
+            source_plug = output_plug if index is None else member_plug.elementByLogicalIndex(index)
+
+            # doIt only runs the edits added since it was last called.
+            for chunk in iter_chunks(curves):
+                connect_curves(modifier, source_plug, chunk)
+                modifier.doIt()
+                done += len(chunk)
+                yield TaskProgress("Adding Input Nodes.", done, total)
+
+        modifier.doIt()
+        finished = True
+
+    finally:
+        if not finished:
+            modifier.undoIt()
+
+    undo.commit(modifier.undoIt, modifier.doIt)
+
+
+def connect_curves(modifier, source_plug, curves):
+    """ Add connections from a warp plug to many curves to a DG modifier.
+
+    Args:
+        modifier (MDGModifier): Modifier to add the edits to.
+        source_plug (MPlug): Warp output plug.
+        curves (list): Names of animCurve nodes to drive.
+
+    Returns:
+        None
+    """
+
+    for input_plug in get_plugs(['{}.input'.format(curve) for curve in curves]):
+        # Same as connectAttr force, anything already driving the curve is broken first.
+        source, conversion = get_plug_source(input_plug)
+        if conversion is not None:
+            modifier.deleteNode(conversion)
+        elif source is not None:
+            modifier.disconnect(source, input_plug)
+
+        modifier.connect(source_plug, input_plug)
+
+
+def disconnect_warp(warp_node, curves, progress_bar=None):
+    """ Disconnect a warp from many curves in one undoable DG modifier. Curves the warp isn't driving are skipped.
+
+    Args:
+        warp_node (str): Name of warp node.
+        curves (list): Names of animCurve nodes to free.
+        progress_bar (ProgressBarContextManager | None): Progress bar to step for each curve, progress is shown
+            on its own if not given.
+
+    Returns:
+        None
+
+    Raises:
+        OperationCancelled: If cancelled from the progress bar, the curves freed so far are connected again.
+    """
+
+    run_task(disconnect_task(warp_node, curves), progress_bar=progress_bar)
+
+
+def disconnect_task(warp_node, curves):
+    """ Task to disconnect a warp from curves a chunk at a time, in one undoable DG modifier.
+
+    Each chunk is done as it's added, and everything is undone again if the task is closed before it finishes.
+
+    Args:
+        warp_node (str): Name of warp node.
+        curves (list): Names of animCurve nodes to free.
+
+    Returns:
+        Generator of TaskProgress.
+    """
+    import maya.api.OpenMaya as om
+
+    warp_object = get_plugs(["{}.output".format(warp_node)])[0].node()
+    modifier = cmds.wrap(om.MDGModifier())
+
+    done = 0
+    finished = False
+
+    try:
+        yield TaskProgress("Removing Input Nodes.", done, len(curves))
+
+        for chunk in iter_chunks(curves):
+            for input_plug in get_plugs(['{}.input'.format(curve) for curve in chunk]):
+                source, conversion = get_plug_source(input_plug)
+
+                # Curves driven by the main output or any member output are freed.
+                if source is not None and source.node() == warp_object:
+                    if conversion is not None:
+                        modifier.deleteNode(conversion)
+                    else:
+                        modifier.disconnect(source, input_plug)
+
+            modifier.doIt()
+            done += len(chunk)
+            yield TaskProgress("Removing Input Nodes.", done, len(curves))
+
+        finished = True
+
+    finally:
+        if not finished:
+            modifier.undoIt()
+
+    undo.commit(modifier.undoIt, modifier.doIt)
+
+
+def get_plugs(names):
+    """ Get API plugs for many attribute names.
+
+    Args:
+        names (list): Names of attributes like "node.attribute".
+
+    Returns:
+        list of MPlug.
+    """
+    import maya.api.OpenMaya as om
+
+    selection = cmds.wrap(om.MSelectionList())
+    for name in names:
+        selection.add(name)
+
+    return [selection.getPlug(index) for index in range(selection.length())]
+
+
+def get_plug_source(plug):
+    """ Get the plug driving a plug, looking through any unit conversion node in between.
+
+    Args:
+        plug (MPlug): Destination plug.
+
+    Returns:
+        tuple of source MPlug or None and the unitConversion MObject or None.
+    """
+    import maya.api.OpenMaya as om
+
+    source = plug.source()
+
+    if source.isNull:
+        return None, None
+
+    # Time and float attributes are joined through a unitConversion node.
+    if source.node().hasFn(om.MFn.kUnitConversion):
+        conversion = source.node()
+        conversion_input = om.MFnDependencyNode(conversion).findPlug('input', False).source()
+        return (None if conversion_input.isNull else conversion_input), conversion
+
+    return source, None
+
+
+def iter_chunks(items, progress_bar=None, chunk_size=CHUNK_SIZE):
+    """ Work through items a chunk at a time, stepping progress and checking for cancel after each chunk.
+
+    Args:
+        items (list): Items to work through.
+        progress_bar (ProgressBarContextManager | None): Progress bar to step for each item.
+        chunk_size (int | CHUNK_SIZE): Most items in a chunk.
+
+    Returns:
+        Generator of lists of items.
+
+    Raises:
+        OperationCancelled: If cancelled from the progress bar.
+    """
+
+    items = list(items)
+
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        yield chunk
+
+        if progress_bar is not None:
+            progress_bar.update_progress(len(chunk))
+            progress_bar.check_cancelled()
+
+
+def run_task(task, progress_bar=None):
+    """ Run a task to the end, showing its progress on the main progress bar.
+
+    Each message the task reports is shown as its own progress phase. Cancelling from the progress bar closes the
+    task, which undoes any edits it hasn't committed yet.
+
+    Args:
+        task (generator): Task yielding TaskProgress, like apply_warp_task.
+        progress_bar (ProgressBarContextManager | None): Progress bar to step, instead of one for each message.
+
+    Returns:
+        Value of the TaskResult the task ends with, None if it has none.
+
+    Raises:
+        OperationCancelled: If cancelled from the progress bar.
+    """
+
+    message = None
+    done = 0
+    phase = progress_bar
+    error_type = None
+
+    try:
+        for progress in task:
+            if isinstance(progress, TaskResult):
+                return progress.value
+
+            if progress.message != message:
+                message, done = progress.message, 0
+
+                # Each message is its own phase, the last one ends as the next one starts.
+                if progress_bar is None:
+                    if phase is not None:
+                        phase.__exit__(None, None, None)
+                        phase = None
+                    phase = ProgressBarContextManager(max(progress.total, 1), message=progress.message).__enter__()
+
+            phase.update_progress(progress.done - done)
+            done = progress.done
+            phase.check_cancelled()
+
+        return None
+
+    except BaseException as error:
+        error_type = type(error)
+        raise
+
+    finally:
+        if progress_bar is None and phase is not None:
+            phase.__exit__(error_type, None, None)
+        task.close()
+
+
+def delete_warp(warp_node):
+    """ Delete warp node.
+
+    Args:
+        warp_node (str | list): Name of warp node to delete, or list of names.
+
+    Returns:
+        None
+    """
+
+    cmds.delete(warp_node)
+
+
+def get_inputs(node):
+    """ Get input nodes of selected node.
+
+    Args:
+        node (str): Name of maya node to check.
+
+    Returns:
+        List of connections of that node.
+    """
+
+    return list(walk_inputs([node]))
+
+
+def walk_inputs(nodes):
+    """ Walk the upstream graph of many nodes in one pass, see walk_inputs_task.
+
+    Args:
+        nodes (list): Names of maya nodes to start from.
+
+    Returns:
+        dict of input geometryFilter and animCurve nodes to their node type.
+    """
+
+    for progress in walk_inputs_task(nodes):
+        if isinstance(progress, TaskResult):
+            return progress.value
+
+
+def walk_inputs_task(nodes):
+    """ Task to walk the upstream graph of many nodes a chunk of nodes at a time.
+
+    The graph is walked a level at a time with a shared visited set, so every node is only queried once however
+    many of the given nodes share it and cycles end the walk instead of recursing forever.
+
+    Args:
+        nodes (list): Names of maya nodes to start from.
+
+    Returns:
+        Generator of TaskProgress of nodes walked out of nodes found, ending with a TaskResult of dict of input
+        geometryFilter and animCurve nodes to their node type.
+    """
+
+    results = {}
+    visited = set(nodes)
+    frontier = list(visited)
+    walked = 0
+
+    while frontier:
+        found = []
+
+        for chunk in iter_chunks(frontier):
+            # Get geo nodes connections.
+            geo_inputs = cmds.listConnections(chunk, source=True, destination=False,
+                                              skipConversionNodes=True, type="geometryFilter") or []
+            # Get connected animation curves.
+            anim_curves = cmds.listConnections(chunk, source=True, destination=False,
+                                               skipConversionNodes=True, type="animCurve") or []
+
+            level = [node for node in set(geo_inputs + anim_curves) if node not in visited]
+
+            if level:
+                visited.update(level)
+                found.extend(level)
+
+                # One query gives the types of the whole chunk as name, type pairs.
+                typed = cmds.ls(level, showType=True) or []
+                results.update(zip(typed[::2], typed[1::2]))
+
+            walked += len(chunk)
+            yield TaskProgress("Getting Input Nodes.", walked, len(visited))
+
+        frontier = found
+
+    yield TaskResult(results)
+
+
+def get_warp_nodes():
+    """ Get all warp nodes in scene.
+
+    Returns:
+        list of warp nodes
+    """
+
+    return cmds.ls(type="WarpStatus")
+
+
+def get_warped_nodes(warp):
+    """Get all warped nodes for warp
+
+    Args:
+        warp (str): Maya warp node.
+
+    Returns:
+        list of nodes effected by warp.
+    """
+
+    return membership.INDEX.warped_nodes(warp)
+
+
+def get_warped_count(warp):
+    """Get number of warped nodes for warp
+
+    Args:
+        warp (str): Maya warp node.
+
+    Returns:
+        int of nodes effected by warp.
+    """
+
+    return membership.INDEX.count(warp)
+
+
+def get_node_warps(node):
+    """Get the warps driving a node.
+
+    Args:
+        node (str): Maya node.
+
+    Returns:
+        list of warp nodes.
+    """
+
+    return membership.INDEX.node_warps(node)
+
+
+def select_warped_nodes(warp):
+    """ Select warped nodes.
+
+    Args:
+        warp (str): Maya warp node.
+
+    Returns:
+        None
+    """
+
+    warped_nodes = get_warped_nodes(warp)
+
+    if warped_nodes:
+        cmds.select(warped_nodes, replace=True)
+    else:
+        cmds.select(clear=True)
+
+
+def get_warp_curve(warp):
+    """ Get curve of warp.
+
+    Args:
+        warp (str): Maya warp node.
+
+    Returns:
+        str of warp curve name.
+    """
+
+    # We need to get the input of warpInput and get that nodes parent.
+    warp_curve = cmds.listConnections(cmds.listConnections("{}.wi" .format(warp),
+                                                           source=True, destination=False),
+                                      source=True, destination=False)
+
+    return warp_curve
+
+
+def select_warp_curve(warp):
+    """ Select warped curve node.
+
+    Args:
+        warp (str): Maya warp node.
+
+    Returns:
+        None
+    """
+
+    warp_curve = get_warp_curve(warp)
+
+    if warp_curve:
+        cmds.select(warp_curve, replace=True)
+    else:
+        cmds.select(clear=True)
+
+
+def bake_warp(warp, steps=1, method=BAKE_SIMULATION, tolerance=0.01, handles=1):
+    """ Bake out warp and delete.
+
+    Args:
+        warp (str): Maya warp node.
+        steps (int | 1): How often to bake.
+        method (str | BAKE_SIMULATION): BAKE_SIMULATION steps the scene with bakeResults, BAKE_REMAP moves the
+            existing keys of the warped curves without evaluating the scene and fits new keys to curves it can't
+            remap within the tolerance, BAKE_ADAPTIVE fits new keys to the warped curves within the tolerance,
+            BAKE_PARTITIONED splits a simulation bake across mayapy workers.
+        tolerance (float | 0.01): Largest value error allowed by BAKE_REMAP and BAKE_ADAPTIVE.
+        handles (int | 1): Frames baked either side of where BAKE_SIMULATION finds the warp changing time.
+
+    Returns:
+        True if baked out.
+
+    Raises:
+        ValueError: If a warp stack is baked by BAKE_REMAP or BAKE_ADAPTIVE, stacks only bake by simulation.
+    """
+
+    try:
+        return bake_warp_method(warp, steps=steps, method=method, tolerance=tolerance, handles=handles)
+    except OperationCancelled:
+        cmds.warning(CANCELLED_MESSAGE)
+        return False
+
+
+def bake_warp_method(warp, steps=1, method=BAKE_SIMULATION, tolerance=0.01, handles=1):
+    """ Bake out warp with a method and delete, see bake_warp.
+
+    Args:
+        warp (str): Maya warp node.
+        steps (int | 1): How often to bake.
+        method (str | BAKE_SIMULATION): Bake method.
+        tolerance (float | 0.01): Largest value error allowed by BAKE_REMAP and BAKE_ADAPTIVE.
+        handles (int | 1): Frames baked either side of where BAKE_SIMULATION finds the warp changing time.
+
+    Returns:
+        True if baked out.
+
+    Raises:
+        OperationCancelled: If cancelled from the progress bar, the bake is undone.
+        ValueError: If a warp stack is baked by BAKE_REMAP or BAKE_ADAPTIVE.
+    """
+    method = get_bake_method(method)
+
+    if method == BAKE_REMAP:
+        return bake_warp_remap(warp, tolerance=tolerance)
+    if method == BAKE_ADAPTIVE:
+        return bake_warp_adaptive(warp, tolerance=tolerance)
+    if method == BAKE_PARTITIONED:
+        from timeWarp.scripts import batch
+        return batch.bake_partitioned(warp, steps=steps, handles=handles)
+
+    return bool(run_task(bake_warps_task([warp], steps=steps, handles=handles)))
+
+
+def bake_warp_task(warp, steps=1, method=BAKE_SIMULATION, tolerance=0.01, handles=1):
+    """ Task to bake out warp and delete, see bake_warp and run_task.
+
+    Simulation bakes call bakeResults a chunk of curves at a time, the same bake as bake_warps, see bake_warps_task.
+
+    Args:
+        warp (str): Maya warp node.
+        steps (int | 1): How often to bake.
+        method (str | BAKE_SIMULATION): Bake method.
+        tolerance (float | 0.01): Largest value error allowed by BAKE_REMAP and BAKE_ADAPTIVE.
+        handles (int | 1): Frames baked either side of where BAKE_SIMULATION finds the warp changing time.
+
+    Returns:
+        Generator of TaskProgress, ending with a TaskResult of True if baked out.
+    """
+    method = get_bake_method(method)
+
+    if method == BAKE_REMAP:
+        task = bake_warp_remap_task(warp, tolerance=tolerance)
+    elif method == BAKE_ADAPTIVE:
+        task = bake_warp_adaptive_task(warp, tolerance=tolerance)
+    elif method == BAKE_SIMULATION:
+        task = bake_warp_simulation_task(warp, steps=steps, handles=handles)
+    else:
+        # Partitioned bakes wait on their workers, so they run in one go.
+        yield TaskProgress("Baking Warp.", 0, 1)
+        yield TaskResult(bake_warp_method(warp, steps=steps, method=method, tolerance=tolerance, handles=handles))
+        return
+
+    for progress in task:
+        yield progress
+
+
+def get_bake_method(method):
+    """ Get the bake method that can run in this session. Methods other than simulation evaluate curves with NumPy,
+    so mayapy without it bakes by simulation instead.
+
+    Args:
+        method (str): Bake method.
+
+    Returns:
+        str of bake method.
+    """
+    if method == BAKE_SIMULATION:
+        return method
+
+    try:
+        import numpy  # pylint: disable=unused-import
+    except ImportError:
+        cmds.warning("NumPy isn't available for the {} bake, baking by simulation instead.".format(method))
+        return BAKE_SIMULATION
+
+    return method
+
+
+def bake_warps(warps, steps=1, method=BAKE_SIMULATION, tolerance=0.01, handles=1):
+    """ Bake out many warps together and delete them.
+
+    The simulation bake gathers the curves driven by every warp and bakes them over the frames where any warp
+    changes time, see bake_warps_task. The warps are deleted afterwards in the same undo chunk.
+
+    Args:
+        warps (list): Maya warp nodes.
+        steps (int | 1): How often to bake.
+        method (str | BAKE_SIMULATION): Bake method, see bake_warp.
+        tolerance (float | 0.01): Largest value error allowed by BAKE_REMAP and BAKE_ADAPTIVE.
+        handles (int | 1): Frames baked either side of where the warps change time.
+
+    Returns:
+        list of warps baked out.
+
+    Raises:
+        ValueError: If a warp stack is baked by BAKE_REMAP or BAKE_ADAPTIVE, nothing is baked.
+    """
+
+    # Only the simulation bake steps the timeline here, so other methods have nothing to share between warps.
+    method = get_bake_method(method)
+
+    # Every warp is checked before any is baked, so a stack can't stop the bake part way.
+    if method in (BAKE_REMAP, BAKE_ADAPTIVE):
+        stacks = [warp for warp in warps if is_stack(warp)]
+        if stacks:
+            raise ValueError("{} are warp stacks, their layers can only be baked by simulation.".format(
+                ", ".join(stacks)))
+
+    if method != BAKE_SIMULATION:
+        baked = []
+        try:
+            for warp in warps:
+                if bake_warp_method(warp, steps=steps, method=method, tolerance=tolerance, handles=handles):
+                    baked.append(warp)
+        except OperationCancelled:
+            # Warps baked before the cancel stay baked.
+            cmds.warning(CANCELLED_MESSAGE)
+        return baked
+
+    try:
+        return run_task(bake_warps_task(warps, steps=steps, handles=handles))
+    except OperationCancelled:
+        cmds.warning(CANCELLED_MESSAGE)
+        return []
+
+
+def bake_warps_task(warps, steps=1, handles=1):
+    """ Task to bake out many warps by simulation a chunk of curves at a time, then delete them, see bake_warps and
+    run_task.
+
+    Each chunk of curves is baked by its own bakeResults call over the frames where any warp changes time. The calls
+    and the deletes share one undo chunk, so the whole bake is one undo step however it's run. The chunk stays open
+    until the task finishes, and what was baked is undone again if the task is closed before then.
+
+    Args:
+        warps (list): Maya warp or stack nodes.
+        steps (int | 1): How often to bake.
+        handles (int | 1): Frames baked either side of where the warps change time.
+
+    Returns:
+        Generator of TaskProgress, ending with a TaskResult of list of warps baked out.
+    """
+
+    curve_plugs = {}
+    ranges = []
+    baked = []
+
+    for warp in warps:
+        warp_plugs = get_curve_plugs(get_driven_curves(warp))
+        if not warp_plugs:
+            continue
+
+        baked.append(warp)
+        frame_range = get_warp_range(warp, handles=handles)
+
+        # Where a warp never changes time its curves already play correctly without it.
+        if frame_range:
+            curve_plugs.update(warp_plugs)
+            ranges.append(frame_range)
+
+    if not baked:
+        yield TaskResult(baked)
+        return
+
+    done = 0
+    finished = False
+    cmds.undoInfo(openChunk=True, chunkName=BAKE_CHUNK_NAME, stateWithoutFlush=True)
+
+    try:
+        yield TaskProgress("Baking Warped Curves.", done, len(curve_plugs))
+
+        if curve_plugs:
+            frame_start = min(frame_range[0] for frame_range in ranges)
+            frame_end = max(frame_range[1] for frame_range in ranges)
+
+            # Curves are never split between calls, so every plug a curve drives is baked from the same samples.
+            for chunk in iter_chunks(curve_plugs):
+                cmds.bakeResults([plug for curve_node in chunk for plug in curve_plugs[curve_node]], sampleBy=steps,
+                                 time=(frame_start, frame_end), simulation=True, preserveOutsideKeys=True)
+                done += len(chunk)
+                yield TaskProgress("Baking Warped Curves.", done, len(curve_plugs))
+
+        delete_warp(baked)
+        finished = True
+
+    finally:
+        cmds.undoInfo(closeChunk=True, stateWithoutFlush=True)
+
+        # An undo that aborted the task has already undone the chunk, anything else is left alone.
+        if not finished and cmds.undoInfo(query=True, undoName=True) == BAKE_CHUNK_NAME:
+            cmds.undo()
+
+    yield TaskResult(baked)
+
+
+def bake_warp_simulation_task(warp, steps=1, handles=1):
+    """ Task to bake out warp by simulation, then delete, see bake_warps_task and run_task.
+
+    Args:
+        warp (str): Maya warp or stack node.
+        steps (int | 1): How often to bake.
+        handles (int | 1): Frames baked either side of where the warp changes time.
 
     Returns:
-        maya node name of warp time curve.
+        Generator of TaskProgress, ending with a TaskResult of True if baked out.
     """
 
-    min_time = maya.cmds.playbackOptions(query=True, minTime=True)
-    max_time = maya.cmds.playbackOptions(query=True, maxTime=True)
+    for progress in bake_warps_task([warp], steps=steps, handles=handles):
+        if isinstance(progress, TaskResult):
+            yield TaskResult(bool(progress.value))
+        else:
+            yield progress
 
-    curve_name = 'atk_WarpCurve'
-    connection_name = "atk_warpSettings"
 
-    if warp_name:
-        curve_name = warp_name
-        connection_name = '{}_warpSettings'.format(warp_name)
+def get_curve_plugs(curves):
+    """ Get the attributes driven by many curves.
 
-    if anti_warp:
-        curve_name = '{}_AntiWarp'.format(curve_name)
+    Args:
+        curves (list): Maya animCurve nodes.
 
-    warp_node = maya.cmds.createNode('animCurveTT', name=curve_name)
-    maya.cmds.setAttr(warp_node + ".preInfinity", 1)
-    maya.cmds.setAttr(warp_node + ".postInfinity", 1)
+    Returns:
+        dict of animCurve node to list of plugs like "node.attribute", only for curves that drive something.
+    """
 
-    # Anti warp is created based on the scene time warp
-    if anti_warp:
-        for frame in range(min_time, max_time + 1):
-            time = maya.cmds.getAttr('time1.outTime', time=frame)
-            maya.cmds.setKeyframe(warp_node, time=time, value=frame)
+    if not curves:
+        return {}
+
+    connections = cmds.listConnections(curves, source=False, destination=True, skipConversionNodes=True,
+                                       connections=True, plugs=True) or []
+
+    # Connections come back as pairs of curve plug and driven plug.
+    curve_plugs = {}
+    for curve_plug, plug in zip(connections[::2], connections[1::2]):
+        curve_plugs.setdefault(curve_plug.split(".")[0], []).append(plug)
+
+    return curve_plugs
+
+
+def get_warp_curves(warp):
+    """ Get the warp curve each driven curve plays, with member offset and scale applied.
+
+    Args:
+        warp (str): Maya warp node.
+
+    Returns:
+        dict of animCurve node to WarpCurve, or None where the curve plays at scene time.
+
+    Raises:
+        ValueError: If the warp is a stack, its blended layers aren't a single warp curve.
+    """
+    from timeWarp.scripts import curve
+
+    if is_stack(warp):
+        raise ValueError("{} is a warp stack, its layers can only be baked by simulation.".format(warp))
+
+    curves = get_driven_curves(warp)
+
+    if not curves:
+        return {}
+
+    # An inactive warp plays scene time, members still apply their offset and scale on top.
+    if is_warp_active(warp):
+        warp_curve = curve.WarpCurve.from_maya(get_warp_curve(warp)[0])
     else:
-        maya.cmds.setKeyframe(warp_node, time=min_time, value=min_time, inTangentType="spline", outTangentType="spline")
-        maya.cmds.setKeyframe(warp_node, time=max_time, value=max_time, inTangentType="spline", outTangentType="spline")
+        warp_curve = None
 
-    status_node = maya.cmds.createNode('WarpStatus', name=re.sub(curve_name, warp_node, connection_name))
+    member_curves = get_member_curves(warp)
+    timings = get_member_timings(warp, set(member_curves.values()))
 
-    # Set connections for toggle node
-    maya.cmds.connectAttr(warp_node + ".output", status_node + ".warpInput", force=True)
-    # Connect real time to the alternate condition
-    maya.cmds.connectAttr("time1.outTime", status_node + ".timeInput", force=True)
+    member_warps = {}
+    for index, (offset, scale) in timings.items():
+        if offset == 0.0 and scale == 1.0:
+            member_warps[index] = warp_curve
+        elif warp_curve is None:
+            member_warps[index] = curve.WarpCurve([0.0, 1.0], [offset, offset + scale],
+                                                  in_types=['linear'] * 2, out_types=['linear'] * 2,
+                                                  pre_infinity=curve.LINEAR, post_infinity=curve.LINEAR)
+        else:
+            member_warps[index] = warp_curve.retimed(offset, scale)
 
-    return status_node
+    return dict((curve_node, member_warps[member_curves[curve_node]] if curve_node in member_curves else warp_curve)
+                for curve_node in curves)
 
 
-def apply_warp(warp_node):
-    """ Apply Warp to selected nodes.
+def get_weighted_curves(curves):
+    """ Get the curves with weighted tangents. WarpCurve reads every tangent as unweighted, so these can only be baked
+    by simulation.
 
     Args:
-        warp_node (str): Name of warp node to apply the on the selected objects
+        curves (list): Maya animCurve nodes.
 
     Returns:
-        Bool If applied
+        list of animCurve nodes with weighted tangents.
     """
+    weighted = []
 
-    selection = maya.cmds.ls(selection=True, dag=True, long=True)
+    for chunk in iter_chunks(curves):
+        # One query gives a flag for each curve of the chunk.
+        flags = cmds.keyTangent(chunk, query=True, weightedTangents=True) or []
+        weighted.extend(curve_node for curve_node, flag in zip(chunk, flags) if flag)
 
-    if not selection:
-        return False
+    return weighted
 
-    input_nodes = []
 
-    with ProgressBarContextManager(len(selection), message="Getting Input Nodes.") as progress_bar:
-        for node in selection:
-            input_nodes = list(set(input_nodes + get_inputs(node)))
-            progress_bar.update_progress()
+def get_warp_range(warp, handles=1, samples_per_frame=4, threshold=0.0001):
+    """ Get the part of the playback range where a warp changes time.
 
-    if not input_nodes:
-        return False
+    Args:
+        warp (str): Maya warp node.
+        handles (int | 1): Frames added either side.
+        samples_per_frame (int | 4): How many times per frame the warp is checked.
+        threshold (float | 0.0001): Smallest difference in frames from scene time that counts as a change.
+
+    Returns:
+        tuple of start and end frame, or None if the warp never changes time.
+    """
+    frame_start = cmds.playbackOptions(query=True, minTime=True, animationStartTime=False)
+    frame_end = cmds.playbackOptions(query=True, maxTime=True, animationEndTime=False)
+
+    # Without NumPy the warp can't be evaluated here, so the whole playback range is baked as it always was.
+    try:
+        import numpy
+    except ImportError:
+        return frame_start, frame_end
+
+    # Weighted warp curves are read as unweighted, so where they change time can't be found here either.
+    if is_stack(warp):
+        warp_curves = [warp_curve for _, warp_curve, _, _ in get_stack_layers(warp) if warp_curve]
+    else:
+        warp_curves = get_warp_curve(warp) or []
+
+    if get_weighted_curves(warp_curves):
+        return frame_start, frame_end
 
-    with ProgressBarContextManager(len(input_nodes), message="Adding Input Nodes.") as progress_bar:
-        maya.cmds.undoInfo(openChunk=True, stateWithoutFlush=True)
-        for connection in input_nodes:
-            node_type = maya.cmds.nodeType(connection)
+    frames = numpy.linspace(frame_start, frame_end, int(round((frame_end - frame_start) * samples_per_frame)) + 1)
 
-            if node_type in ["animCurveTU", "animCurveTA", "animCurveTL"]:
-                maya.cmds.connectAttr("{}.output".format(warp_node), '{}.input'.format(connection), force=True)
+    # Every distinct member timing plays its own curve, the range covers all of them.
+    if is_stack(warp):
+        warped_times = [get_stack_times(warp, frames)]
+    else:
+        warped_times = [warp_curve.evaluate(frames) for warp_curve in set(get_warp_curves(warp).values())
+                        if warp_curve is not None]
 
-            progress_bar.update_progress()
+    changed = numpy.zeros(len(frames), dtype=bool)
+    for times in warped_times:
+        changed |= numpy.abs(times - frames) > threshold
+    changed = numpy.flatnonzero(changed)
 
-        maya.cmds.undoInfo(closeChunk=True, stateWithoutFlush=True)
+    if not len(changed):
+        return None
 
-    return True
+    return (max(frame_start, numpy.floor(frames[changed[0]]) - handles),
+            min(frame_end, numpy.ceil(frames[changed[-1]]) + handles))
 
 
-def remove_warp(warp_node):
-    """ Remove Warp to selected nodes.
+def bake_warp_remap(warp, tolerance=0.01):
+    """ Bake out warp by moving the keys of every warped curve through the inverse of the warp, then delete.
+
+    A key at time t is moved to the scene frame where the warp reaches t, and its tangents are scaled by the warp's
+    speed there. The cost depends on the number of keys, not the frame range or scene complexity. Remapped keys are
+    only exact on the keys, so each curve is checked between them, and one that strays further than the tolerance
+    is fitted with new keys like BAKE_ADAPTIVE instead. Warps that run backwards in time, or with weighted tangents on
+    the warp curve or any warped curve, are baked by simulation instead.
 
     Args:
-        warp_node (str): Name of warp node to remove the on the selected objects
+        warp (str): Maya warp node.
+        tolerance (float | 0.01): Largest allowed value error, in the curve's units.
 
     Returns:
-        Bool If removed
+        True if baked out.
+
+    Raises:
+        OperationCancelled: If cancelled from the progress bar, the bake is undone.
+        ValueError: If a warp stack is baked by BAKE_REMAP or BAKE_ADAPTIVE.
     """
 
-    selection = maya.cmds.ls(selection=True, dag=True, long=True)
+    return run_task(bake_warp_remap_task(warp, tolerance=tolerance))
 
-    if not selection:
-        return False
 
-    input_nodes = []
+def bake_warp_remap_task(warp, tolerance=0.01):
+    """ Task to bake out warp by moving keys a chunk of curves at a time, see bake_warp_remap and run_task.
 
-    with ProgressBarContextManager(len(selection), message="Getting Input Nodes.") as progress_bar:
-        for node in selection:
-            input_nodes = list(set(input_nodes + get_inputs(node)))
-            progress_bar.update_progress()
+    Args:
+        warp (str): Maya warp node.
+        tolerance (float | 0.01): Largest allowed value error, in the curve's units.
 
-    if not input_nodes:
-        return False
+    Returns:
+        Generator of TaskProgress, ending with a TaskResult of True if baked out.
+    """
+    import maya.api.OpenMayaAnim as oma
+    from timeWarp.scripts import curve
+
+    warp_curves = get_warp_curves(warp)
+
+    if not warp_curves:
+        yield TaskResult(False)
+        return
+
+    frame_range = (cmds.playbackOptions(query=True, minTime=True, animationStartTime=False),
+                   cmds.playbackOptions(query=True, maxTime=True, animationEndTime=False))
+
+    # Curves playing at scene time keep their keys where they are.
+    remapped = [(curve_node, warp_curve) for curve_node, warp_curve in warp_curves.items() if warp_curve is not None]
+
+    if not all(warp_curve.is_monotonic() for warp_curve in set(warp_curve for _, warp_curve in remapped)):
+        cmds.warning("{} runs backwards in time so can't be inverted, "
+                     "baking by simulation instead.".format(warp))
+        for progress in bake_warp_simulation_task(warp):
+            yield progress
+        return
+
+    # Remapping scales tangent slopes but would keep their weights, and the check between keys reads them unweighted.
+    weighted = get_weighted_curves((get_warp_curve(warp) or []) + [curve_node for curve_node, _ in remapped])
+    if weighted:
+        cmds.warning("Weighted tangents on {} can't be remapped, baking {} by simulation instead.".format(
+            ", ".join(weighted), warp))
+        for progress in bake_warp_simulation_task(warp):
+            yield progress
+        return
+
+    curves = list(warp_curves)
+    change = oma.MAnimCurveChange()
+    done = 0
+    fitted = 0
+    finished = False
+
+    try:
+        yield TaskProgress("Remapping Keys.", done, len(remapped))
+
+        for chunk in iter_chunks(remapped):
+            for curve_node, warp_curve in chunk:
+                source = curve.WarpCurve.from_maya(curve_node)
+
+                if curve.remap(source, warp_curve, *frame_range)[1] > tolerance:
+                    fit_curve_keys(curve_node, source, warp_curve, frame_range, tolerance, change)
+                    fitted += 1
+                else:
+                    remap_curve_keys(curve_node, warp_curve, change)
+
+            done += len(chunk)
+            yield TaskProgress("Remapping Keys.", done, len(remapped))
+
+        finished = True
+
+    finally:
+        if not finished:
+            change.undoIt()
+
+    if fitted:
+        cmds.warning("{} of {} curves strayed further than {} from {} between their keys, so they were fitted "
+                     "with new keys instead of remapped.".format(fitted, len(remapped), tolerance, warp))
+
+    # The keys are only committed once every curve is done, so the undo chunk is never left open between slices.
+    with UndoChunkContextManager():
+        if remapped:
+            undo.commit(change.undoIt, change.redoIt)
+
+        disconnect_warp(warp, curves)
+        delete_warp(warp)
 
-    with ProgressBarContextManager(len(input_nodes), message="Removing Input Nodes.") as progress_bar:
-        maya.cmds.undoInfo(openChunk=True, stateWithoutFlush=True)
-        for connection in input_nodes:
-            node_type = maya.cmds.nodeType(connection)
+    yield TaskResult(True)
 
-            if node_type in ["animCurveTU", "animCurveTA", "animCurveTL"]:
-                try:
-                    maya.cmds.disconnectAttr("{}.output".format(warp_node), '{}.input'.format(connection))
-                except RuntimeError:
-                    continue
-            progress_bar.update_progress()
-        maya.cmds.undoInfo(closeChunk=True, stateWithoutFlush=True)
 
-    return True
+def bake_warp_adaptive(warp, tolerance=0.01):
+    """ Bake out warp by fitting new keys to every warped curve, then delete.
 
+    Each curve is sampled densely only where the warp or the curve bends and keyed with as few keys as keep it
+    within the tolerance. The bake covers the playback range and every existing key. Warps with weighted tangents on
+    the warp curve or any warped curve are baked by simulation instead.
 
-def delete_warp(warp_node):
+    Args:
+        warp (str): Maya warp node.
+        tolerance (float | 0.01): Largest allowed value error, in the curve's units.
+
+    Returns:
+        True if baked out.
+
+    Raises:
+        OperationCancelled: If cancelled from the progress bar, the bake is undone.
+        ValueError: If a warp stack is baked by BAKE_REMAP or BAKE_ADAPTIVE.
+    """
+
+    return run_task(bake_warp_adaptive_task(warp, tolerance=tolerance))
+
+
+def bake_warp_adaptive_task(warp, tolerance=0.01):
+    """ Task to bake out warp by fitting keys a curve at a time, see bake_warp_adaptive and run_task.
+
+    Args:
+        warp (str): Maya warp node.
+        tolerance (float | 0.01): Largest allowed value error, in the curve's units.
+
+    Returns:
+        Generator of TaskProgress, ending with a TaskResult of True if baked out.
     """
+    import maya.api.OpenMayaAnim as oma
+    from timeWarp.scripts import curve
+
+    warp_curves = get_warp_curves(warp)
+
+    if not warp_curves:
+        yield TaskResult(False)
+        return
+
+    frame_start = cmds.playbackOptions(query=True, minTime=True, animationStartTime=False)
+    frame_end = cmds.playbackOptions(query=True, maxTime=True, animationEndTime=False)
+
+    # Curves playing at scene time keep their keys as they are.
+    fitted = [(curve_node, warp_curve) for curve_node, warp_curve in warp_curves.items() if warp_curve is not None]
+
+    # The fit evaluates curves as if their tangents were unweighted.
+    weighted = get_weighted_curves((get_warp_curve(warp) or []) + [curve_node for curve_node, _ in fitted])
+    if weighted:
+        cmds.warning("Weighted tangents on {} can't be fitted, baking {} by simulation instead.".format(
+            ", ".join(weighted), warp))
+        for progress in bake_warp_simulation_task(warp):
+            yield progress
+        return
+
+    curves = list(warp_curves)
+    change = oma.MAnimCurveChange()
+    finished = False
+
+    try:
+        yield TaskProgress("Fitting Keys.", 0, len(fitted))
+
+        # Fitting a curve is slow enough to report progress after each one.
+        for done, (curve_node, warp_curve) in enumerate(fitted, 1):
+            fit_curve_keys(curve_node, curve.WarpCurve.from_maya(curve_node), warp_curve, (frame_start, frame_end),
+                           tolerance, change)
+            yield TaskProgress("Fitting Keys.", done, len(fitted))
+
+        finished = True
+
+    finally:
+        if not finished:
+            change.undoIt()
+
+    with UndoChunkContextManager():
+        if fitted:
+            undo.commit(change.undoIt, change.redoIt)
+
+        disconnect_warp(warp, curves)
+        delete_warp(warp)
+
+    yield TaskResult(True)
+
+
+def fit_curve_keys(curve_node, source, warp_curve, frame_range, tolerance, change):
+    """ Replace a curve's keys with as few keys as keep it within the tolerance of itself played through a warp.
+
+    The fit covers the frame range and, where the warp can be inverted, every existing key.
 
     Args:
-        warp_node (str): Name of warp node to delete
+        curve_node (str): Maya animCurve node driven by the warp.
+        source (WarpCurve): Curve of the animCurve node's keys.
+        warp_curve (WarpCurve): Curve of the warp.
+        frame_range (tuple): Start and end frame to fit.
+        tolerance (float): Largest allowed value error, in the curve's units.
+        change (MAnimCurveChange): Change to record the edits to.
 
     Returns:
         None
     """
+    from timeWarp.scripts import curve
 
-    maya.cmds.delete(warp_node)
+    start, end = frame_range
+    if warp_curve.is_monotonic():
+        start = min(start, warp_curve.invert(source.start))
+        end = max(end, warp_curve.invert(source.end))
 
+    baked = curve.bake(source, warp_curve, start, end, tolerance=tolerance)
+    set_curve_keys(curve_node, baked.times, baked.values,
+                   in_slopes=baked.in_slopes, out_slopes=baked.out_slopes, change=change)
 
-def get_inputs(node):
-    """ Get input nodes of selected node.
+
+def remap_curve_keys(curve_node, warp_curve, change):
+    """ Move a curve's keys through the inverse of a warp and scale their tangents by the warp speed.
 
     Args:
-        node (str): Name of maya node to check.
+        curve_node (str): Maya animCurve node driven by the warp.
+        warp_curve (WarpCurve): Curve of the warp.
+        change (MAnimCurveChange): Change to record the edits to.
 
     Returns:
-        List of connections of that node.
+        None
     """
+    import math
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
 
-    results = []
+    selection = om.MSelectionList()
+    selection.add(curve_node)
+    curve_fn = cmds.wrap(oma.MFnAnimCurve(selection.getDependNode(0)))
 
-    # Get geo nodes connections.
-    geo_inputs = maya.cmds.listConnections(node, source=True, destination=False,
-                                           skipConversionNodes=True, type="geometryFilter") or []
-    # Get connected animation curves.
-    anim_curves = maya.cmds.listConnections(node, source=True, destination=False,
-                                            skipConversionNodes=True, type="animCurve") or []
-    # Make sure we aren't having any duplicates.
-    inputs = list(set(geo_inputs + anim_curves))
+    key_count = curve_fn.numKeys
+    ui_unit = om.MTime.uiUnit()
 
-    if not inputs:
-        return results
+    times = [curve_fn.input(index).asUnits(ui_unit) for index in range(key_count)]
+    new_times = warp_curve.invert(times)
+    speeds = warp_curve.derivative(new_times)
 
-    # We can make sure we have no connections of connections.
-    for connection in inputs:
-        results += get_inputs(connection)
+    # Tangents are read before anything moves, as moving keys and locked tangents both change them.
+    step_types = (oma.MFnAnimCurve.kTangentStep, oma.MFnAnimCurve.kTangentStepNext)
+    tangents = []
+    for index in range(key_count):
+        for is_in_tangent in (True, False):
+            if is_in_tangent:
+                tangent_type = curve_fn.inTangentType(index)
+            else:
+                tangent_type = curve_fn.outTangentType(index)
 
-    return list(set(inputs + results))
+            if tangent_type not in step_types:
+                angle, weight = curve_fn.getTangentAngleWeight(index, is_in_tangent)
+                tangents.append((index, is_in_tangent, angle.asRadians(), weight))
 
+    # Moving a key left can't pass a neighbour if we go left to right, and moving right if we go right to left.
+    left = [index for index in range(key_count) if new_times[index] < times[index]]
+    right = [index for index in reversed(range(key_count)) if new_times[index] > times[index]]
 
-def get_warp_nodes():
-    """ Get all warp nodes in scene.
+    for index in left + right:
+        curve_fn.setInput(index, om.MTime(float(new_times[index]), ui_unit), change)
+
+    for index, is_in_tangent, angle, weight in tangents:
+        new_angle = om.MAngle(math.atan(math.tan(angle) * float(speeds[index])))
+        curve_fn.setTangent(index, new_angle, weight, is_in_tangent, change)
+
+
+def is_warp_active(warp):
+    """ Check if the warp is active
+
+    Args:
+        warp (str): Maya warp or stack node.
 
     Returns:
-        list of warp nodes
+        Bool if active
     """
 
-    return maya.cmds.ls(type="WarpStatus")
+    # A stack warps time while any of its layers does.
+    if is_stack(warp):
+        return any(warp_curve and weight and enabled for _, warp_curve, weight, enabled in get_stack_layers(warp))
 
+    return cmds.getAttr('{}.warpActive' .format(warp))
 
-def get_warped_nodes(warp):
-    """Get all warped nodes for warp
+
+def set_warp_status(warp, status):
+    """ set warp status.
 
     Args:
         warp (str): Maya warp node.
+        status (bool): If warp should be active.
 
     Returns:
-        list of nodes effected by warp.
+        None
     """
 
-    warped = []
+    cmds.setAttr('{}.warpActive' .format(warp), status)
 
-    curves = maya.cmds.listConnections(warp, source=False, destination=True, skipConversionNodes=True)
 
-    if not curves:
-        return warped
+def create_stack(stack_name=None, warp_curves=None):
+    """ Create a warp stack, a single node that composites many warp curves.
+
+    Args:
+        stack_name (str | None): Custom name of stack.
+        warp_curves (list | None): Warp curves to add as layers, bottom layer first.
 
-    for curve in curves:
-        nodes = maya.cmds.listConnections(curve, source=False, destination=True, skipConversionNodes=True)
-        for node in nodes:
-            if node not in warped:
-                warped.append(node)
+    Returns:
+        maya node name of stack.
+    """
 
-    return warped
+    cmds.undoInfo(openChunk=True, stateWithoutFlush=True)
 
+    try:
+        stack_node = cmds.createNode('WarpStack', name='{}_warpStack'.format(stack_name or 'atk'))
+        cmds.connectAttr("time1.outTime", stack_node + ".timeInput", force=True)
 
-def select_warped_nodes(warp):
-    """ Select warped nodes.
+        for warp_curve in warp_curves or []:
+            add_stack_layer(stack_node, warp_curve=warp_curve)
+
+    finally:
+        cmds.undoInfo(closeChunk=True, stateWithoutFlush=True)
+
+    return stack_node
+
+
+def is_stack(warp):
+    """ Check if a warp node is a warp stack.
 
     Args:
-        warp (str): Maya warp node.
+        warp (str): Maya warp or stack node.
 
     Returns:
-        None
+        Bool if stack
     """
 
-    warped_nodes = get_warped_nodes(warp)
+    return cmds.nodeType(warp) == 'WarpStack'
 
-    if warped_nodes:
-        maya.cmds.select(warped_nodes, replace=True)
-    else:
-        maya.cmds.select(clear=True)
 
+def get_stack_times(stack, frames):
+    """ Get the time a stack plays at scene frames, blending its layers the way the WarpStack node does.
 
-def get_warp_curve(warp):
-    """ Get curve of warp.
+    Args:
+        stack (str): Maya stack node.
+        frames (numpy.ndarray): Scene frames.
+
+    Returns:
+        numpy.ndarray of warped times.
+    """
+    import numpy
+    from timeWarp.scripts import curve
+
+    times = numpy.array(frames, dtype=float)
+
+    for _, warp_curve, weight, enabled in get_stack_layers(stack):
+        if warp_curve and weight and enabled:
+            times = times + weight * (curve.WarpCurve.from_maya(warp_curve).evaluate(times) - times)
+
+    return times
+
+
+def get_stack_nodes():
+    """ Get all warp stack nodes in scene.
+
+    Returns:
+        list of stack nodes
+    """
+
+    return cmds.ls(type="WarpStack")
+
+
+def add_stack_layer(stack, warp_curve=None, weight=1.0, enabled=True):
+    """ Add a layer on top of a stack.
 
     Args:
-        warp (str): Maya warp node.
+        stack (str): Maya stack node.
+        warp_curve (str | None): Warp curve of layer, a new curve spanning the timeline is made if not given.
+        weight (float | 1.0): How much the layer warps time, from 0 to 1.
+        enabled (bool | True): If the layer is active.
 
     Returns:
-        str of warp curve name.
+        int of layer index.
     """
 
-    # We need to get the input of warpInput and get that nodes parent.
-    warp_curve = maya.cmds.listConnections(maya.cmds.listConnections("{}.wi" .format(warp),
-                                                                     source=True, destination=False),
-                                           source=True, destination=False)
+    indices = cmds.getAttr('{}.layer'.format(stack), multiIndices=True) or []
+    index = indices[-1] + 1 if indices else 0
+    layer = '{}.layer[{}]'.format(stack, index)
 
-    return warp_curve
+    if not warp_curve:
+        min_time = cmds.playbackOptions(query=True, minTime=True)
+        max_time = cmds.playbackOptions(query=True, maxTime=True)
 
+        warp_curve = cmds.createNode('animCurveTT', name='{}_layer{}'.format(stack, index))
+        cmds.setAttr(warp_curve + ".preInfinity", 1)
+        cmds.setAttr(warp_curve + ".postInfinity", 1)
+        cmds.setKeyframe(warp_curve, time=min_time, value=min_time,
+                         inTangentType="spline", outTangentType="spline")
+        cmds.setKeyframe(warp_curve, time=max_time, value=max_time,
+                         inTangentType="spline", outTangentType="spline")
 
-def select_warp_curve(warp):
-    """ Select warped curve node.
+    cmds.connectAttr(warp_curve + ".output", layer + ".layerInput", force=True)
+    cmds.setAttr(layer + ".layerWeight", weight)
+    cmds.setAttr(layer + ".layerEnable", enabled)
+
+    return index
+
+
+def set_stack_layer(stack, index, weight=None, enabled=None):
+    """ Edit a stack layer.
 
     Args:
-        warp (str): Maya warp node.
+        stack (str): Maya stack node.
+        index (int): Layer index.
+        weight (float | None): New weight, unchanged if not given.
+        enabled (bool | None): New active state, unchanged if not given.
 
     Returns:
         None
     """
 
-    warp_curve = get_warp_curve(warp)
+    layer = '{}.layer[{}]'.format(stack, index)
 
-    if warp_curve:
-        maya.cmds.select(warp_curve, replace=True)
-    else:
-        maya.cmds.select(clear=True)
+    if weight is not None:
+        cmds.setAttr(layer + ".layerWeight", weight)
+    if enabled is not None:
+        cmds.setAttr(layer + ".layerEnable", enabled)
 
 
-def bake_warp(warp, steps=1):
-    """ Bake out warp and delete.
+def remove_stack_layer(stack, index):
+    """ Remove a layer from a stack, its warp curve is left in the scene.
 
     Args:
-        warp (str): Maya warp node.
-        steps (int | 1): How often to bake.
+        stack (str): Maya stack node.
+        index (int): Layer index.
 
     Returns:
-        True if baked out.
+        None
     """
 
-    warped_nodes = get_warped_nodes(warp)
+    cmds.removeMultiInstance('{}.layer[{}]'.format(stack, index), b=True)
 
-    if warped_nodes:
 
-        frame_start = maya.cmds.playbackOptions(query=True, minTime=True, animationStartTime=False)
-        frame_end = maya.cmds.playbackOptions(query=True, maxTime=True, animationEndTime=False)
+def get_stack_layers(stack):
+    """ Get the layers of a stack, bottom layer first.
 
-        maya.cmds.bakeResults(warped_nodes, sampleBy=steps, time=(frame_start, frame_end),
-                              simulation=True, preserveOutsideKeys=True)
+    Args:
+        stack (str): Maya stack node.
 
-        delete_warp(warp)
+    Returns:
+        list of tuples of index, warp curve, weight and enabled.
+    """
 
-        return True
+    layers = []
 
-    return False
+    for index in cmds.getAttr('{}.layer'.format(stack), multiIndices=True) or []:
+        layer = '{}.layer[{}]'.format(stack, index)
+        curves = cmds.listConnections(layer + ".layerInput", source=True, destination=False,
+                                      skipConversionNodes=True) or [None]
+        layers.append((index, curves[0],
+                       cmds.getAttr(layer + ".layerWeight"),
+                       cmds.getAttr(layer + ".layerEnable")))
 
+    return layers
 
-def is_warp_active(warp):
-    """ Check if the warp is active
+
+def get_main_progress_bar():
+    """ Get Maya's main progress bar.
+
+    Returns:
+        str name of progress bar, or None in batch mode.
+    """
+    global _MAIN_PROGRESS_BAR
+
+    if _MAIN_PROGRESS_BAR is None and not cmds.about(batch=True):
+        _MAIN_PROGRESS_BAR = maya.mel.eval('$tmp = $gMainProgressBar')
+
+    return _MAIN_PROGRESS_BAR
+
+
+def get_phase_records(message=None):
+    """ Get the records of the latest progress phases, see ProgressBarContextManager.
 
     Args:
-        warp (str): Maya warp node.
+        message (str | None): Only phases with this message, like "Adding Input Nodes.". All phases if not given.
 
     Returns:
-        Bool if active
+        list of dicts, oldest first.
     """
 
-    return maya.cmds.getAttr('{}.warpActive' .format(warp))
+    return [dict(record, commands=dict(record['commands'])) for record in _PHASE_RECORDS
+            if message is None or record['message'] == message]
 
 
-def set_warp_status(warp, status):
-    """ set warp status.
+def clear_phase_records():
+    """ Forget the recorded progress phases.
+
+    Returns:
+        None
+    """
+
+    _PHASE_RECORDS.clear()
+
+
+def write_phase_log(record, path):
+    """ Add a phase record to a JSON log, keeping only the latest PHASE_RECORD_LIMIT records.
 
     Args:
-        warp (str): Maya warp node.
-        status (bool): If warp should be active.
+        record (dict): Phase record.
+        path (str): Path of JSON log file.
 
     Returns:
         None
     """
 
-    maya.cmds.setAttr('{}.warpActive' .format(warp), status)
+    records = []
+    if os.path.isfile(path):
+        try:
+            with open(path) as file_instance:
+                records = json.load(file_instance)
+        except ValueError:
+            # A broken log is started again rather than failing the operation.
+            records = []
+
+    records.append(record)
+
+    with open(path, 'w') as file_instance:
+        json.dump(records[-PHASE_RECORD_LIMIT:], file_instance, indent=4)
+
+
+class UndoChunkContextManager:
+    """Context manager to group edits into one undo chunk, which is undone again if the operation is cancelled."""
+
+    def __enter__(self):
+        """ ContextManager Enter.
+
+        Returns:
+            self
+        """
+        cmds.undoInfo(openChunk=True, stateWithoutFlush=True)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """ On exit of contextManger.
+
+        Returns:
+            None
+        """
+        cmds.undoInfo(closeChunk=True, stateWithoutFlush=True)
+
+        # Cancelling is only checked after edits are committed, so the chunk always has something to undo.
+        if exc_type is not None and issubclass(exc_type, OperationCancelled):
+            cmds.undo()
 
 
 class ProgressBarContextManager:
-    """Context manager to make using the main progress bar easy."""
+    """Context manager to make using the main progress bar easy.
+
+    Each use is also recorded as a phase with its wall time, steps, and the commands and API calls core made through
+    cmds while it runs. The progress bar itself is driven through maya.cmds, so it isn't counted. Records can be
+    queried with get_phase_records, and are added to the JSON log at the path in the TIME_WARP_PHASE_LOG environment
+    variable if set.
+
+    The progress bar is edited and checked for Esc at most every PROGRESS_INTERVAL seconds, so stepping it for
+    every item stays cheap.
+    """
     def __init__(self, total_steps, title='Time Warp', message='Processing Time Warp...'):
         """ Create context manager
 
@@ -343,6 +2072,14 @@ class ProgressBarContextManager:
         self.total_steps = total_steps
         self.title = title
         self.message = message
+        self.progress_bar = None
+        self.steps = 0
+        self.shown_steps = 0
+        self.shown_time = 0.0
+        self.checked_time = 0.0
+        self.record = None
+        self.counts = None
+        self.start = None
 
     def __enter__(self):
         """ ContextManager Enter.
@@ -350,12 +2087,26 @@ class ProgressBarContextManager:
         Returns:
             self
         """
-        maya.cmds.progressBar(MAIN_PROGRESS_BAR,
-                              edit=True,
-                              beginProgress=True,
-                              isInterruptable=True,
-                              status='"Example Calculation ...',
-                              maxValue=self.total_steps)
+        self.steps = 0
+        self.shown_steps = 0
+        self.shown_time = 0.0
+        self.checked_time = 0.0
+        self.record = None
+        self.start = timer()
+
+        # Without a main progress bar, like in batch mode, progress isn't shown.
+        self.progress_bar = get_main_progress_bar()
+
+        if self.progress_bar is not None:
+            maya.cmds.progressBar(self.progress_bar,
+                                  edit=True,
+                                  beginProgress=True,
+                                  isInterruptable=True,
+                                  status='"Example Calculation ...',
+                                  maxValue=self.total_steps)
+
+        # Counting starts last, so nothing is left counting if the progress bar fails.
+        self.counts = cmds.begin_phase()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -364,12 +2115,72 @@ class ProgressBarContextManager:
         Returns:
             None
         """
-        maya.cmds.progressBar(MAIN_PROGRESS_BAR, edit=True, endProgress=True)
+        cmds.end_phase(self.counts)
+
+        if self.progress_bar is not None:
+            maya.cmds.progressBar(self.progress_bar, edit=True, endProgress=True)
+
+        self.record = {'title': self.title,
+                       'message': self.message,
+                       'time': time.time(),
+                       'duration_ms': (timer() - self.start) * 1000.0,
+                       'total_steps': self.total_steps,
+                       'steps': self.steps,
+                       'commands': dict(self.counts),
+                       'command_count': sum(self.counts.values()),
+                       'error': exc_type.__name__ if exc_type is not None else None}
+        _PHASE_RECORDS.append(self.record)
+
+        log_path = os.environ.get(PHASE_LOG_VARIABLE)
+        if log_path:
+            write_phase_log(self.record, log_path)
+
+    def update_progress(self, steps=1):
+        """ Update progress, the progress bar only shows it once PROGRESS_INTERVAL has passed since it last did.
+
+        Args:
+            steps (int | 1): Number of steps done.
+
+        Returns:
+            None
+        """
+        self.steps += steps
+
+        if self.progress_bar is None:
+            return
+
+        now = timer()
+        if now - self.shown_time < PROGRESS_INTERVAL:
+            return
+
+        maya.cmds.progressBar(self.progress_bar, edit=True, step=self.steps - self.shown_steps, status=self.message)
+        self.shown_steps = self.steps
+        self.shown_time = now
+
+    def is_cancelled(self):
+        """ Check if Esc was pressed, asking the progress bar at most once every PROGRESS_INTERVAL.
+
+        Returns:
+            Bool if cancelled.
+        """
+        if self.progress_bar is None:
+            return False
+
+        now = timer()
+        if now - self.checked_time < PROGRESS_INTERVAL:
+            return False
 
-    def update_progress(self):
-        """ Update progress by 1.
+        self.checked_time = now
+        return bool(maya.cmds.progressBar(self.progress_bar, query=True, isCancelled=True))
+
+    def check_cancelled(self):
+        """ Stop the operation if Esc was pressed.
 
         Returns:
             None
+
+        Raises:
+            OperationCancelled: If cancelled.
         """
-        maya.cmds.progressBar(MAIN_PROGRESS_BAR, edit=True, step=1, status=self.message)
+        if self.is_cancelled():
+            raise OperationCancelled(self.message)
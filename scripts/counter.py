@@ -0,0 +1,125 @@
+""" Time Warp Command Counter
+
+Counts the Maya commands and API calls core makes into every running progress phase, without touching maya.cmds for
+anyone else. Core calls commands through a CommandCounter wrapping maya.cmds, and wraps the API objects of its hot
+paths, like DG modifiers and curve function sets, with the same counter. Calls go straight through while no phase is
+running.
+"""
+
+# Python
+import collections
+
+
+class CommandCounter(object):
+    """ Stand in for maya.cmds that counts the commands called through it into every running phase."""
+
+    def __init__(self, module):
+        """ Wrap a commands module.
+
+        Args:
+            module (module): maya.cmds.
+        """
+        self.module = module
+        self.phases = []
+
+    def __getattr__(self, name):
+        """ Get a command, that counts its calls while a phase is running.
+
+        Args:
+            name (str): Name of command.
+
+        Returns:
+            Counting command, or the attribute if it isn't callable or no phase is running.
+        """
+        return self.counted(name, getattr(self.module, name))
+
+    def counted(self, name, function):
+        """ Get a function that counts its calls under a name while a phase is running.
+
+        Args:
+            name (str): Name to count calls under.
+            function: Attribute to count the calls of.
+
+        Returns:
+            Counting function, or the attribute if it isn't callable or no phase is running.
+        """
+        if not self.phases or not callable(function):
+            return function
+
+        def counted(*args, **kwargs):
+            self.count(name)
+            return function(*args, **kwargs)
+
+        return counted
+
+    def wrap(self, api_object):
+        """ Wrap an API object so calls of its methods are counted by class and method, like "MDGModifier.doIt".
+
+        Args:
+            api_object: API object to wrap, like an MDGModifier or MFnAnimCurve.
+
+        Returns:
+            CountedObject
+        """
+        return CountedObject(self, api_object)
+
+    def count(self, name, calls=1):
+        """ Count calls made by a running phase, nested phases count into their parents too.
+
+        Args:
+            name (str): Name of command or API method, like "MDGModifier.doIt".
+            calls (int | 1): Number of calls.
+
+        Returns:
+            None
+        """
+        for counts in self.phases:
+            counts[name] += calls
+
+    def begin_phase(self):
+        """ Start counting the calls of a phase.
+
+        Returns:
+            Counter of calls by name, filled until end_phase.
+        """
+        counts = collections.Counter()
+        self.phases.append(counts)
+        return counts
+
+    def end_phase(self, counts):
+        """ Stop counting the calls of a phase.
+
+        Args:
+            counts (Counter): Counter given by begin_phase.
+
+        Returns:
+            None
+        """
+        self.phases = [phase for phase in self.phases if phase is not counts]
+
+
+class CountedObject(object):
+    """ Stand in for an API object that counts calls of its methods with a CommandCounter. Only wrap objects that
+    are called, the API can't take them as arguments in place of the object they wrap."""
+
+    def __init__(self, counter, api_object):
+        """ Wrap an API object.
+
+        Args:
+            counter (CommandCounter): Counter to count calls with.
+            api_object: API object to wrap.
+        """
+        self.counter = counter
+        self.api_object = api_object
+        self.type_name = type(api_object).__name__
+
+    def __getattr__(self, name):
+        """ Get a method, that counts its calls while a phase is running.
+
+        Args:
+            name (str): Name of method.
+
+        Returns:
+            Counting method, or the attribute if it isn't callable or no phase is running.
+        """
+        return self.counter.counted('{}.{}'.format(self.type_name, name), getattr(self.api_object, name))
@@ -0,0 +1,691 @@
+""" Time Warp Curve Evaluation
+
+Standalone evaluation of Maya animation curves. Keys, tangents and infinity settings are held in compact NumPy
+arrays so the time mapping of a warp can be evaluated for a whole frame array in one call, without stepping Maya's
+time. Only reading a curve from a scene needs Maya.
+"""
+
+# Python
+import re
+
+import numpy
+
+# Maya's infinity types, matching the preInfinity and postInfinity enum on animCurves.
+CONSTANT = 0
+LINEAR = 1
+CYCLE = 3
+CYCLE_RELATIVE = 4
+OSCILLATE = 5
+
+# Tangent types that are resolved from neighbouring keys.
+SPLINE_TANGENTS = ('spline', 'auto')
+CLAMPED_TANGENTS = ('clamped', 'plateau')
+STEP_TANGENTS = ('step', 'stepnext')
+
+# Slopes below this are treated as flat, inverting them would give a vertical tangent.
+MIN_SLOPE = 1e-6
+
+# Named maya time units in frames per second.
+TIME_UNITS = {'game': 15.0, 'film': 24.0, 'pal': 25.0, 'ntsc': 30.0, 'show': 48.0, 'palf': 50.0, 'ntscf': 60.0}
+
+
+class WarpCurve(object):
+    """ Animation curve held as arrays for vectorized evaluation."""
+
+    def __init__(self, times, values, in_slopes=None, out_slopes=None, in_types=None, out_types=None,
+                 pre_infinity=CONSTANT, post_infinity=CONSTANT):
+        """ Create curve from keys.
+
+        Args:
+            times (list): Key times in frames, in ascending order.
+            values (list): Key values.
+            in_slopes (list | None): In tangent slopes in value per frame. Resolved from in_types if not given.
+            out_slopes (list | None): Out tangent slopes in value per frame. Resolved from out_types if not given.
+            in_types (list | None): In tangent type names, defaults to spline.
+            out_types (list | None): Out tangent type names, defaults to spline.
+            pre_infinity (int | CONSTANT): Maya infinity type before the first key.
+            post_infinity (int | CONSTANT): Maya infinity type after the last key.
+        """
+        self.times = numpy.asarray(times, dtype=numpy.float64)
+        self.values = numpy.asarray(values, dtype=numpy.float64)
+
+        if not len(self.times):
+            raise ValueError('WarpCurve needs at least one key.')
+        if len(self.times) != len(self.values):
+            raise ValueError('WarpCurve needs the same number of times and values.')
+
+        key_count = len(self.times)
+        self.in_types = list(in_types or ['spline'] * key_count)
+        self.out_types = list(out_types or ['spline'] * key_count)
+
+        resolved_in, resolved_out = resolve_tangents(self.times, self.values, self.in_types, self.out_types)
+
+        self.in_slopes = resolved_in if in_slopes is None else numpy.asarray(in_slopes, dtype=numpy.float64)
+        self.out_slopes = resolved_out if out_slopes is None else numpy.asarray(out_slopes, dtype=numpy.float64)
+
+        # Steps are stored as flags so segments can be masked without string compares.
+        self.steps = numpy.array([tangent in STEP_TANGENTS for tangent in self.out_types], dtype=bool)
+        self.step_next = numpy.array([tangent == 'stepnext' for tangent in self.out_types], dtype=bool)
+
+        self.pre_infinity = pre_infinity
+        self.post_infinity = post_infinity
+
+    def __len__(self):
+        """ Number of keys on the curve.
+
+        Returns:
+            int of key count.
+        """
+        return len(self.times)
+
+    @property
+    def start(self):
+        """ Time of first key.
+
+        Returns:
+            float of time.
+        """
+        return float(self.times[0])
+
+    @property
+    def end(self):
+        """ Time of last key.
+
+        Returns:
+            float of time.
+        """
+        return float(self.times[-1])
+
+    @classmethod
+    def from_maya(cls, curve):
+        """ Read an animCurve from the current Maya scene.
+
+        Tangent angles are converted to slopes in value per frame, using Maya's convention of measuring tangents
+        against time in seconds. Tangent weights aren't read, so curves with weighted tangents are evaluated as if
+        they were unweighted, see core.get_weighted_curves.
+
+        Args:
+            curve (str): Maya animCurve node.
+
+        Returns:
+            WarpCurve of the maya curve.
+        """
+        import maya.cmds
+
+        times = maya.cmds.keyframe(curve, query=True, timeChange=True) or []
+        values = maya.cmds.keyframe(curve, query=True, valueChange=True) or []
+        in_angles = maya.cmds.keyTangent(curve, query=True, inAngle=True) or []
+        out_angles = maya.cmds.keyTangent(curve, query=True, outAngle=True) or []
+        in_types = maya.cmds.keyTangent(curve, query=True, inTangentType=True) or []
+        out_types = maya.cmds.keyTangent(curve, query=True, outTangentType=True) or []
+
+        # Time to time curves are measured in seconds on both axes so the frame rate cancels out.
+        scale = 1.0
+        if maya.cmds.nodeType(curve) != 'animCurveTT':
+            scale = 1.0 / frames_per_second()
+
+        return cls(times, values,
+                   in_slopes=numpy.tan(numpy.radians(in_angles)) * scale,
+                   out_slopes=numpy.tan(numpy.radians(out_angles)) * scale,
+                   in_types=in_types,
+                   out_types=out_types,
+                   pre_infinity=maya.cmds.getAttr('{}.preInfinity'.format(curve)),
+                   post_infinity=maya.cmds.getAttr('{}.postInfinity'.format(curve)))
+
+    def evaluate(self, frames):
+        """ Evaluate the curve at the given frames.
+
+        Args:
+            frames (float | list | numpy.ndarray): Frames to evaluate.
+
+        Returns:
+            numpy.ndarray of values, or float if a single frame was given.
+        """
+        frames, scalar = _as_array(frames)
+        values = self._evaluate(frames, derivative=False)
+
+        return float(values[0]) if scalar else values
+
+    def derivative(self, frames):
+        """ Evaluate the slope of the curve at the given frames. For a warp curve this is the warp speed.
+
+        Args:
+            frames (float | list | numpy.ndarray): Frames to evaluate.
+
+        Returns:
+            numpy.ndarray of slopes, or float if a single frame was given.
+        """
+        frames, scalar = _as_array(frames)
+        slopes = self._evaluate(frames, derivative=True)
+
+        return float(slopes[0]) if scalar else slopes
+
+    def is_monotonic(self, samples_per_segment=16, min_slope=MIN_SLOPE):
+        """ Check the curve always moves forward in time, which is needed for it to have an inverse.
+
+        Both tangents of every key are checked, a flat tangent stops time at its key even when the segments either
+        side move forward.
+
+        Args:
+            samples_per_segment (int | 16): Number of slope samples taken across each segment.
+            min_slope (float | MIN_SLOPE): Smallest slope counted as moving forward.
+
+        Returns:
+            Bool if the curve is strictly increasing.
+        """
+        if len(self.times) < 2:
+            return False
+
+        if numpy.any(numpy.diff(self.values) <= 0.0) or self.steps[:-1].any():
+            return False
+
+        if numpy.any(self.in_slopes < min_slope) or numpy.any(self.out_slopes < min_slope):
+            return False
+
+        frames = numpy.linspace(self.start, self.end, (len(self.times) - 1) * samples_per_segment + 1)
+
+        return bool(numpy.all(self.derivative(frames) > 0.0))
+
+    def invert(self, values, iterations=50):
+        """ Find the frames the curve maps onto the given values, the inverse time mapping of a warp.
+
+        Each value is located on its Hermite segment and solved by bisection, which is safe because the segment is
+        monotonic.
+
+        Args:
+            values (float | list | numpy.ndarray): Values to invert.
+            iterations (int | 50): Number of bisection steps, 50 reaches double precision.
+
+        Returns:
+            numpy.ndarray of frames, or float if a single value was given.
+        """
+        values, scalar = _as_array(values)
+        frames = numpy.empty_like(values)
+
+        before = values < self.values[0]
+        after = values > self.values[-1]
+        inside = ~(before | after)
+
+        if inside.any():
+            frames[inside] = self._invert_segments(values[inside], iterations)
+        if before.any():
+            frames[before] = self._invert_infinity(values[before], self.pre_infinity, True, iterations)
+        if after.any():
+            frames[after] = self._invert_infinity(values[after], self.post_infinity, False, iterations)
+
+        return float(frames[0]) if scalar else frames
+
+    def inverse(self, tolerance=0.001, samples_per_segment=8, max_keys=10000):
+        """ Build the inverse curve with as few keys as possible.
+
+        The inverse starts with a key for every key on this curve, with the time and value swapped and the slopes
+        inverted. Segments that stray further than the tolerance from the exact inverse are split until they fit.
+
+        Args:
+            tolerance (float | 0.001): Largest allowed error in frames.
+            samples_per_segment (int | 8): Number of points checked on each segment.
+            max_keys (int | 10000): Stop splitting segments once the inverse has this many keys.
+
+        Returns:
+            WarpCurve of the inverse mapping.
+        """
+        flat = numpy.flatnonzero((self.in_slopes < MIN_SLOPE) | (self.out_slopes < MIN_SLOPE))
+        if len(flat):
+            raise ValueError('Only curves that always move forward in time can be inverted, the key at frame {} has '
+                             'a flat or backward tangent.'.format(self.times[flat[0]]))
+
+        if not self.is_monotonic():
+            raise ValueError('Only curves that always move forward in time can be inverted.')
+
+        times = self.values.copy()
+        values = self.times.copy()
+        in_slopes = 1.0 / self.in_slopes
+        out_slopes = 1.0 / self.out_slopes
+
+        while len(times) < max_keys:
+            candidate = WarpCurve(times, values, in_slopes=in_slopes, out_slopes=out_slopes)
+
+            # Check each segment at interior points against the exact inverse.
+            offsets = numpy.arange(1, samples_per_segment + 1) / (samples_per_segment + 1.0)
+            samples = (times[:-1, None] + numpy.diff(times)[:, None] * offsets[None, :]).ravel()
+            errors = numpy.abs(candidate.evaluate(samples) - self.invert(samples))
+            failed = errors.reshape(-1, samples_per_segment).max(axis=1) > tolerance
+
+            if not failed.any():
+                break
+
+            # Split failing segments at their midpoint on the exact inverse.
+            split_times = (times[:-1][failed] + times[1:][failed]) * 0.5
+            split_values = self.invert(split_times)
+            split_slopes = 1.0 / self.derivative(split_values)
+
+            order = numpy.argsort(numpy.concatenate((times, split_times)), kind='stable')
+            times = numpy.concatenate((times, split_times))[order]
+            values = numpy.concatenate((values, split_values))[order]
+            in_slopes = numpy.concatenate((in_slopes, split_slopes))[order]
+            out_slopes = numpy.concatenate((out_slopes, split_slopes))[order]
+
+        return WarpCurve(times, values, in_slopes=in_slopes, out_slopes=out_slopes,
+                         in_types=['fixed'] * len(times), out_types=['fixed'] * len(times),
+                         pre_infinity=self._inverse_infinity(self.pre_infinity),
+                         post_infinity=self._inverse_infinity(self.post_infinity))
+
+    def retimed(self, offset=0.0, scale=1.0):
+        """ Build the curve a warp member plays, this curve's values scaled then offset.
+
+        Args:
+            offset (float | 0.0): Frames added to every value.
+            scale (float | 1.0): Multiplier for every value.
+
+        Returns:
+            WarpCurve of the member's mapping.
+        """
+        return WarpCurve(self.times, self.values * scale + offset,
+                         in_slopes=self.in_slopes * scale, out_slopes=self.out_slopes * scale,
+                         in_types=self.in_types, out_types=self.out_types,
+                         pre_infinity=self.pre_infinity, post_infinity=self.post_infinity)
+
+    def _evaluate(self, frames, derivative=False):
+        """ Evaluate values or slopes including infinity.
+
+        Args:
+            frames (numpy.ndarray): Frames to evaluate.
+            derivative (bool | False): If slopes should be returned instead of values.
+
+        Returns:
+            numpy.ndarray of results.
+        """
+        result = numpy.empty_like(frames)
+
+        before = frames < self.times[0]
+        after = frames > self.times[-1]
+        inside = ~(before | after)
+
+        result[inside] = self._segments(frames[inside], derivative)
+
+        if before.any():
+            result[before] = self._infinity(frames[before], self.pre_infinity, before=True, derivative=derivative)
+        if after.any():
+            result[after] = self._infinity(frames[after], self.post_infinity, before=False, derivative=derivative)
+
+        return result
+
+    def _segments(self, frames, derivative=False):
+        """ Evaluate frames that sit within the keyed range.
+
+        Args:
+            frames (numpy.ndarray): Frames between first and last key.
+            derivative (bool | False): If slopes should be returned instead of values.
+
+        Returns:
+            numpy.ndarray of results.
+        """
+        if len(self.times) == 1:
+            return numpy.zeros_like(frames) if derivative else numpy.full_like(frames, self.values[0])
+
+        index = numpy.clip(numpy.searchsorted(self.times, frames, side='right') - 1, 0, len(self.times) - 2)
+
+        start_time = self.times[index]
+        span = self.times[index + 1] - start_time
+        start_value = self.values[index]
+        end_value = self.values[index + 1]
+        start_slope = self.out_slopes[index] * span
+        end_slope = self.in_slopes[index + 1] * span
+
+        s = (frames - start_time) / span
+        s2 = s * s
+        s3 = s2 * s
+
+        if derivative:
+            result = ((6.0 * s2 - 6.0 * s) * (start_value - end_value)
+                      + (3.0 * s2 - 4.0 * s + 1.0) * start_slope
+                      + (3.0 * s2 - 2.0 * s) * end_slope) / span
+        else:
+            result = ((2.0 * s3 - 3.0 * s2 + 1.0) * start_value
+                      + (s3 - 2.0 * s2 + s) * start_slope
+                      + (-2.0 * s3 + 3.0 * s2) * end_value
+                      + (s3 - s2) * end_slope)
+
+        # Stepped segments hold their key until the next key is reached.
+        stepped = self.steps[index] & (frames < self.times[index + 1])
+        if stepped.any():
+            if derivative:
+                result[stepped] = 0.0
+            else:
+                held = numpy.where(self.step_next[index], end_value, start_value)
+                result[stepped] = held[stepped]
+
+        return result
+
+    def _invert_segments(self, values, iterations):
+        """ Invert values that sit within the keyed range by bisecting their segment.
+
+        Args:
+            values (numpy.ndarray): Values between first and last key value.
+            iterations (int): Number of bisection steps.
+
+        Returns:
+            numpy.ndarray of frames.
+        """
+        if len(self.times) == 1:
+            return numpy.full_like(values, self.times[0])
+
+        index = numpy.clip(numpy.searchsorted(self.values, values, side='right') - 1, 0, len(self.times) - 2)
+
+        low = self.times[index].copy()
+        high = self.times[index + 1].copy()
+
+        for _ in range(iterations):
+            middle = (low + high) * 0.5
+            below = self._segments(middle) < values
+            low = numpy.where(below, middle, low)
+            high = numpy.where(below, high, middle)
+
+        return (low + high) * 0.5
+
+    def _invert_infinity(self, values, infinity, before, iterations):
+        """ Invert values outside of the keyed range.
+
+        Constant and cycling infinity can't be inverted past the range so they clamp to the end keys.
+
+        Args:
+            values (numpy.ndarray): Values outside of the keyed range.
+            infinity (int): Maya infinity type.
+            before (bool): If values are before the first key value.
+            iterations (int): Number of bisection steps.
+
+        Returns:
+            numpy.ndarray of frames.
+        """
+        if infinity == LINEAR:
+            if before:
+                return self.times[0] + (values - self.values[0]) / self.in_slopes[0]
+            return self.times[-1] + (values - self.values[-1]) / self.out_slopes[-1]
+
+        value_span = self.values[-1] - self.values[0]
+        if infinity == CYCLE_RELATIVE and value_span > 0.0:
+            cycles = numpy.floor((values - self.values[0]) / value_span)
+            local = self._invert_segments(values - cycles * value_span, iterations)
+            return local + cycles * (self.times[-1] - self.times[0])
+
+        return numpy.full_like(values, self.times[0] if before else self.times[-1])
+
+    @staticmethod
+    def _inverse_infinity(infinity):
+        """ Infinity type that matches an infinity type on the inverse curve.
+
+        Args:
+            infinity (int): Maya infinity type.
+
+        Returns:
+            int of Maya infinity type.
+        """
+        if infinity in (LINEAR, CYCLE_RELATIVE):
+            return infinity
+        return CONSTANT
+
+    def _infinity(self, frames, infinity, before, derivative=False):
+        """ Evaluate frames outside of the keyed range.
+
+        Args:
+            frames (numpy.ndarray): Frames outside of the keyed range.
+            infinity (int): Maya infinity type.
+            before (bool): If frames are before the first key.
+            derivative (bool | False): If slopes should be returned instead of values.
+
+        Returns:
+            numpy.ndarray of results.
+        """
+        start = self.times[0]
+        span = self.times[-1] - start
+
+        if infinity in (CYCLE, CYCLE_RELATIVE, OSCILLATE) and span > 0.0:
+            cycles = numpy.floor((frames - start) / span)
+            local = frames - cycles * span
+
+            if infinity == OSCILLATE:
+                mirrored = numpy.mod(cycles, 2.0) != 0.0
+                local = numpy.where(mirrored, 2.0 * start + span - local, local)
+                result = self._segments(local, derivative)
+                if derivative:
+                    result = numpy.where(mirrored, -result, result)
+                return result
+
+            result = self._segments(local, derivative)
+            if infinity == CYCLE_RELATIVE and not derivative:
+                result = result + cycles * (self.values[-1] - self.values[0])
+            return result
+
+        if infinity == LINEAR:
+            slope = self.in_slopes[0] if before else self.out_slopes[-1]
+            if derivative:
+                return numpy.full_like(frames, slope)
+            if before:
+                return self.values[0] + (frames - self.times[0]) * slope
+            return self.values[-1] + (frames - self.times[-1]) * slope
+
+        if derivative:
+            return numpy.zeros_like(frames)
+        return numpy.full_like(frames, self.values[0] if before else self.values[-1])
+
+
+def bake(source, warp, start, end, tolerance=0.01, min_step=1.0 / 64.0, max_keys=100000):
+    """ Bake a curve played through a warp into a new curve with as few keys as the tolerance allows.
+
+    The warped curve is sampled densely only where it bends, which is where the warp speed or the source curve
+    changes, then keys are fitted to the samples.
+
+    Args:
+        source (WarpCurve): Curve driven by the warp.
+        warp (WarpCurve): Curve of the warp.
+        start (float): First frame to bake.
+        end (float): Last frame to bake.
+        tolerance (float | 0.01): Largest allowed value error.
+        min_step (float | 1/64): Smallest gap in frames between samples.
+        max_keys (int | 100000): Stop adding keys once the baked curve has this many.
+
+    Returns:
+        WarpCurve of the baked curve.
+    """
+    # Seed with whole frames plus the warp's keys and the source keys seen through the warp, so no key is missed.
+    seeds = [numpy.arange(numpy.floor(start), numpy.ceil(end) + 1.0), warp.times]
+    if warp.is_monotonic():
+        seeds.append(warp.invert(source.times))
+    frames = numpy.unique(numpy.clip(numpy.concatenate(seeds), start, end))
+
+    def warped(samples):
+        return source.evaluate(warp.evaluate(samples))
+
+    frames = refine_samples(warped, frames, tolerance * 0.25, min_step)
+    warped_times = warp.evaluate(frames)
+
+    return fit_keys(frames, source.evaluate(warped_times),
+                    source.derivative(warped_times) * warp.derivative(frames),
+                    tolerance, max_keys=max_keys)
+
+
+def remap(source, warp, start, end):
+    """ Move a curve's keys through the inverse of a warp, the way a key remapping bake does, and measure how far
+    the result strays from the curve played through the warp.
+
+    Each key moves to the frame where the warp reaches its time and its slopes are scaled by the warp speed there,
+    which is exact at the keys. In between, the remapped segments are still cubic in scene frames while the warped
+    curve is not, so the error is measured on every frame and halfway between keys.
+
+    Args:
+        source (WarpCurve): Curve driven by the warp.
+        warp (WarpCurve): Curve of the warp, it has to be monotonic.
+        start (float): First frame to measure.
+        end (float): Last frame to measure.
+
+    Returns:
+        tuple of WarpCurve of the remapped keys and float of the largest value error.
+    """
+    times = warp.invert(source.times)
+    speeds = warp.derivative(times)
+
+    remapped = WarpCurve(times, source.values, in_slopes=source.in_slopes * speeds,
+                         out_slopes=source.out_slopes * speeds, in_types=source.in_types,
+                         out_types=source.out_types, pre_infinity=source.pre_infinity,
+                         post_infinity=source.post_infinity)
+
+    start = min(start, remapped.start)
+    end = max(end, remapped.end)
+    frames = numpy.concatenate((numpy.arange(numpy.floor(start), numpy.ceil(end) + 1.0),
+                                (times[:-1] + times[1:]) * 0.5))
+
+    errors = numpy.abs(remapped.evaluate(frames) - source.evaluate(warp.evaluate(frames)))
+
+    return remapped, float(errors.max())
+
+
+def refine_samples(function, frames, tolerance, min_step):
+    """ Add samples between frames wherever the function strays from a straight line.
+
+    Args:
+        function (callable): Vectorized function of frames.
+        frames (numpy.ndarray): Sorted starting frames.
+        tolerance (float): Largest allowed distance from a straight line at an interval's midpoint.
+        min_step (float): Intervals shorter than this are not split.
+
+    Returns:
+        numpy.ndarray of sorted frames.
+    """
+    values = function(frames)
+
+    while True:
+        spans = numpy.diff(frames)
+        middles = frames[:-1] + spans * 0.5
+        middle_values = function(middles)
+
+        bent = (numpy.abs(middle_values - (values[:-1] + values[1:]) * 0.5) > tolerance) & (spans > min_step * 2.0)
+
+        if not bent.any():
+            return frames
+
+        order = numpy.argsort(numpy.concatenate((frames, middles[bent])), kind='stable')
+        frames = numpy.concatenate((frames, middles[bent]))[order]
+        values = numpy.concatenate((values, middle_values[bent]))[order]
+
+
+def fit_keys(frames, values, slopes, tolerance, max_keys=100000):
+    """ Pick the fewest samples that rebuild all samples within a tolerance when keyed with their slopes.
+
+    Starts from the end samples and keeps adding the worst fitting sample of every segment that is out of tolerance.
+
+    Args:
+        frames (numpy.ndarray): Sorted sample frames.
+        values (numpy.ndarray): Sample values.
+        slopes (numpy.ndarray): Sample slopes in value per frame.
+        tolerance (float): Largest allowed value error.
+        max_keys (int | 100000): Stop adding keys once the curve has this many.
+
+    Returns:
+        WarpCurve with fixed tangents.
+    """
+    keys = numpy.array(sorted({0, len(frames) - 1}))
+
+    while True:
+        fitted = WarpCurve(frames[keys], values[keys], in_slopes=slopes[keys], out_slopes=slopes[keys])
+        errors = numpy.abs(fitted.evaluate(frames) - values)
+
+        if len(keys) >= max_keys or errors.max() <= tolerance:
+            break
+
+        # Worst sample of each failing segment becomes a key.
+        failing = numpy.flatnonzero(errors > tolerance)
+        segments = numpy.searchsorted(keys, failing, side='right') - 1
+        failing = failing[numpy.lexsort((-errors[failing], segments))]
+        worst = numpy.unique(numpy.sort(segments), return_index=True)[1]
+
+        keys = numpy.union1d(keys, failing[worst])
+
+    key_count = len(keys)
+
+    return WarpCurve(frames[keys], values[keys], in_slopes=slopes[keys], out_slopes=slopes[keys],
+                     in_types=['fixed'] * key_count, out_types=['fixed'] * key_count)
+
+
+def resolve_tangents(times, values, in_types, out_types):
+    """ Compute tangent slopes from Maya tangent types.
+
+    Fixed tangents and unknown types fall back to spline, so pass explicit slopes for them.
+
+    Args:
+        times (numpy.ndarray): Key times.
+        values (numpy.ndarray): Key values.
+        in_types (list): In tangent type names.
+        out_types (list): Out tangent type names.
+
+    Returns:
+        tuple of in and out slope numpy.ndarrays.
+    """
+    key_count = len(times)
+
+    if key_count < 2:
+        return numpy.zeros(key_count), numpy.zeros(key_count)
+
+    segment_slopes = numpy.diff(values) / numpy.diff(times)
+
+    # Linear slopes use the segment either side, the end keys reuse their only segment.
+    linear_in = numpy.concatenate((segment_slopes[:1], segment_slopes))
+    linear_out = numpy.concatenate((segment_slopes, segment_slopes[-1:]))
+
+    # Spline slopes come from the neighbouring keys.
+    spline = numpy.empty(key_count)
+    spline[0] = segment_slopes[0]
+    spline[-1] = segment_slopes[-1]
+    spline[1:-1] = (values[2:] - values[:-2]) / (times[2:] - times[:-2])
+
+    # Clamped keys are flattened when a neighbour has the same value, stopping overshoot.
+    clamped = spline.copy()
+    flat_neighbour = numpy.zeros(key_count, dtype=bool)
+    flat_neighbour[1:] |= numpy.isclose(values[1:], values[:-1])
+    flat_neighbour[:-1] |= numpy.isclose(values[:-1], values[1:])
+    clamped[flat_neighbour] = 0.0
+
+    def pick(types, linear):
+        slopes = spline.copy()
+        for index, tangent in enumerate(types):
+            if tangent == 'linear':
+                slopes[index] = linear[index]
+            elif tangent in ('flat',) + STEP_TANGENTS:
+                slopes[index] = 0.0
+            elif tangent in CLAMPED_TANGENTS:
+                slopes[index] = clamped[index]
+        return slopes
+
+    return pick(in_types, linear_in), pick(out_types, linear_out)
+
+
+def frames_per_second():
+    """ Get the scene frame rate from Maya's current time unit.
+
+    Returns:
+        float of frames per second.
+    """
+    import maya.cmds
+
+    unit = maya.cmds.currentUnit(query=True, time=True)
+
+    if unit in TIME_UNITS:
+        return TIME_UNITS[unit]
+
+    match = re.match(r'([\d.]+)fps', unit)
+    if match:
+        return float(match.group(1))
+
+    return TIME_UNITS['film']
+
+
+def _as_array(frames):
+    """ Convert frames to a float array.
+
+    Args:
+        frames (float | list | numpy.ndarray): Frames to convert.
+
+    Returns:
+        tuple of numpy.ndarray and bool if a single frame was given.
+    """
+    scalar = numpy.ndim(frames) == 0
+    return numpy.atleast_1d(numpy.asarray(frames, dtype=numpy.float64)), scalar
@@ -0,0 +1,448 @@
+""" Time Warp Dialog, the Qt side of the widget. Imported by widget.launch so Qt only loads when the UI opens."""
+
+# Python
+import os
+
+# Qt
+from PySide2 import QtCore, QtWidgets, QtGui
+
+from timeWarp._versions import __version__, __doc__, __author__, __email__, __copyright__
+from timeWarp.scripts import core
+from timeWarp.scripts import tasks
+ICON_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../', 'icons')
+
+
+class TimeWarp(QtWidgets.QDialog):
+    """ Time Warp Widget"""
+
+    def __init__(self):
+        super(TimeWarp, self).__init__()
+
+        # Build UI
+        self.setWindowTitle('Time Warp')
+        self.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
+        self.setWindowIcon(QtGui.QIcon(os.path.join(ICON_PATH, 'WarpStatus.png')))
+
+        self.setGeometry(300, 300, 300, 350)
+        self.setMinimumSize(400, 450)
+        self.setMaximumHeight(510)
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.setAlignment(QtCore.Qt.AlignTop)
+        self.setLayout(main_layout)
+
+        # Menu Bar.
+        self.menu_bar = QtWidgets.QMenuBar()
+        self.help_menu = self.menu_bar.addMenu("Help")
+        main_layout.setMenuBar(self.menu_bar)
+
+        help_action = QtWidgets.QAction("Docs", self)
+        help_action.triggered.connect(lambda: QtGui.QDesktopServices.openUrl(
+            QtCore.QUrl(__doc__)))
+        self.help_menu.addAction(help_action)
+
+        version = QtWidgets.QAction("Version: {}" .format(__version__), self)
+        version.setEnabled(False)
+        self.help_menu.addAction(version)
+
+        author = QtWidgets.QAction("Author: {}".format(__author__), self)
+        author.setEnabled(False)
+        self.help_menu.addAction(author)
+
+        # Button Layout.
+        select_layout = QtWidgets.QHBoxLayout()
+        main_layout.addLayout(select_layout)
+
+        self.create_warp_btn = QtWidgets.QPushButton("Create")
+        self.create_warp_btn.setFixedWidth(70)
+        self.create_warp_btn.setFixedHeight(30)
+        self.create_warp_btn.setStyleSheet("background-color : #16A085")
+        self.create_warp_btn.clicked.connect(self.create_warp)
+        select_layout.addWidget(self.create_warp_btn)
+
+        self.warp_select = QtWidgets.QComboBox()
+        self.warp_select.setSizePolicy(QtWidgets.QSizePolicy.MinimumExpanding, QtWidgets.QSizePolicy.MinimumExpanding)
+        self.warp_select.setFixedHeight(30)
+        self.warp_select.setMinimumWidth(170)
+        self.warp_select.currentTextChanged.connect(self.on_select_change)
+        select_layout.addWidget(self.warp_select)
+
+        self.active = QtWidgets.QCheckBox("Warp Active")
+        self.active.setEnabled(False)
+        self.active.toggled.connect(self.set_active_status)
+        select_layout.addWidget(self.active)
+
+        self.select_warp_btn = QtWidgets.QPushButton("Select Warp")
+        self.select_warp_btn.setEnabled(False)
+        self.select_warp_btn.setFixedHeight(45)
+        self.select_warp_btn.clicked.connect(lambda: core.select_warp_curve(self.warp_select.currentText()))
+        main_layout.addWidget(self.select_warp_btn)
+
+        self.select_warped_btn = QtWidgets.QPushButton("Select Warped")
+        self.select_warped_btn.setEnabled(False)
+        self.select_warped_btn.setFixedHeight(45)
+        self.select_warped_btn.clicked.connect(lambda: core.select_warped_nodes(self.warp_select.currentText()))
+        main_layout.addWidget(self.select_warped_btn)
+
+        self.add_btn = QtWidgets.QPushButton("Add To Warp")
+        self.add_btn.setEnabled(False)
+        self.add_btn.setFixedHeight(45)
+        self.add_btn.clicked.connect(self.on_add)
+        main_layout.addWidget(self.add_btn)
+
+        self.remove_btn = QtWidgets.QPushButton("Remove From Warp")
+        self.remove_btn.setEnabled(False)
+        self.remove_btn.setFixedHeight(45)
+        self.remove_btn.clicked.connect(self.on_remove)
+        main_layout.addWidget(self.remove_btn)
+
+        self.bake_btn = QtWidgets.QPushButton("Bake Out Warp")
+        self.bake_btn.setEnabled(False)
+        self.bake_btn.setFixedHeight(45)
+        self.bake_btn.clicked.connect(self.on_bake)
+        main_layout.addWidget(self.bake_btn)
+
+        self.bake_all_btn = QtWidgets.QPushButton("Bake All Warps")
+        self.bake_all_btn.setEnabled(False)
+        self.bake_all_btn.setFixedHeight(45)
+        self.bake_all_btn.clicked.connect(self.on_bake_all)
+        main_layout.addWidget(self.bake_all_btn)
+
+        self.delete_btn = QtWidgets.QPushButton("Delete Warp")
+        self.delete_btn.setEnabled(False)
+        self.delete_btn.setStyleSheet("""
+        QPushButton {background-color : #E74C3C } 
+        QPushButton:disabled { background-color: #B0574D; }
+        """)
+
+        self.delete_btn.clicked.connect(self.on_delete)
+        main_layout.addWidget(self.delete_btn)
+
+        # Progress of the running operation, the rest of Maya stays usable while it works.
+        progress_layout = QtWidgets.QHBoxLayout()
+        main_layout.addLayout(progress_layout)
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setVisible(False)
+        progress_layout.addWidget(self.progress_bar)
+
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self.on_cancel)
+        progress_layout.addWidget(self.cancel_btn)
+
+        self.task = None
+        self.enabled_states = {}
+
+        # add scene data to widgets.
+        self.add_scene_data()
+
+    def toggle_buttons(self):
+        """ Toggle enable of buttons.
+
+        Returns:
+            None
+        """
+        self.active.setEnabled(not self.active.isEnabled())
+        self.select_warp_btn.setEnabled(not self.select_warp_btn.isEnabled())
+        self.select_warped_btn.setEnabled(not self.select_warped_btn.isEnabled())
+        self.add_btn.setEnabled(not self.add_btn.isEnabled())
+        self.remove_btn.setEnabled(not self.remove_btn.isEnabled())
+        self.bake_btn.setEnabled(not self.bake_btn.isEnabled())
+        self.bake_all_btn.setEnabled(not self.bake_all_btn.isEnabled())
+        self.delete_btn.setEnabled(not self.delete_btn.isEnabled())
+
+    def start_task(self, task, on_result, nodes=None):
+        """ Run a core task on Maya's idle queue, showing its progress until it finishes.
+
+        Args:
+            task (generator): Task yielding TaskProgress, like core.apply_warp_task.
+            on_result (callable): Called with the task's result if it finishes.
+            nodes (list | None): Maya nodes the task works on, it's aborted if any of them is deleted.
+
+        Returns:
+            None
+        """
+
+        # Only one operation runs at a time, the buttons are restored as they were once it's done.
+        widgets = [self.create_warp_btn, self.warp_select, self.active, self.add_btn, self.remove_btn, self.bake_btn,
+                   self.bake_all_btn, self.delete_btn]
+        self.enabled_states = dict((widget, widget.isEnabled()) for widget in widgets)
+        for widget in widgets:
+            widget.setEnabled(False)
+
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+
+        self.task = tasks.Task(task, on_progress=self.on_task_progress,
+                               on_finish=lambda finished: self.on_task_finish(finished, on_result), nodes=nodes)
+        self.task.start()
+
+    def on_task_progress(self, progress):
+        """ Show progress of the running task.
+
+        Args:
+            progress (TaskProgress): Latest progress of the task.
+
+        Returns:
+            None
+        """
+
+        self.progress_bar.setMaximum(max(progress.total, 1))
+        self.progress_bar.setValue(progress.done)
+        self.progress_bar.setFormat("{} %p%".format(progress.message))
+
+    def on_task_finish(self, task, on_result):
+        """ Restore the widget once the running task is done.
+
+        Args:
+            task (Task): Task that finished.
+            on_result (callable): Called with the task's result if it wasn't cancelled and didn't fail.
+
+        Returns:
+            None
+        """
+
+        self.task = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+
+        for widget, enabled in self.enabled_states.items():
+            widget.setEnabled(enabled)
+        self.enabled_states = {}
+
+        if not task.cancelled and task.error is None:
+            on_result(task.result)
+
+    def on_cancel(self):
+        """ Cancel the running task, what it has done so far is undone.
+
+        Returns:
+            None
+        """
+
+        if self.task is not None:
+            self.task.cancel()
+
+    def closeEvent(self, event):
+        """ Abort the running task as the widget closes, so it doesn't call back into a deleted widget.
+
+        Args:
+            event (QCloseEvent): Close event.
+
+        Returns:
+            None
+        """
+
+        if self.task is not None:
+            task, self.task = self.task, None
+            task.on_progress = None
+            task.on_finish = None
+            task.abort()
+
+        super(TimeWarp, self).closeEvent(event)
+
+    def add_scene_data(self):
+        """ Run this after building of GUI to set the widget based on scene.
+
+        Returns:
+            None
+        """
+
+        self.warp_select.blockSignals(True)
+        self.active.blockSignals(True)
+
+        # Add Scene warps to widget.
+        self.warp_select.addItems(core.get_warp_nodes())
+
+        # set warp status of current warp.
+        current_warp = self.warp_select.currentText()
+
+        if current_warp:
+            status = core.is_warp_active(current_warp)
+            self.active.setChecked(status)
+            self.toggle_buttons()
+
+        self.warp_select.blockSignals(False)
+        self.active.blockSignals(False)
+
+    def create_warp(self):
+        """ Create warp and add to select.
+
+        Returns:
+            None
+        """
+
+        warp_name, create = QtWidgets.QInputDialog.getText(self, "Time Warp", "Warp Name:",
+                                                           QtWidgets.QLineEdit.Normal, "atk")
+
+        if warp_name and create:
+            name = core.create_warp(warp_name=warp_name)
+
+            # Check current count of items and toggle.
+            if self.warp_select.count() == 0:
+                self.toggle_buttons()
+
+            self.warp_select.addItem(name)
+            self.warp_select.setCurrentText(name)
+
+    def set_active_status(self, status):
+        """ Change active status of warp.
+
+        Args:
+            status (bool): Current state of checkbox.
+
+        Returns:
+            None
+        """
+
+        current_warp = self.warp_select.currentText()
+        core.set_warp_status(current_warp, status)
+
+    def on_select_change(self, current_warp):
+        """ On change of warp select.
+
+        Args:
+            current_warp (str): Name of Current warp.
+
+        Returns:
+            None
+        """
+
+        if current_warp:
+            status = core.is_warp_active(current_warp)
+            self.active.setChecked(status)
+
+        if self.warp_select.count() == 0:
+            self.toggle_buttons()
+
+    def on_add(self):
+        """ On adding objects to warp check for selection.
+
+        Returns:
+            None
+        """
+
+        current_warp = self.warp_select.currentText()
+        self.start_task(core.apply_warp_task(current_warp), self.on_add_finish, nodes=[current_warp])
+
+    def on_add_finish(self, status):
+        """ Once added to warp check anything was found to add.
+
+        Args:
+            status (WarpChange | bool): Result of apply_warp_task.
+
+        Returns:
+            None
+        """
+
+        if not status:
+            QtWidgets.QMessageBox.warning(self, 'Time Warp',
+                                          'No objects selected to apply to warp or selected nodes'
+                                          ' do not have any keyframes to warp.')
+
+    def on_remove(self):
+        """ On remove from warp check for selection.
+
+        Returns:
+            None
+        """
+
+        current_warp = self.warp_select.currentText()
+        self.start_task(core.remove_warp_task(current_warp), self.on_remove_finish, nodes=[current_warp])
+
+    def on_remove_finish(self, status):
+        """ Once removed from warp check anything was warped.
+
+        Args:
+            status (WarpChange | bool): Result of remove_warp_task.
+
+        Returns:
+            None
+        """
+
+        if not status or not status.removed:
+            QtWidgets.QMessageBox.warning(self, 'Time Warp',
+                                          'No objects selected to remove from warp or selected nodes are not warped.')
+
+    def on_delete(self):
+        """ Action on delete of warp we need to fix the widget.
+
+        Returns:
+            None
+        """
+
+        current_warp = self.warp_select.currentText()
+
+        core.delete_warp(current_warp)
+
+        self.warp_select.removeItem(self.warp_select.findText(current_warp))
+
+    def on_bake(self):
+        """ Action on bake of warp we need to fix the widget.
+
+        Returns:
+            None
+        """
+
+        current_warp = self.warp_select.currentText()
+
+        def on_baked(baked):
+            if baked:
+                self.warp_select.removeItem(self.warp_select.findText(current_warp))
+
+        self.start_task(core.bake_warp_task(current_warp), on_baked, nodes=[current_warp])
+
+    def on_bake_all(self):
+        """ Action on bake of many warps, the user picks which and they are baked in a single pass.
+
+        Returns:
+            None
+        """
+
+        warps = self.pick_warps("Bake Warps", "Warps to bake out and delete:")
+
+        if not warps:
+            return
+
+        def on_baked(baked):
+            for warp in baked:
+                self.warp_select.removeItem(self.warp_select.findText(warp))
+
+        self.start_task(core.bake_warps_task(warps), on_baked, nodes=warps)
+
+    def pick_warps(self, title, label):
+        """ Ask the user to pick warps from the widget's list, every warp is picked to start with.
+
+        Args:
+            title (str): Title of the picker.
+            label (str): Text above the list of warps.
+
+        Returns:
+            list of picked warp nodes, empty if cancelled.
+        """
+
+        picker = QtWidgets.QDialog(self)
+        picker.setWindowTitle(title)
+        layout = QtWidgets.QVBoxLayout(picker)
+        layout.addWidget(QtWidgets.QLabel(label))
+
+        warp_list = QtWidgets.QListWidget()
+        for index in range(self.warp_select.count()):
+            item = QtWidgets.QListWidgetItem(self.warp_select.itemText(index))
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.Checked)
+            warp_list.addItem(item)
+        layout.addWidget(warp_list)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(picker.accept)
+        buttons.rejected.connect(picker.reject)
+        layout.addWidget(buttons)
+
+        if picker.exec_() != QtWidgets.QDialog.Accepted:
+            return []
+
+        return [warp_list.item(index).text() for index in range(warp_list.count())
+                if warp_list.item(index).checkState() == QtCore.Qt.Checked]
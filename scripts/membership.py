@@ -0,0 +1,313 @@
+""" Time Warp Membership Index
+
+In memory index of warp -> curves -> driven nodes. The index is walked from the scene once, then kept current by
+Maya's connection callbacks, which mark just the warps whose connections changed to be walked again on their next
+query. Queries on a clean index never touch the DG.
+"""
+
+# Maya
+import maya.cmds
+
+# Node types whose output drives warped curves.
+WARP_NODE_TYPES = ("WarpStatus", "WarpStack")
+
+
+class WarpIndex(object):
+    """ Membership index for every warp in the scene."""
+
+    def __init__(self):
+        """ Create empty index, it is filled on first query."""
+
+        # Dicts are used as ordered sets so results keep Maya's order with constant time lookups.
+        self._curves = {}
+        self._nodes = {}
+        self._curve_warps = {}
+        self._node_warps = {}
+
+        self._dirty = set()
+        self._built = False
+        self._callbacks = []
+        self._tracking = False
+
+    def warped_nodes(self, warp):
+        """ Get nodes driven by a warp.
+
+        Args:
+            warp (str): Maya warp node.
+
+        Returns:
+            list of nodes effected by warp.
+        """
+        self._refresh(warp)
+
+        return list(self._nodes.get(warp, ()))
+
+    def curves(self, warp):
+        """ Get the curves driven by a warp.
+
+        Args:
+            warp (str): Maya warp node.
+
+        Returns:
+            list of animCurve nodes.
+        """
+        self._refresh(warp)
+
+        return list(self._curves.get(warp, ()))
+
+    def count(self, warp):
+        """ Get the number of nodes driven by a warp.
+
+        Args:
+            warp (str): Maya warp node.
+
+        Returns:
+            int of warped node count.
+        """
+        self._refresh(warp)
+
+        return len(self._nodes.get(warp, ()))
+
+    def is_warped(self, node, warp):
+        """ Check if a node is driven by a warp.
+
+        Args:
+            node (str): Maya node.
+            warp (str): Maya warp node.
+
+        Returns:
+            Bool if warped.
+        """
+        self._refresh(warp)
+
+        return node in self._nodes.get(warp, ())
+
+    def node_warps(self, node):
+        """ Get the warps driving a node.
+
+        Args:
+            node (str): Maya node.
+
+        Returns:
+            list of warp nodes.
+        """
+        self._refresh()
+
+        return list(self._node_warps.get(node, ()))
+
+    def invalidate(self, warp=None):
+        """ Mark a warp, or the whole index, to be walked again on the next query.
+
+        Args:
+            warp (str | None): Maya warp node, all warps if not given.
+
+        Returns:
+            None
+        """
+        if warp is None:
+            self._built = False
+        else:
+            self._dirty.add(warp)
+
+    def reset(self):
+        """ Clear the index and remove its callbacks.
+
+        Returns:
+            None
+        """
+        if self._callbacks:
+            import maya.api.OpenMaya as om
+            om.MMessage.removeCallbacks(self._callbacks)
+
+        self.__init__()
+
+    def _refresh(self, warp=None):
+        """ Make sure the index is current before a query.
+
+        Args:
+            warp (str | None): Only this warp needs to be current.
+
+        Returns:
+            None
+        """
+        if not self._tracking:
+            self._tracking = self._add_callbacks()
+
+            # Without callbacks nothing tells us about changes, so walk the scene on every query.
+            if not self._tracking:
+                if warp is None:
+                    self._build()
+                else:
+                    self._build_warp(warp)
+                return
+
+            self._built = False
+
+        if not self._built:
+            self._build()
+        elif warp is None:
+            for target in list(self._dirty):
+                self._build_warp(target)
+        elif warp in self._dirty:
+            self._build_warp(warp)
+
+    def _build(self):
+        """ Walk every warp in the scene.
+
+        Returns:
+            None
+        """
+        self._curves.clear()
+        self._nodes.clear()
+        self._curve_warps.clear()
+        self._node_warps.clear()
+        self._dirty.clear()
+
+        for warp in maya.cmds.ls(type=WARP_NODE_TYPES) or []:
+            self._build_warp(warp)
+
+        self._built = True
+
+    def _build_warp(self, warp):
+        """ Walk one warp's connections and replace its entries.
+
+        Args:
+            warp (str): Maya warp node.
+
+        Returns:
+            None
+        """
+        self._dirty.discard(warp)
+        self._drop_warp(warp)
+
+        if not maya.cmds.objExists(warp):
+            return
+
+        curves = maya.cmds.listConnections(warp, source=False, destination=True, skipConversionNodes=True) or []
+
+        if not curves:
+            return
+
+        nodes = maya.cmds.listConnections(curves, source=False, destination=True, skipConversionNodes=True) or []
+
+        self._curves[warp] = dict.fromkeys(curves)
+        self._nodes[warp] = dict.fromkeys(nodes)
+
+        for curve in curves:
+            self._curve_warps.setdefault(curve, {})[warp] = None
+        for node in nodes:
+            self._node_warps.setdefault(node, {})[warp] = None
+
+    def _drop_warp(self, warp):
+        """ Remove a warp's entries from the index.
+
+        Args:
+            warp (str): Maya warp node.
+
+        Returns:
+            None
+        """
+        for lookup, members in ((self._curve_warps, self._curves.pop(warp, ())),
+                                (self._node_warps, self._nodes.pop(warp, ()))):
+            for member in members:
+                warps = lookup.get(member)
+                if warps is None:
+                    continue
+                warps.pop(warp, None)
+                if not warps:
+                    del lookup[member]
+
+    def _add_callbacks(self):
+        """ Add the Maya callbacks that keep the index current.
+
+        Returns:
+            Bool if callbacks are installed.
+        """
+        try:
+            import maya.api.OpenMaya as om
+        except ImportError:
+            return False
+
+        self._callbacks = [
+            om.MDGMessage.addConnectionCallback(self._on_connection),
+            om.MDGMessage.addNodeRemovedCallback(self._on_warp_removed, "WarpStatus"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_warp_removed, "WarpStack"),
+            om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self._on_rename),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeNew, self._on_scene_change),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, self._on_scene_change),
+        ]
+
+        return True
+
+    def _on_connection(self, source_plug, destination_plug, made, client_data):
+        """ Connection callback, marks warps touched by the connection as dirty.
+
+        Args:
+            source_plug (MPlug): Source of connection.
+            destination_plug (MPlug): Destination of connection.
+            made (bool): If connection was made or broken.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        import maya.api.OpenMaya as om
+
+        if not self._built:
+            return
+
+        source = source_plug.node()
+
+        # Warp output connected or disconnected, this includes the unitConversion nodes between warp and curve.
+        if not source.hasFn(om.MFn.kAnimCurve):
+            source_fn = om.MFnDependencyNode(source)
+            if source_fn.typeName in WARP_NODE_TYPES:
+                self._dirty.add(source_fn.name())
+            return
+
+        # A warped curve gained or lost a driven node.
+        for warp in self._curve_warps.get(om.MFnDependencyNode(source).name(), ()):
+            self._dirty.add(warp)
+
+    def _on_warp_removed(self, node, client_data):
+        """ Node removed callback for warp and stack nodes.
+
+        Args:
+            node (MObject): Removed warp node.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        import maya.api.OpenMaya as om
+
+        self._dirty.add(om.MFnDependencyNode(node).name())
+
+    def _on_rename(self, node, previous_name, client_data):
+        """ Name changed callback, the index is keyed by name so any warped rename rebuilds it.
+
+        Args:
+            node (MObject): Renamed node.
+            previous_name (str): Previous node name.
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        if previous_name in self._curves or previous_name in self._curve_warps or previous_name in self._node_warps:
+            self._built = False
+
+    def _on_scene_change(self, client_data):
+        """ Scene callback, new and opened scenes start with an empty index.
+
+        Args:
+            client_data: Unused.
+
+        Returns:
+            None
+        """
+        self._built = False
+
+
+# Index shared by core and the widget.
+INDEX = WarpIndex()
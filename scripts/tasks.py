@@ -0,0 +1,257 @@
+""" Time Warp Tasks
+
+Runs core tasks, the generators long operations are written as, in slices on Maya's idle queue so the UI stays
+responsive while they work. Each slice runs the task for up to SLICE_TIME seconds, then queues the next slice with
+maya.utils.executeDeferred. Most tasks only commit their edits to the undo queue once they finish, so no undo chunk
+is left open between slices. Simulation bakes are the exception, their bakeResults calls can only be grouped into one
+undo step by a chunk kept open until they finish. Cancelling closes the task, which undoes what it has done so far.
+
+The scene can change while a task waits on the idle queue. Undo, redo, a new or opened scene, or deleting a node the
+task works on aborts it straight away, and the nodes are checked again before every slice.
+
+    task = tasks.Task(core.apply_warp_task("atk_warpSettings"), on_finish=lambda task: print(task.result),
+                      nodes=["atk_warpSettings"])
+    task.start()
+"""
+
+# Python
+import timeit
+
+# Maya
+import maya.cmds
+import maya.utils
+
+from timeWarp.scripts import core
+
+# Seconds of work in each slice before handing back to Maya.
+SLICE_TIME = 0.05
+
+# Tasks on the idle queue, held so they're kept alive between slices.
+_RUNNING = []
+
+# Most precise clock on every mayapy, time.perf_counter doesn't exist in Maya 2020's Python 2.7.
+timer = timeit.default_timer
+
+# Events that change the scene under a waiting task.
+ABORT_EVENTS = ("Undo", "Redo")
+ABORTED_MESSAGE = "Time Warp operation stopped as the scene changed, its changes were undone."
+
+
+def get_running_tasks():
+    """ Get the tasks still running on the idle queue.
+
+    Returns:
+        list of Task.
+    """
+
+    return list(_RUNNING)
+
+
+class Task(object):
+    """ Core task run in slices on Maya's idle queue."""
+
+    def __init__(self, generator, on_progress=None, on_finish=None, slice_time=SLICE_TIME, nodes=None):
+        """ Create task, it doesn't run until started.
+
+        Args:
+            generator (generator): Task yielding TaskProgress, like core.apply_warp_task.
+            on_progress (callable | None): Called with the latest TaskProgress after each slice.
+            on_finish (callable | None): Called with this Task once it's finished, cancelled or failed.
+            slice_time (float | SLICE_TIME): Seconds of work in each slice.
+            nodes (list | None): Maya nodes the task works on, like its warp. The task is aborted if any is deleted.
+        """
+        self.generator = generator
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+        self.slice_time = slice_time
+        self.nodes = list(nodes or [])
+
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.done = False
+        self.running = False
+        self.handles = []
+        self.callbacks = []
+
+    def start(self):
+        """ Start running the task. Batch sessions have no idle queue, so there it runs to the end straight away.
+
+        Returns:
+            self
+        """
+        _RUNNING.append(self)
+
+        if maya.cmds.about(batch=True):
+            while self.run_slice():
+                pass
+        else:
+            self.watch()
+            maya.utils.executeDeferred(self.step)
+
+        return self
+
+    def watch(self):
+        """ Add the callbacks that abort the task if the scene changes under it, and hold handles to its nodes.
+
+        Returns:
+            None
+        """
+        import maya.api.OpenMaya as om
+
+        for node in self.nodes:
+            selection = om.MSelectionList()
+            selection.add(node)
+            node_object = selection.getDependNode(0)
+            self.handles.append(om.MObjectHandle(node_object))
+            self.callbacks.append(om.MNodeMessage.addNodePreRemovalCallback(node_object, self.on_scene_changed))
+
+        for event in ABORT_EVENTS:
+            self.callbacks.append(om.MEventMessage.addEventCallback(event, self.on_scene_changed))
+
+        for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen):
+            self.callbacks.append(om.MSceneMessage.addCallback(message, self.on_scene_changed))
+
+    def unwatch(self):
+        """ Remove the callbacks added by watch.
+
+        Returns:
+            None
+        """
+        import maya.api.OpenMaya as om
+
+        om.MMessage.removeCallbacks(self.callbacks)
+        self.callbacks = []
+        self.handles = []
+
+    def on_scene_changed(self, *args):
+        """ Callback of the scene changing under the task, edits the task makes itself are left alone.
+
+        Args:
+            *args: Callback arguments, unused.
+
+        Returns:
+            None
+        """
+        if not self.running:
+            self.abort(ABORTED_MESSAGE)
+
+    def step(self):
+        """ Run a slice from the idle queue and queue the next one if there is more to do.
+
+        Returns:
+            None
+        """
+        if self.run_slice():
+            maya.utils.executeDeferred(self.step)
+
+    def cancel(self):
+        """ Cancel the task, what it has done so far is undone at its next slice.
+
+        Returns:
+            None
+        """
+        self.cancelled = True
+
+    def abort(self, message=core.CANCELLED_MESSAGE):
+        """ Cancel the task straight away, undoing what it has done so far, rather than at its next slice.
+
+        Args:
+            message (str | CANCELLED_MESSAGE): Warning to show.
+
+        Returns:
+            None
+        """
+        if self.done:
+            return
+
+        self.cancelled = True
+        self.generator.close()
+        maya.cmds.warning(message)
+        self.finish()
+
+    def is_valid(self):
+        """ Check the nodes the task works on are all still in the scene.
+
+        Returns:
+            Bool if valid.
+        """
+        return all(handle.isValid() for handle in self.handles)
+
+    def run_slice(self):
+        """ Run the task until it has worked for slice_time.
+
+        Returns:
+            Bool if there is more to do.
+        """
+        if self.done:
+            return False
+
+        if self.cancelled:
+            self.generator.close()
+            maya.cmds.warning(core.CANCELLED_MESSAGE)
+            return self.finish()
+
+        if not self.is_valid():
+            self.cancelled = True
+            self.generator.close()
+            maya.cmds.warning(ABORTED_MESSAGE)
+            return self.finish()
+
+        deadline = timer() + self.slice_time
+        self.running = True
+
+        try:
+            while True:
+                progress = next(self.generator)
+
+                if isinstance(progress, core.TaskResult):
+                    self.result = progress.value
+                    self.generator.close()
+                    return self.finish()
+
+                self.progress = progress
+                if timer() >= deadline:
+                    break
+
+        except StopIteration:
+            return self.finish()
+
+        except core.OperationCancelled:
+            # Steps that show the main progress bar can be cancelled from it too.
+            self.cancelled = True
+            maya.cmds.warning(core.CANCELLED_MESSAGE)
+            return self.finish()
+
+        except Exception as error:  # pylint: disable=broad-except
+            # The scene can change between slices, the task has already undone its edits on the way out.
+            self.error = error
+            maya.cmds.warning("Time Warp operation failed, its changes were undone: {}".format(error))
+            return self.finish()
+
+        finally:
+            self.running = False
+
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+
+        return True
+
+    def finish(self):
+        """ Mark the task as done and report it.
+
+        Returns:
+            False, as there is nothing more to do.
+        """
+        self.done = True
+        self.running = False
+        self.unwatch()
+
+        if self in _RUNNING:
+            _RUNNING.remove(self)
+
+        if self.on_finish is not None:
+            self.on_finish(self)
+
+        return False
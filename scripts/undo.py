@@ -0,0 +1,47 @@
+""" Time Warp Undo
+
+API edits such as MDGModifier and MAnimCurveChange are not recorded by Maya's undo queue on their own. Edits are
+applied by the caller, then handed to the timeWarpCommit command from the WarpStatus plug-in so that a single undo
+entry can revert them.
+"""
+
+# Maya
+import maya.cmds
+
+COMMAND_NAME = 'timeWarpCommit'
+
+# Undo and redo callables waiting to be picked up by the commit command.
+_PENDING = []
+
+
+def commit(undo, redo):
+    """ Register already applied edits with Maya's undo queue.
+
+    Args:
+        undo (callable): Called when the user undoes, for example modifier.undoIt.
+        redo (callable): Called when the user redoes, for example modifier.doIt.
+
+    Returns:
+        Bool if the edits were added to the undo queue.
+    """
+
+    command = getattr(maya.cmds, COMMAND_NAME, None)
+
+    # Without the plug-in the edits still stand, they just can't be undone.
+    if command is None:
+        return False
+
+    _PENDING.append((undo, redo))
+    command()
+
+    return True
+
+
+def pop():
+    """ Take the oldest pending edits, used by the commit command.
+
+    Returns:
+        tuple of undo and redo callables.
+    """
+
+    return _PENDING.pop(0)
@@ -0,0 +1,12 @@
+""" Fake Maya
+
+In memory stand in for the parts of Maya that timeWarp uses, so core can be run, tested and profiled without a
+Maya licence. Put the fake_maya folder first on the system path before importing timeWarp:
+
+    sys.path.insert(0, 'tests/fake_maya')
+    from timeWarp.scripts import core
+
+The scene lives in maya._scene.SCENE, maya.cmds.file(new=True) starts a new one. Animation curves are evaluated by the
+reference in maya._curve, which is plain Python and independent of timeWarp.scripts.curve, so the package's curve
+math can be tested against it. It needs no NumPy, like older mayapy versions.
+"""
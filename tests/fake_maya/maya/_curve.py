@@ -0,0 +1,132 @@
+""" Fake Animation Curve Evaluation
+
+Reference evaluation of animCurves for the fake scene, written key by key in plain Python so it shares nothing with
+timeWarp.scripts.curve, which is tested against it. Segments are cubic Hermite between keys with their tangent
+slopes, like Maya's unweighted curves.
+"""
+
+# Python
+import bisect
+import math
+
+# Maya's infinity types, matching the preInfinity and postInfinity enum on animCurves.
+CONSTANT = 0
+LINEAR = 1
+CYCLE = 3
+CYCLE_RELATIVE = 4
+OSCILLATE = 5
+
+# Named maya time units in frames per second.
+TIME_UNITS = {'game': 15.0, 'film': 24.0, 'pal': 25.0, 'ntsc': 30.0, 'show': 48.0, 'palf': 50.0, 'ntscf': 60.0}
+
+
+def key_slopes(times, values, in_types, out_types):
+    """ Slopes in value per frame of each key's tangents, from the tangent types.
+
+    Linear tangents point at the neighbouring key, flat and stepped tangents are level, clamped tangents are level
+    next to a key of the same value, and every other type points along the line between the neighbouring keys.
+    """
+    count = len(times)
+    in_slopes = []
+    out_slopes = []
+
+    for index in range(count):
+        if count < 2:
+            in_slopes.append(0.0)
+            out_slopes.append(0.0)
+            continue
+
+        previous = max(index - 1, 0)
+        following = min(index + 1, count - 1)
+
+        before = _line(times, values, previous, previous + 1)
+        after = _line(times, values, following - 1, following)
+        smooth = _line(times, values, previous, following)
+
+        same_neighbour = ((index > 0 and abs(values[index] - values[index - 1]) < 1e-8) or
+                          (index < count - 1 and abs(values[index] - values[index + 1]) < 1e-8))
+
+        for tangent, linear, slopes in ((in_types[index], before, in_slopes), (out_types[index], after, out_slopes)):
+            if tangent == 'linear':
+                slopes.append(linear)
+            elif tangent in ('flat', 'step', 'stepnext'):
+                slopes.append(0.0)
+            elif tangent in ('clamped', 'plateau') and same_neighbour:
+                slopes.append(0.0)
+            else:
+                slopes.append(smooth)
+
+    return in_slopes, out_slopes
+
+
+def _line(times, values, first, second):
+    """ Slope of the line between two keys."""
+    return (values[second] - values[first]) / (times[second] - times[first])
+
+
+class ReferenceCurve(object):
+    """ animCurve keys evaluated one time at a time."""
+
+    def __init__(self, times, values, in_slopes, out_slopes, out_types, pre_infinity, post_infinity):
+        self.times = [float(time) for time in times]
+        self.values = [float(value) for value in values]
+        self.in_slopes = [float(slope) for slope in in_slopes]
+        self.out_slopes = [float(slope) for slope in out_slopes]
+        self.out_types = list(out_types)
+        self.pre_infinity = pre_infinity
+        self.post_infinity = post_infinity
+
+    def evaluate(self, time):
+        """ Value of the curve at a time."""
+        time = float(time)
+        first, last = self.times[0], self.times[-1]
+        span = last - first
+
+        if time < first or time > last:
+            before = time < first
+            infinity = self.pre_infinity if before else self.post_infinity
+
+            if infinity == LINEAR:
+                if before:
+                    return self.values[0] + (time - first) * self.in_slopes[0]
+                return self.values[-1] + (time - last) * self.out_slopes[-1]
+
+            if infinity in (CYCLE, CYCLE_RELATIVE, OSCILLATE) and span > 0.0:
+                cycles = math.floor((time - first) / span)
+                local = time - cycles * span
+                if infinity == OSCILLATE and int(cycles) % 2:
+                    local = 2.0 * first + span - local
+                value = self.segment(local)
+                if infinity == CYCLE_RELATIVE:
+                    value += cycles * (self.values[-1] - self.values[0])
+                return value
+
+            return self.values[0] if before else self.values[-1]
+
+        return self.segment(time)
+
+    def segment(self, time):
+        """ Value of the curve at a time between its first and last key."""
+        if len(self.times) == 1:
+            return self.values[0]
+
+        index = min(max(bisect.bisect_right(self.times, time) - 1, 0), len(self.times) - 2)
+
+        start, end = self.times[index], self.times[index + 1]
+        start_value, end_value = self.values[index], self.values[index + 1]
+
+        if time < end and self.out_types[index] == 'step':
+            return start_value
+        if time < end and self.out_types[index] == 'stepnext':
+            return end_value
+
+        span = end - start
+        s = (time - start) / span
+
+        h00 = 2.0 * s ** 3 - 3.0 * s ** 2 + 1.0
+        h10 = s ** 3 - 2.0 * s ** 2 + s
+        h01 = -2.0 * s ** 3 + 3.0 * s ** 2
+        h11 = s ** 3 - s ** 2
+
+        return (h00 * start_value + h10 * self.out_slopes[index] * span +
+                h01 * end_value + h11 * self.in_slopes[index + 1] * span)
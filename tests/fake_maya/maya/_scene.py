@@ -0,0 +1,673 @@
+""" Fake Maya Scene
+
+In memory dependency graph shared by the fake maya.cmds and maya.api modules. Nodes hold plain attribute values,
+connections and animation keys. Attributes are evaluated on demand by pulling through connections, with animCurve,
+unitConversion, time, WarpStatus and WarpStack outputs computed like their Maya counterparts. Every time value is
+kept in frames and every angle in degrees, so unit conversion nodes pass values straight through.
+"""
+
+# Python
+import fnmatch
+import itertools
+import math
+import re
+
+from maya import _curve
+
+# Node types to their parent type, used for type filters and isAType checks.
+TYPE_PARENTS = {
+    'dependNode': None,
+    'animCurve': 'dependNode',
+    'animCurveTT': 'animCurve',
+    'animCurveTU': 'animCurve',
+    'animCurveTA': 'animCurve',
+    'animCurveTL': 'animCurve',
+    'geometryFilter': 'dependNode',
+    'skinCluster': 'geometryFilter',
+    'blendShape': 'geometryFilter',
+    'cluster': 'geometryFilter',
+    'unitConversion': 'dependNode',
+    'time': 'dependNode',
+    'WarpStatus': 'dependNode',
+    'WarpStack': 'dependNode',
+    'dagNode': 'dependNode',
+    'transform': 'dagNode',
+    'joint': 'transform',
+    'shape': 'dagNode',
+    'locator': 'shape',
+    'mesh': 'shape',
+}
+
+# Default attribute values for each type, these are also the attributes attributeQuery finds.
+DEFAULTS = {
+    'animCurve': {'input': 0.0, 'output': 0.0, 'preInfinity': 0, 'postInfinity': 0, 'weightedTangents': False},
+    'unitConversion': {'input': 0.0, 'output': 0.0, 'conversionFactor': 1.0},
+    'time': {'outTime': 1.0, 'enableTimewarp': False, 'timewarpIn_Raw': 0.0},
+    'WarpStatus': {'warpActive': True, 'warpInput': 0.0, 'timeInput': 0.0, 'cacheEnabled': False,
+                   'cacheResolution': 4, 'output': 0.0, 'member': None, 'memberOffset': 0.0, 'memberScale': 1.0,
+                   'memberOutput': None},
+    'WarpStack': {'timeInput': 0.0, 'layer': None, 'layerInput': 0.0, 'layerEnable': True, 'layerWeight': 1.0,
+                  'output': 0.0},
+    'dagNode': {'visibility': True},
+    'transform': {'translateX': 0.0, 'translateY': 0.0, 'translateZ': 0.0,
+                  'rotateX': 0.0, 'rotateY': 0.0, 'rotateZ': 0.0,
+                  'scaleX': 1.0, 'scaleY': 1.0, 'scaleZ': 1.0},
+    'geometryFilter': {'envelope': 1.0},
+}
+
+# Children of compound array attributes, in the order MPlug.child uses.
+COMPOUND_CHILDREN = {'member': ['memberOffset', 'memberScale'],
+                     'layer': ['layerInput', 'layerEnable', 'layerWeight']}
+
+# Short attribute names to long ones.
+ALIASES = {'wi': 'warpInput', 'ti': 'timeInput', 'act': 'warpActive', 'ce': 'cacheEnabled', 'cr': 'cacheResolution',
+           'out': 'output', 'o': 'output', 'i': 'input', 'mem': 'member', 'mo': 'memberOffset', 'ms': 'memberScale',
+           'mout': 'memberOutput', 'lyr': 'layer', 'li': 'layerInput', 'le': 'layerEnable', 'lw': 'layerWeight',
+           'tx': 'translateX', 'ty': 'translateY', 'tz': 'translateZ', 'rx': 'rotateX', 'ry': 'rotateY',
+           'rz': 'rotateZ', 'sx': 'scaleX', 'sy': 'scaleY', 'sz': 'scaleZ', 'v': 'visibility'}
+
+# Attributes holding time, connecting them to other attributes puts a unitConversion node in between.
+TIME_ATTRIBUTES = {'animCurve': ('input',), 'animCurveTT': ('input', 'output'), 'time': ('outTime',)}
+
+# Curve type keyed for an attribute by setKeyframe.
+CURVE_TYPES = (('translate', 'animCurveTL'), ('rotate', 'animCurveTA'))
+
+# Tangent types without a fixed angle, their angle comes from the neighbouring keys.
+AUTO_TANGENTS = ('auto', 'spline', 'linear', 'flat', 'clamped', 'plateau', 'step', 'stepnext')
+
+ELEMENT = re.compile(r'^(\w+)\[(\d+)\]$')
+
+
+class Key(object):
+    """ Animation key."""
+
+    __slots__ = ('value', 'in_type', 'out_type', 'in_angle', 'out_angle', 'in_weight', 'out_weight', 'locked')
+
+    def __init__(self, value, in_type='auto', out_type='auto'):
+        self.value = float(value)
+        self.in_type = in_type
+        self.out_type = out_type
+        self.in_angle = None
+        self.out_angle = None
+        self.in_weight = 1.0
+        self.out_weight = 1.0
+        self.locked = True
+
+    def copy(self):
+        key = Key(self.value, self.in_type, self.out_type)
+        for slot in self.__slots__:
+            setattr(key, slot, getattr(self, slot))
+        return key
+
+
+class Node(object):
+    """ Dependency node."""
+
+    def __init__(self, name, node_type, parent=None):
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = []
+        self.values = {}
+        self.inputs = {}
+        self.outputs = {}
+        self.keys = {}
+        self.alive = True
+        self.curve = None
+
+    def is_a(self, node_type):
+        """ Check if this node is of a type or inherits from it."""
+        current = self.type
+        while current:
+            if current == node_type:
+                return True
+            current = TYPE_PARENTS.get(current, 'dependNode' if current != 'dependNode' else None)
+        return False
+
+    def path(self):
+        """ Full DAG path of the node, or its name for DG nodes."""
+        if not self.is_a('dagNode'):
+            return self.name
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return '|' + '|'.join(reversed(names))
+
+    def default(self, attribute):
+        """ Default value of an attribute, or None if the node doesn't have it."""
+        leaf = ELEMENT.sub(r'\1', attribute.split('.')[-1])
+        current = self.type
+        while current:
+            defaults = DEFAULTS.get(current, {})
+            if leaf in defaults:
+                return defaults[leaf]
+            current = TYPE_PARENTS.get(current)
+        return None
+
+    def has_attribute(self, attribute):
+        """ Check if the node has an attribute."""
+        attribute = normalize(attribute)
+        leaf = ELEMENT.sub(r'\1', attribute.split('.')[-1])
+        current = self.type
+        while current:
+            if leaf in DEFAULTS.get(current, {}):
+                return True
+            current = TYPE_PARENTS.get(current)
+        return attribute in self.values or attribute in self.inputs or attribute in self.outputs
+
+    def is_time(self, attribute):
+        """ Check if an attribute holds time."""
+        current = self.type
+        while current:
+            if attribute in TIME_ATTRIBUTES.get(current, ()):
+                return True
+            current = TYPE_PARENTS.get(current)
+        return False
+
+
+def normalize(attribute):
+    """ Expand short attribute names in an attribute path like "lyr[0].li"."""
+    parts = []
+    for part in attribute.split('.'):
+        match = ELEMENT.match(part)
+        if match:
+            parts.append('{}[{}]'.format(ALIASES.get(match.group(1), match.group(1)), match.group(2)))
+        else:
+            parts.append(ALIASES.get(part, part))
+    return '.'.join(parts)
+
+
+def matches(attribute, query):
+    """ Check if an attribute is the queried attribute, one of its elements or one of their children."""
+    return attribute == query or attribute.startswith(query + '[') or attribute.startswith(query + '.')
+
+
+class Scene(object):
+    """ The whole fake scene."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.callback_ids = itertools.count(1)
+        self.pending = []
+        self.undo_stack = []
+        self.redo_stack = []
+        self.chunk_depth = 0
+        self.chunk = []
+        self.chunk_name = ''
+        self.warnings = []
+        self.reset()
+
+    def reset(self):
+        """ Start a new empty scene."""
+        self.nodes = {}
+        self.selection = []
+        self.time = 1.0
+        self.min_time = 1.0
+        self.max_time = 120.0
+        self.animation_start = 1.0
+        self.animation_end = 120.0
+        self.time_unit = 'film'
+        self.evaluation_mode = 'off'
+        self.undo_stack = []
+        self.redo_stack = []
+        self.chunk_depth = 0
+        self.chunk = []
+        self.chunk_name = ''
+        self.create_node('time', 'time1')
+
+    # Undo
+
+    def record(self, undo_function, redo_function, name=''):
+        """ Add an undo entry, inside an open chunk it's grouped with the rest of the chunk."""
+        if self.chunk_depth:
+            self.chunk.append((undo_function, redo_function))
+        else:
+            self.undo_stack.append((undo_function, redo_function, name))
+        self.redo_stack = []
+
+    def open_chunk(self, name=''):
+        """ Start grouping undo entries, the outermost chunk names the entry."""
+        if not self.chunk_depth:
+            self.chunk = []
+            self.chunk_name = name
+        self.chunk_depth += 1
+
+    def close_chunk(self):
+        """ Stop grouping undo entries, the outermost close adds the chunk as one entry if it isn't empty."""
+        self.chunk_depth = max(self.chunk_depth - 1, 0)
+        if self.chunk_depth or not self.chunk:
+            return
+
+        entries = self.chunk
+        self.chunk = []
+
+        def undo_chunk():
+            for undo_function, _ in reversed(entries):
+                undo_function()
+
+        def redo_chunk():
+            for _, redo_function in entries:
+                redo_function()
+
+        self.undo_stack.append((undo_chunk, redo_chunk, self.chunk_name))
+
+    # Nodes
+
+    def unique_name(self, name):
+        """ Make a node name unique the way Maya does, by counting up its trailing number."""
+        if name not in self.nodes:
+            return name
+        base = re.sub(r'\d+$', '', name)
+        for number in itertools.count(1):
+            candidate = '{}{}'.format(base, number)
+            if candidate not in self.nodes:
+                return candidate
+
+    def create_node(self, node_type, name=None, parent=None):
+        """ Create a node, names default to the type with a number."""
+        if node_type not in TYPE_PARENTS:
+            raise RuntimeError('Unknown object type: {}'.format(node_type))
+        name = self.unique_name(name or '{}1'.format(node_type))
+        node = Node(name, node_type, parent=parent)
+        if parent is not None:
+            parent.children.append(node)
+        self.nodes[name] = node
+        return node
+
+    def find(self, name, required=True):
+        """ Find a node by name or DAG path."""
+        node = self.nodes.get(name.split('|')[-1])
+        if node is None and required:
+            raise ValueError('No object matches name: {}'.format(name))
+        return node
+
+    def split(self, plug):
+        """ Split "node.attribute" into the node and its normalized attribute."""
+        node_name, _, attribute = plug.partition('.')
+        return self.find(node_name), normalize(attribute)
+
+    def delete_node(self, node):
+        """ Delete a node with its children and connections."""
+        if not node.alive:
+            return
+        for child in list(node.children):
+            self.delete_node(child)
+        for attribute, (source, source_attribute) in list(node.inputs.items()):
+            self.disconnect(source, source_attribute, node, attribute)
+        for attribute, destinations in list(node.outputs.items()):
+            for destination, destination_attribute in list(destinations):
+                self.disconnect(node, attribute, destination, destination_attribute)
+        if node.parent is not None and node in node.parent.children:
+            node.parent.children.remove(node)
+        node.alive = False
+        self.nodes.pop(node.name, None)
+        if node in self.selection:
+            self.selection.remove(node)
+        self.fire('nodeRemoved', node)
+
+    def delete_nodes(self, nodes):
+        """ Delete nodes so the deletion can be undone, returning the undo and redo functions."""
+        deleted = []
+        for node in nodes:
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                if current.alive and current not in deleted:
+                    deleted.append(current)
+                    stack.extend(current.children)
+
+        # Connections are kept looking through unitConversion nodes, connect puts them back where needed.
+        links = []
+        for node in deleted:
+            for attribute in list(node.inputs):
+                source = self.source_node(node, attribute)
+                if source[0] is not None:
+                    links.append((source[0], source[1], node, attribute))
+            for (_, attribute), (other, other_attribute) in self.connections(node, source=False, skip_conversion=True):
+                links.append((node, attribute, other, other_attribute))
+
+        def undo_delete():
+            for node in deleted:
+                self.restore_node(node)
+            for source, source_attribute, destination, destination_attribute in links:
+                if source.alive and destination.alive and destination.inputs.get(destination_attribute) is None:
+                    self.connect(source, source_attribute, destination, destination_attribute)
+
+        def redo_delete():
+            for node in deleted:
+                self.delete_node(node)
+
+        redo_delete()
+        return undo_delete, redo_delete
+
+    def restore_node(self, node):
+        """ Put a deleted node back, used by undo."""
+        node.alive = True
+        node.name = self.unique_name(node.name)
+        self.nodes[node.name] = node
+        if node.parent is not None and node not in node.parent.children:
+            node.parent.children.append(node)
+
+    def rename(self, node, name):
+        """ Rename a node."""
+        previous = node.name
+        self.nodes.pop(previous, None)
+        node.name = self.unique_name(name)
+        self.nodes[node.name] = node
+        self.fire('nameChanged', node, previous)
+        return node.name
+
+    def ls(self, names=None, node_type=None, dag=False):
+        """ List nodes matching names or wildcard patterns, with their DAG children if asked."""
+        if names is None:
+            found = list(self.nodes.values())
+        else:
+            found = []
+            for name in names:
+                pattern = name.split('|')[-1]
+                if any(character in pattern for character in '*?['):
+                    found.extend(node for node_name, node in self.nodes.items()
+                                 if fnmatch.fnmatchcase(node_name, pattern))
+                else:
+                    node = self.find(name.split('.')[0], required=False)
+                    if node is not None:
+                        found.append(node)
+
+        if dag:
+            expanded = []
+            stack = list(reversed(found))
+            while stack:
+                node = stack.pop()
+                expanded.append(node)
+                stack.extend(reversed(node.children))
+            found = expanded
+
+        if node_type:
+            types = [node_type] if isinstance(node_type, str) else node_type
+            found = [node for node in found if any(node.is_a(each) for each in types)]
+
+        unique = []
+        seen = set()
+        for node in found:
+            if id(node) not in seen:
+                seen.add(id(node))
+                unique.append(node)
+        return unique
+
+    # Connections
+
+    def connect(self, source, source_attribute, destination, destination_attribute, force=True):
+        """ Connect two attributes, time and non time attributes are joined through a unitConversion node."""
+        existing = destination.inputs.get(destination_attribute)
+        if existing:
+            if existing == (source, source_attribute):
+                return
+            if not force:
+                raise RuntimeError('{}.{} already has an incoming connection.'.format(destination.name,
+                                                                                      destination_attribute))
+            self.disconnect(existing[0], existing[1], destination, destination_attribute)
+
+        if source.is_time(source_attribute) != destination.is_time(destination_attribute):
+            conversion = self.create_node('unitConversion', 'unitConversion1')
+            self.link(source, source_attribute, conversion, 'input')
+            self.link(conversion, 'output', destination, destination_attribute)
+            return
+
+        self.link(source, source_attribute, destination, destination_attribute)
+
+    def link(self, source, source_attribute, destination, destination_attribute):
+        """ Add a single connection."""
+        destination.inputs[destination_attribute] = (source, source_attribute)
+        source.outputs.setdefault(source_attribute, []).append((destination, destination_attribute))
+        self.fire('connection', (source, source_attribute), (destination, destination_attribute), True)
+
+    def disconnect(self, source, source_attribute, destination, destination_attribute):
+        """ Remove a connection, unitConversion nodes left without a connection are deleted like in Maya."""
+        if destination.inputs.get(destination_attribute) != (source, source_attribute):
+            return
+        del destination.inputs[destination_attribute]
+        destinations = source.outputs.get(source_attribute, [])
+        if (destination, destination_attribute) in destinations:
+            destinations.remove((destination, destination_attribute))
+        if not destinations:
+            source.outputs.pop(source_attribute, None)
+        self.fire('connection', (source, source_attribute), (destination, destination_attribute), False)
+
+        for node in (source, destination):
+            if node.is_a('unitConversion') and node.alive and (not node.inputs or not node.outputs):
+                self.delete_node(node)
+
+    def connections(self, node, attribute=None, source=True, destination=True, skip_conversion=False):
+        """ Get the connections of a node or attribute as tuples of this plug and the other plug."""
+        found = []
+        if source:
+            for this_attribute, (other, other_attribute) in list(node.inputs.items()):
+                if attribute is not None and not matches(this_attribute, attribute):
+                    continue
+                if skip_conversion and other.is_a('unitConversion'):
+                    upstream = other.inputs.get('input')
+                    if upstream is None:
+                        continue
+                    other, other_attribute = upstream
+                found.append(((node, this_attribute), (other, other_attribute)))
+        if destination:
+            for this_attribute, destinations in list(node.outputs.items()):
+                if attribute is not None and not matches(this_attribute, attribute):
+                    continue
+                for other, other_attribute in list(destinations):
+                    if skip_conversion and other.is_a('unitConversion'):
+                        for downstream in other.outputs.get('output', []):
+                            found.append(((node, this_attribute), downstream))
+                        continue
+                    found.append(((node, this_attribute), (other, other_attribute)))
+        return found
+
+    def source_node(self, node, attribute):
+        """ Get the node driving an attribute, looking through unitConversion nodes."""
+        source = node.inputs.get(attribute)
+        if source is None:
+            return None, None
+        if source[0].is_a('unitConversion'):
+            return source[0].inputs.get('input', (None, None))
+        return source
+
+    # Values
+
+    def indices(self, node, attribute):
+        """ Get the existing logical indices of an array attribute."""
+        pattern = re.compile(r'^{}\[(\d+)\]'.format(re.escape(attribute)))
+        found = set()
+        for names in (node.values, node.inputs, node.outputs):
+            for name in names:
+                match = pattern.match(name)
+                if match:
+                    found.add(int(match.group(1)))
+        return sorted(found)
+
+    def get_value(self, node, attribute, time=None):
+        """ Evaluate an attribute at a time, the current time if not given."""
+        return self.evaluate(node, attribute, self.time if time is None else float(time))
+
+    def set_value(self, node, attribute, value):
+        """ Set a stored attribute value."""
+        if isinstance(value, bool) or node.default(attribute) is None or isinstance(node.default(attribute), bool):
+            node.values[attribute] = value
+        elif isinstance(node.default(attribute), int):
+            node.values[attribute] = int(value)
+        else:
+            node.values[attribute] = float(value)
+
+    def evaluate(self, node, attribute, time):
+        """ Pull an attribute's value through the graph."""
+        source = node.inputs.get(attribute)
+        if source is not None:
+            return self.evaluate(source[0], source[1], time)
+
+        if node.is_a('animCurve') and attribute == 'output':
+            curve_time = self.evaluate(node, 'input', time) if 'input' in node.inputs else time
+            return self.evaluate_curve(node, curve_time)
+
+        if node.is_a('unitConversion') and attribute == 'output':
+            return self.evaluate(node, 'input', time) * node.values.get('conversionFactor', 1.0)
+
+        if node.is_a('time') and attribute == 'outTime':
+            return time
+
+        if node.is_a('WarpStatus') and (attribute == 'output' or attribute.startswith('memberOutput[')):
+            if self.evaluate(node, 'warpActive', time):
+                warped = self.evaluate(node, 'warpInput', time)
+            else:
+                warped = self.evaluate(node, 'timeInput', time)
+            if attribute == 'output':
+                return warped
+            element = 'member[{}]'.format(ELEMENT.match(attribute).group(2))
+            return (warped * self.evaluate(node, element + '.memberScale', time) +
+                    self.evaluate(node, element + '.memberOffset', time))
+
+        if node.is_a('WarpStack') and attribute == 'output':
+            warped = self.evaluate(node, 'timeInput', time)
+            for index in self.indices(node, 'layer'):
+                layer = 'layer[{}]'.format(index)
+                curve_node, _ = self.source_node(node, layer + '.layerInput')
+                if curve_node is None or not curve_node.is_a('animCurve'):
+                    continue
+                if not self.evaluate(node, layer + '.layerEnable', time):
+                    continue
+                weight = self.evaluate(node, layer + '.layerWeight', time)
+                warped += weight * (self.evaluate_curve(curve_node, warped) - warped)
+            return warped
+
+        if attribute in node.values:
+            return node.values[attribute]
+
+        value = node.default(attribute)
+        return 0.0 if value is None else value
+
+    # Animation curves
+
+    def curve_type(self, node, attribute):
+        """ Get the animCurve type setKeyframe would make for an attribute."""
+        for prefix, curve_type in CURVE_TYPES:
+            if attribute.startswith(prefix):
+                return curve_type
+        return 'animCurveTU'
+
+    def keyed_curve(self, node, attribute, create=False):
+        """ Get the animCurve driving an attribute, making one if asked."""
+        curve_node, _ = self.source_node(node, attribute)
+        if curve_node is not None and curve_node.is_a('animCurve'):
+            return curve_node
+        if node.is_a('animCurve'):
+            return node
+        if not create:
+            return None
+        curve_node = self.create_node(self.curve_type(node, attribute),
+                                      '{}_{}'.format(node.name, attribute.replace('[', '_').replace(']', '')))
+        self.connect(curve_node, 'output', node, attribute)
+        return curve_node
+
+    def set_key(self, curve_node, time, value, in_type=None, out_type=None):
+        """ Add or replace a key."""
+        key = curve_node.keys.get(float(time))
+        if key is None:
+            key = Key(value, in_type or 'auto', out_type or 'auto')
+            curve_node.keys[float(time)] = key
+        else:
+            key.value = float(value)
+            key.in_type = in_type or key.in_type
+            key.out_type = out_type or key.out_type
+        curve_node.curve = None
+
+    def key_times(self, curve_node, time_range=None):
+        """ Sorted key times, only inside a range if given."""
+        times = sorted(curve_node.keys)
+        if time_range is not None:
+            times = [time for time in times if time_range[0] <= time <= time_range[1]]
+        return times
+
+    def tangent_angles(self, curve_node):
+        """ In and out tangent angles in degrees for every key, resolving automatic tangents from their neighbours."""
+        times = self.key_times(curve_node)
+        keys = [curve_node.keys[time] for time in times]
+        if not keys:
+            return [], []
+
+        in_slopes, out_slopes = _curve.key_slopes(times, [key.value for key in keys], [key.in_type for key in keys],
+                                                  [key.out_type for key in keys])
+
+        # Tangent angles are measured against seconds, time to time curves have seconds on both axes.
+        scale = 1.0 if curve_node.type == 'animCurveTT' else self.frames_per_second()
+
+        in_angles = []
+        out_angles = []
+        for key, in_slope, out_slope in zip(keys, in_slopes, out_slopes):
+            in_angles.append(key.in_angle if key.in_angle is not None else
+                             math.degrees(math.atan(float(in_slope) * scale)))
+            out_angles.append(key.out_angle if key.out_angle is not None else
+                              math.degrees(math.atan(float(out_slope) * scale)))
+        return in_angles, out_angles
+
+    def evaluate_curve(self, curve_node, time):
+        """ Evaluate an animCurve at a time."""
+        if not curve_node.keys:
+            return 0.0
+
+        if curve_node.curve is None:
+            times = self.key_times(curve_node)
+            keys = [curve_node.keys[key_time] for key_time in times]
+            in_angles, out_angles = self.tangent_angles(curve_node)
+            scale = 1.0 if curve_node.type == 'animCurveTT' else 1.0 / self.frames_per_second()
+            curve_node.curve = _curve.ReferenceCurve(
+                times, [key.value for key in keys],
+                [math.tan(math.radians(angle)) * scale for angle in in_angles],
+                [math.tan(math.radians(angle)) * scale for angle in out_angles],
+                [key.out_type for key in keys],
+                curve_node.values.get('preInfinity', 0),
+                curve_node.values.get('postInfinity', 0))
+
+        return curve_node.curve.evaluate(time)
+
+    def frames_per_second(self):
+        """ Frame rate of the scene time unit."""
+        return _curve.TIME_UNITS.get(self.time_unit, 24.0)
+
+    # Callbacks
+
+    def add_callback(self, kind, function, node_type=None, node=None):
+        """ Add a message callback, returns its id."""
+        callback_id = next(self.callback_ids)
+        self.callbacks[callback_id] = (kind, function, node_type, node)
+        return callback_id
+
+    def remove_callback(self, callback_id):
+        """ Remove a message callback."""
+        self.callbacks.pop(callback_id, None)
+
+    def fire(self, kind, *args):
+        """ Call every callback of a kind."""
+        if not self.callbacks:
+            return
+
+        from maya.api import OpenMaya as om
+
+        for callback_kind, function, node_type, node in list(self.callbacks.values()):
+            if callback_kind != kind:
+                continue
+
+            if kind == 'connection':
+                (source, source_attribute), (destination, destination_attribute), made = args
+                function(om.MPlug(source, source_attribute), om.MPlug(destination, destination_attribute), made, None)
+            elif kind == 'nodeRemoved':
+                if node_type is None or args[0].is_a(node_type):
+                    function(om.MObject(args[0]), None)
+            elif kind == 'nameChanged':
+                if node is None or node is args[0]:
+                    function(om.MObject(args[0]), args[1], None)
+            else:
+                function(None)
+
+
+# The scene every fake module works on.
+SCENE = Scene()
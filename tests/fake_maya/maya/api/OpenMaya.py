@@ -0,0 +1,579 @@
+""" Fake maya.api.OpenMaya
+
+Objects, plugs, DG modifiers, units and messages over the in memory scene.
+"""
+
+from maya._scene import SCENE, COMPOUND_CHILDREN, ELEMENT, normalize
+
+
+class MFn(object):
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kAnimCurve = 7
+    kUnitConversion = 525
+    kTime = 515
+
+    TYPES = {kDependencyNode: 'dependNode', kDagNode: 'dagNode', kTransform: 'transform', kAnimCurve: 'animCurve',
+             kUnitConversion: 'unitConversion', kTime: 'time'}
+
+
+class MObject(object):
+    """ Handle to a node."""
+
+    kNullObj = None
+
+    def __init__(self, node=None):
+        self._node = node._node if isinstance(node, MObject) else node
+
+    def isNull(self):
+        return self._node is None or not self._node.alive
+
+    def hasFn(self, function):
+        return self._node is not None and self._node.is_a(MFn.TYPES.get(function, ''))
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._node is other._node
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return id(self._node)
+
+
+MObject.kNullObj = MObject()
+
+
+class MPlug(object):
+    """ Handle to a node attribute."""
+
+    def __init__(self, node=None, attribute=None):
+        self._node = node._node if isinstance(node, MObject) else node
+        self._attribute = normalize(attribute) if attribute else None
+
+    @property
+    def isNull(self):
+        return self._node is None or self._attribute is None
+
+    @property
+    def isArray(self):
+        return self._attribute is not None and not self._attribute.endswith(']') and \
+            bool(SCENE.indices(self._node, self._attribute) or self._attribute in ('member', 'memberOutput', 'layer'))
+
+    def node(self):
+        return MObject(self._node)
+
+    def name(self):
+        return '{}.{}'.format(self._node.name, self._attribute)
+
+    def partialName(self, *args, **kwargs):
+        return self._attribute
+
+    def source(self):
+        source = self._node.inputs.get(self._attribute)
+        if source is None:
+            return MPlug()
+        return MPlug(source[0], source[1])
+
+    def destinations(self):
+        return [MPlug(node, attribute) for node, attribute in self._node.outputs.get(self._attribute, [])]
+
+    def elementByLogicalIndex(self, index):
+        return MPlug(self._node, '{}[{}]'.format(self._attribute, index))
+
+    def logicalIndex(self):
+        match = ELEMENT.match(self._attribute.split('.')[-1])
+        return int(match.group(2)) if match else -1
+
+    def child(self, index):
+        parent = ELEMENT.sub(r'\1', self._attribute.split('.')[-1])
+        return MPlug(self._node, '{}.{}'.format(self._attribute, COMPOUND_CHILDREN[parent][index]))
+
+    def getExistingArrayAttributeIndices(self):
+        return SCENE.indices(self._node, self._attribute)
+
+    def asFloat(self):
+        return float(SCENE.get_value(self._node, self._attribute))
+
+    asDouble = asFloat
+
+    def asInt(self):
+        return int(SCENE.get_value(self._node, self._attribute))
+
+    def asBool(self):
+        return bool(SCENE.get_value(self._node, self._attribute))
+
+    def setFloat(self, value):
+        SCENE.set_value(self._node, self._attribute, float(value))
+
+    setDouble = setFloat
+
+    def setInt(self, value):
+        SCENE.set_value(self._node, self._attribute, int(value))
+
+    def setBool(self, value):
+        SCENE.set_value(self._node, self._attribute, bool(value))
+
+    def __eq__(self, other):
+        return isinstance(other, MPlug) and self._node is other._node and self._attribute == other._attribute
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._node), self._attribute))
+
+
+class MFnDependencyNode(object):
+    """ Function set for any node."""
+
+    def __init__(self, node=None):
+        self._node = None
+        if node is not None:
+            self.setObject(node)
+
+    def setObject(self, node):
+        self._node = node._node if isinstance(node, MObject) else node
+        return self
+
+    def object(self):
+        return MObject(self._node)
+
+    def name(self):
+        return self._node.name
+
+    def absoluteName(self):
+        return ':' + self._node.name
+
+    @property
+    def typeName(self):
+        return self._node.type
+
+    def hasAttribute(self, attribute):
+        return self._node.has_attribute(attribute)
+
+    def findPlug(self, attribute, want_networked_plug=False):
+        if not self._node.has_attribute(attribute):
+            raise RuntimeError('(kInvalidParameter): Cannot find plug {}'.format(attribute))
+        return MPlug(self._node, attribute)
+
+
+class MSelectionList(object):
+    """ List of nodes and plugs added by name."""
+
+    def __init__(self):
+        self._items = []
+
+    def add(self, item):
+        if isinstance(item, MObject):
+            self._items.append((item._node, None))
+            return self
+        node = SCENE.find(item.split('.')[0])
+        attribute = item.partition('.')[2] or None
+        if attribute is not None and not node.has_attribute(attribute):
+            raise RuntimeError('(kInvalidParameter): Object does not exist: {}'.format(item))
+        self._items.append((node, attribute))
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def isEmpty(self):
+        return not self._items
+
+    def clear(self):
+        self._items = []
+
+    def getDependNode(self, index):
+        return MObject(self._items[index][0])
+
+    def getPlug(self, index):
+        node, attribute = self._items[index]
+        if attribute is None:
+            raise TypeError('(kInvalidParameter): Item is not a plug')
+        return MPlug(node, attribute)
+
+
+class MDGModifier(object):
+    """ Queue of DG edits that are done and undone together."""
+
+    def __init__(self):
+        self._operations = []
+        self._done = 0
+        self._records = []
+
+    def createNode(self, node_type):
+        from maya._scene import Node
+
+        node = Node('{}1'.format(node_type), node_type)
+        node.alive = False
+        self._operations.append(('create', node))
+        return MObject(node)
+
+    def renameNode(self, node, name):
+        self._operations.append(('rename', node._node, name))
+
+    def deleteNode(self, node):
+        self._operations.append(('delete', node._node))
+
+    def connect(self, source, destination):
+        self._operations.append(('connect', source, destination))
+
+    def disconnect(self, source, destination):
+        self._operations.append(('disconnect', source, destination))
+
+    def newPlugValueFloat(self, plug, value):
+        self._operations.append(('value', plug, float(value)))
+
+    newPlugValueDouble = newPlugValueFloat
+
+    def newPlugValueInt(self, plug, value):
+        self._operations.append(('value', plug, int(value)))
+
+    def newPlugValueBool(self, plug, value):
+        self._operations.append(('value', plug, bool(value)))
+
+    def doIt(self):
+        for operation in self._operations[self._done:]:
+            self._records.append(self._do(operation))
+        self._done = len(self._operations)
+
+    def undoIt(self):
+        for operation, record in reversed(list(zip(self._operations, self._records))):
+            self._undo(operation, record)
+        self._records = []
+        self._done = 0
+
+    @staticmethod
+    def _do(operation):
+        kind = operation[0]
+
+        if kind == 'create':
+            SCENE.restore_node(operation[1])
+            return None
+
+        if kind == 'rename':
+            previous = operation[1].name
+            SCENE.rename(operation[1], operation[2])
+            return previous
+
+        if kind == 'delete':
+            node = operation[1]
+            links = [(source, source_attribute, node, attribute)
+                     for attribute, (source, source_attribute) in node.inputs.items()]
+            links += [(node, attribute, destination, destination_attribute)
+                      for attribute, destinations in node.outputs.items()
+                      for destination, destination_attribute in destinations]
+            SCENE.delete_node(node)
+            return links
+
+        if kind == 'connect':
+            source, destination = operation[1], operation[2]
+            previous = destination._node.inputs.get(destination._attribute)
+            if previous is not None and previous[0].is_a('unitConversion'):
+                previous = previous[0].inputs.get('input')
+            SCENE.connect(source._node, source._attribute, destination._node, destination._attribute)
+            return previous
+
+        if kind == 'disconnect':
+            source, destination = operation[1], operation[2]
+            SCENE.disconnect(source._node, source._attribute, destination._node, destination._attribute)
+            return None
+
+        plug = operation[1]
+        previous = plug._node.values.get(plug._attribute)
+        SCENE.set_value(plug._node, plug._attribute, operation[2])
+        return previous
+
+    @staticmethod
+    def _undo(operation, record):
+        kind = operation[0]
+
+        if kind == 'create':
+            SCENE.delete_node(operation[1])
+
+        elif kind == 'rename':
+            SCENE.rename(operation[1], record)
+
+        elif kind == 'delete':
+            SCENE.restore_node(operation[1])
+            for source, source_attribute, destination, destination_attribute in record:
+                if destination.inputs.get(destination_attribute) is None:
+                    SCENE.link(source, source_attribute, destination, destination_attribute)
+
+        elif kind == 'connect':
+            source, destination = operation[1], operation[2]
+            current = destination._node.inputs.get(destination._attribute)
+            if current is not None:
+                SCENE.disconnect(current[0], current[1], destination._node, destination._attribute)
+            if record is not None:
+                SCENE.connect(record[0], record[1], destination._node, destination._attribute)
+
+        elif kind == 'disconnect':
+            source, destination = operation[1], operation[2]
+            SCENE.connect(source._node, source._attribute, destination._node, destination._attribute)
+
+        else:
+            plug = operation[1]
+            if record is None:
+                plug._node.values.pop(plug._attribute, None)
+            else:
+                plug._node.values[plug._attribute] = record
+
+
+class MTime(object):
+    """ Time value with a unit."""
+
+    kInvalid = 0
+    kHours = 1
+    kMinutes = 2
+    kSeconds = 3
+    kMilliseconds = 4
+    kGames = 5
+    kFilm = 6
+    kPALFrame = 7
+    kNTSCFrame = 8
+    kShowScan = 9
+    kPALField = 10
+    kNTSCField = 11
+
+    # Units per second.
+    RATES = {kHours: 1.0 / 3600.0, kMinutes: 1.0 / 60.0, kSeconds: 1.0, kMilliseconds: 1000.0, kGames: 15.0,
+             kFilm: 24.0, kPALFrame: 25.0, kNTSCFrame: 30.0, kShowScan: 48.0, kPALField: 50.0, kNTSCField: 60.0}
+    NAMES = {'game': kGames, 'film': kFilm, 'pal': kPALFrame, 'ntsc': kNTSCFrame, 'show': kShowScan,
+             'palf': kPALField, 'ntscf': kNTSCField}
+
+    def __init__(self, value=0.0, unit=None):
+        self.unit = MTime.uiUnit() if unit is None else unit
+        self.value = float(value)
+
+    def asUnits(self, unit):
+        return self.value / MTime.RATES[self.unit] * MTime.RATES[unit]
+
+    @staticmethod
+    def uiUnit():
+        return MTime.NAMES.get(SCENE.time_unit, MTime.kFilm)
+
+
+class MTimeArray(list):
+    pass
+
+
+class MDoubleArray(list):
+    pass
+
+
+class MAngle(object):
+    """ Angle value with a unit."""
+
+    kInvalid = 0
+    kRadians = 1
+    kDegrees = 2
+
+    def __init__(self, value=0.0, unit=kRadians):
+        self.unit = unit
+        self.value = float(value)
+
+    def asRadians(self):
+        import math
+        return self.value if self.unit == MAngle.kRadians else math.radians(self.value)
+
+    def asDegrees(self):
+        import math
+        return self.value if self.unit == MAngle.kDegrees else math.degrees(self.value)
+
+    @staticmethod
+    def uiUnit():
+        return MAngle.kDegrees
+
+
+class MDistance(object):
+    """ Distance value with a unit, the fake scene works in centimeters."""
+
+    kInvalid = 0
+    kCentimeters = 6
+
+    def __init__(self, value=0.0, unit=kCentimeters):
+        self.unit = unit
+        self.value = float(value)
+
+    def asCentimeters(self):
+        return self.value
+
+    @staticmethod
+    def uiUnit():
+        return MDistance.kCentimeters
+
+
+class MGlobal(object):
+
+    @staticmethod
+    def displayError(message):
+        SCENE.warnings.append(message)
+
+    displayWarning = displayError
+
+    @staticmethod
+    def displayInfo(message):
+        pass
+
+
+class MMessage(object):
+
+    @staticmethod
+    def removeCallback(callback_id):
+        SCENE.remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            SCENE.remove_callback(callback_id)
+
+
+class MDGMessage(MMessage):
+
+    @staticmethod
+    def addConnectionCallback(function, client_data=None):
+        return SCENE.add_callback('connection', function)
+
+    @staticmethod
+    def addNodeRemovedCallback(function, node_type='dependNode', client_data=None):
+        return SCENE.add_callback('nodeRemoved', function, node_type=node_type)
+
+
+class MNodeMessage(MMessage):
+    kConnectionMade = 1
+    kConnectionBroken = 2
+    kAttributeEval = 4
+    kAttributeSet = 8
+    kAttributeArrayAdded = 4096
+    kAttributeArrayRemoved = 8192
+
+    @staticmethod
+    def addNameChangedCallback(node, function, client_data=None):
+        return SCENE.add_callback('nameChanged', function, node=None if node.isNull() else node._node)
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, client_data=None):
+        return SCENE.add_callback('attributeChanged', function, node=node._node)
+
+    @staticmethod
+    def addNodePreRemovalCallback(node, function, client_data=None):
+        return SCENE.add_callback('nodePreRemoval', function, node=node._node)
+
+
+class MEventMessage(MMessage):
+
+    @staticmethod
+    def addEventCallback(event, function, client_data=None):
+        return SCENE.add_callback(event, function)
+
+
+class MSceneMessage(MMessage):
+    kBeforeNew = 'beforeNew'
+    kBeforeOpen = 'beforeOpen'
+
+    @staticmethod
+    def addCallback(message, function, client_data=None):
+        return SCENE.add_callback(message, function)
+
+
+# Plug-ins
+
+class MTypeId(object):
+    """ Id of a plug-in node type."""
+
+    def __init__(self, type_id=0):
+        self._id = type_id
+
+    def id(self):
+        return self._id
+
+
+class MFnNumericData(object):
+    kBoolean = 1
+    kInt = 7
+    kFloat = 11
+    kDouble = 12
+
+
+class MFnAttribute(object):
+    """ Function set for attributes, which are plain names here as the scene knows every attribute already."""
+
+    def __init__(self, attribute=None):
+        self.name = attribute
+        self.writable = True
+        self.storable = True
+        self.readable = True
+        self.keyable = False
+        self.channelBox = False
+        self.array = False
+        self.usesArrayDataBuilder = False
+
+
+class MFnNumericAttribute(MFnAttribute):
+
+    def create(self, long_name, short_name, data_type=None, default=0.0):
+        self.__init__(long_name)
+        return long_name
+
+    def setMin(self, value):
+        pass
+
+    def setMax(self, value):
+        pass
+
+
+class MFnCompoundAttribute(MFnAttribute):
+
+    def create(self, long_name, short_name):
+        self.__init__(long_name)
+        return long_name
+
+    def addChild(self, attribute):
+        pass
+
+
+class MPxNode(object):
+    """ Base of plug-in nodes. Nodes made in tests aren't in the scene until they're given one with _bind."""
+
+    kDefaultScheduling = 0
+    kParallel = 1
+    kSerial = 2
+    kGloballySerial = 3
+    kUntrusted = 4
+
+    def __init__(self):
+        self._object = MObject()
+
+    def _bind(self, node):
+        self._object = MObject(node)
+        return self
+
+    def thisMObject(self):
+        return self._object
+
+    def connectionMade(self, plug, other_plug, as_source):
+        return None
+
+    def connectionBroken(self, plug, other_plug, as_source):
+        return None
+
+    def schedulingType(self):
+        return MPxNode.kDefaultScheduling
+
+    @staticmethod
+    def addAttribute(attribute):
+        pass
+
+    @staticmethod
+    def attributeAffects(attribute, affected):
+        pass
+
+
+class MPxCommand(object):
+    """ Base of plug-in commands."""
+
+    def __init__(self):
+        pass
@@ -0,0 +1,187 @@
+""" Fake maya.api.OpenMayaAnim
+
+Animation curve function set and curve changes over the in memory scene. Values cross the API in Maya's internal
+units, seconds for time curves and radians for angle curves, and are kept in frames and degrees in the scene.
+"""
+
+# Python
+import math
+
+from maya._scene import SCENE
+from maya.api.OpenMaya import MAngle, MObject, MPlug, MTime
+
+
+class MAnimCurveChange(object):
+    """ Records curve edits so they can be undone."""
+
+    def __init__(self):
+        self._before = {}
+        self._after = {}
+
+    def _record(self, node):
+        if node not in self._before:
+            self._before[node] = dict((time, key.copy()) for time, key in node.keys.items())
+
+    def undoIt(self):
+        for node, keys in self._before.items():
+            self._after[node] = dict((time, key.copy()) for time, key in node.keys.items())
+            node.keys = dict((time, key.copy()) for time, key in keys.items())
+            node.curve = None
+
+    def redoIt(self):
+        for node, keys in self._after.items():
+            node.keys = dict((time, key.copy()) for time, key in keys.items())
+            node.curve = None
+
+
+class MFnAnimCurve(object):
+    """ Function set for animCurve nodes."""
+
+    kAnimCurveTA = 0
+    kAnimCurveTL = 1
+    kAnimCurveTT = 2
+    kAnimCurveTU = 3
+    kAnimCurveUnknown = 8
+
+    kTangentGlobal = 0
+    kTangentFixed = 1
+    kTangentLinear = 2
+    kTangentFlat = 3
+    kTangentSmooth = 4
+    kTangentStep = 5
+    kTangentClamped = 8
+    kTangentPlateau = 9
+    kTangentStepNext = 10
+    kTangentAuto = 11
+
+    kConstant = 0
+    kLinear = 1
+    kCycle = 3
+    kCycleRelative = 4
+    kOscillate = 5
+
+    CURVE_TYPES = {'animCurveTA': kAnimCurveTA, 'animCurveTL': kAnimCurveTL, 'animCurveTT': kAnimCurveTT,
+                   'animCurveTU': kAnimCurveTU}
+    TANGENT_NAMES = {kTangentGlobal: 'auto', kTangentFixed: 'fixed', kTangentLinear: 'linear', kTangentFlat: 'flat',
+                     kTangentSmooth: 'spline', kTangentStep: 'step', kTangentClamped: 'clamped',
+                     kTangentPlateau: 'plateau', kTangentStepNext: 'stepnext', kTangentAuto: 'auto'}
+    TANGENT_TYPES = dict((name, tangent) for tangent, name in TANGENT_NAMES.items())
+
+    def __init__(self, node=None):
+        self._node = node._node if isinstance(node, (MObject, MPlug)) else node
+
+    def name(self):
+        return self._node.name
+
+    def findPlug(self, attribute, want_networked_plug=False):
+        return MPlug(self._node, attribute)
+
+    @property
+    def animCurveType(self):
+        return self.CURVE_TYPES.get(self._node.type, self.kAnimCurveUnknown)
+
+    @property
+    def numKeys(self):
+        return len(self._node.keys)
+
+    def _scale(self):
+        """ Internal units per scene unit of the curve's values."""
+        if self._node.type == 'animCurveTT':
+            return MTime(1.0).asUnits(MTime.kSeconds)
+        if self._node.type == 'animCurveTA':
+            return math.radians(1.0)
+        return 1.0
+
+    def _key(self, index):
+        return self._node.keys[SCENE.key_times(self._node)[index]]
+
+    def input(self, index):
+        return MTime(SCENE.key_times(self._node)[index])
+
+    def value(self, index):
+        return self._key(index).value * self._scale()
+
+    def evaluate(self, time):
+        return SCENE.evaluate_curve(self._node, time.asUnits(MTime.uiUnit())) * self._scale()
+
+    def addKeys(self, times, values, in_tangent=kTangentGlobal, out_tangent=kTangentGlobal,
+                keep_existing_keys=False, change=None):
+        if change is not None:
+            change._record(self._node)
+        if not keep_existing_keys:
+            self._node.keys = {}
+        scale = self._scale()
+        for time, value in zip(times, values):
+            SCENE.set_key(self._node, time.asUnits(MTime.uiUnit()), value / scale,
+                          self.TANGENT_NAMES[in_tangent], self.TANGENT_NAMES[out_tangent])
+
+    def addKey(self, time, value, in_tangent=kTangentGlobal, out_tangent=kTangentGlobal, change=None):
+        self.addKeys([time], [value], in_tangent, out_tangent, True, change)
+
+    def remove(self, index, change=None):
+        if change is not None:
+            change._record(self._node)
+        del self._node.keys[SCENE.key_times(self._node)[index]]
+        self._node.curve = None
+
+    def setInput(self, index, time, change=None):
+        if change is not None:
+            change._record(self._node)
+        times = SCENE.key_times(self._node)
+        key = self._node.keys.pop(times[index])
+        self._node.keys[time.asUnits(MTime.uiUnit())] = key
+        self._node.curve = None
+
+    def setValue(self, index, value, change=None):
+        if change is not None:
+            change._record(self._node)
+        self._key(index).value = value / self._scale()
+        self._node.curve = None
+
+    def inTangentType(self, index):
+        return self.TANGENT_TYPES.get(self._key(index).in_type, self.kTangentAuto)
+
+    def outTangentType(self, index):
+        return self.TANGENT_TYPES.get(self._key(index).out_type, self.kTangentAuto)
+
+    def getTangentAngleWeight(self, index, is_in_tangent):
+        in_angles, out_angles = SCENE.tangent_angles(self._node)
+        key = self._key(index)
+        angle = in_angles[index] if is_in_tangent else out_angles[index]
+        return MAngle(math.radians(angle)), key.in_weight if is_in_tangent else key.out_weight
+
+    def setTangent(self, index, angle, weight, is_in_tangent, change=None, *args):
+        if change is not None:
+            change._record(self._node)
+
+        # Locked tangents move both sides together.
+        key = self._key(index)
+        if is_in_tangent or key.locked:
+            key.in_type = 'fixed'
+            key.in_angle = angle.asDegrees()
+            key.in_weight = weight
+        if not is_in_tangent or key.locked:
+            key.out_type = 'fixed'
+            key.out_angle = angle.asDegrees()
+            key.out_weight = weight
+        self._node.curve = None
+
+    def setTangentsLocked(self, index, locked, change=None):
+        if change is not None:
+            change._record(self._node)
+        self._key(index).locked = locked
+
+
+class MAnimControl(object):
+
+    @staticmethod
+    def minTime():
+        return MTime(SCENE.min_time)
+
+    @staticmethod
+    def maxTime():
+        return MTime(SCENE.max_time)
+
+    @staticmethod
+    def currentTime():
+        return MTime(SCENE.time)
@@ -0,0 +1 @@
+""" Fake Maya Python API 2.0"""
@@ -0,0 +1,424 @@
+""" Fake maya.cmds
+
+The commands timeWarp uses, working on the in memory scene. Flags follow Maya's long names, only the flags timeWarp
+passes are understood.
+"""
+
+# Python
+import sys
+
+from maya._scene import SCENE, normalize
+
+
+def _names(objects):
+    """ Flatten command arguments to a list of names."""
+    names = []
+    for item in objects:
+        if item is None:
+            continue
+        if isinstance(item, (list, tuple)):
+            names.extend(_names(item))
+        else:
+            names.append(item)
+    return names
+
+
+def _target(name, attribute=None):
+    """ Split a command target into node and attribute, the attribute may be given by flag."""
+    if '.' in name:
+        return SCENE.split(name)
+    return SCENE.find(name), normalize(attribute) if attribute else None
+
+
+def _plug_name(node, attribute):
+    return '{}.{}'.format(node.name, attribute)
+
+
+def _time_range(time):
+    """ Turn a time flag into a range."""
+    if time is None:
+        return None
+    if isinstance(time, (list, tuple)):
+        if len(time) == 1:
+            time = time[0]
+        else:
+            return float(time[0]), float(time[1])
+    if isinstance(time, (list, tuple)):
+        return float(time[0]), float(time[-1])
+    return float(time), float(time)
+
+
+# Nodes
+
+def createNode(node_type, name=None, parent=None, skipSelect=True, **kwargs):
+    parent_node = SCENE.find(parent) if parent else None
+    return SCENE.create_node(node_type, name=name, parent=parent_node).name
+
+
+def spaceLocator(name=None, **kwargs):
+    transform = SCENE.create_node('transform', name=name or 'locator1')
+    SCENE.create_node('locator', name='{}Shape'.format(transform.name), parent=transform)
+    return [transform.name]
+
+
+def delete(*objects, **kwargs):
+    nodes = [SCENE.find(name.split('.')[0], required=False) for name in _names(objects)]
+    SCENE.record(*SCENE.delete_nodes([node for node in nodes if node is not None]), name='delete')
+
+
+def rename(name, new_name, **kwargs):
+    return SCENE.rename(SCENE.find(name), new_name)
+
+
+def objExists(name):
+    node = SCENE.find(name.split('.')[0], required=False)
+    if node is None:
+        return False
+    if '.' in name:
+        return node.has_attribute(name.partition('.')[2])
+    return True
+
+
+def nodeType(name, **kwargs):
+    return SCENE.find(name.split('.')[0]).type
+
+
+def objectType(name, isAType=None, isType=None, **kwargs):
+    node = SCENE.find(name)
+    if isAType:
+        return node.is_a(isAType)
+    if isType:
+        return node.type == isType
+    return node.type
+
+
+def ls(*objects, **kwargs):
+    names = _names(objects) or None
+    if kwargs.get('selection') or kwargs.get('sl'):
+        selected = [node.name for node in SCENE.selection]
+        names = [name for name in names if name in selected] if names else selected
+        if not names:
+            return []
+
+    nodes = SCENE.ls(names, node_type=kwargs.get('type'), dag=kwargs.get('dag', False))
+    long_names = kwargs.get('long') or kwargs.get('l')
+
+    result = []
+    for node in nodes:
+        result.append(node.path() if long_names else node.name)
+        if kwargs.get('showType') or kwargs.get('st'):
+            result.append(node.type)
+    return result
+
+
+def select(*objects, **kwargs):
+    if kwargs.get('clear') or kwargs.get('cl'):
+        SCENE.selection = []
+        return
+    nodes = SCENE.ls(_names(objects))
+    if kwargs.get('add'):
+        SCENE.selection.extend(node for node in nodes if node not in SCENE.selection)
+    elif kwargs.get('deselect') or kwargs.get('d'):
+        SCENE.selection = [node for node in SCENE.selection if node not in nodes]
+    else:
+        SCENE.selection = nodes
+
+
+# Attributes
+
+def attributeQuery(attribute, node=None, exists=False, **kwargs):
+    target = SCENE.find(node, required=False)
+    return bool(target is not None and target.has_attribute(attribute))
+
+
+def getAttr(plug, time=None, multiIndices=False, **kwargs):
+    node, attribute = SCENE.split(plug)
+    if multiIndices or kwargs.get('mi'):
+        return SCENE.indices(node, attribute) or None
+    return SCENE.get_value(node, attribute, time=time)
+
+
+def setAttr(plug, *values, **kwargs):
+    node, attribute = SCENE.split(plug)
+    SCENE.set_value(node, attribute, values[0] if len(values) == 1 else values)
+
+
+def removeMultiInstance(plug, b=False, **kwargs):
+    node, attribute = SCENE.split(plug)
+    for this_plug, other_plug in SCENE.connections(node, attribute):
+        if this_plug[1] in this_plug[0].inputs and this_plug[0].inputs[this_plug[1]] == other_plug:
+            SCENE.disconnect(other_plug[0], other_plug[1], this_plug[0], this_plug[1])
+        else:
+            SCENE.disconnect(this_plug[0], this_plug[1], other_plug[0], other_plug[1])
+    for name in [name for name in node.values if name == attribute or name.startswith(attribute + '.')]:
+        del node.values[name]
+
+
+def connectAttr(source, destination, force=False, **kwargs):
+    source_node, source_attribute = SCENE.split(source)
+    destination_node, destination_attribute = SCENE.split(destination)
+    SCENE.connect(source_node, source_attribute, destination_node, destination_attribute, force=force or
+                  kwargs.get('f', False))
+    return '{} -> {}'.format(source, destination)
+
+
+def disconnectAttr(source, destination, **kwargs):
+    source_node, source_attribute = SCENE.split(source)
+    destination_node, destination_attribute = SCENE.split(destination)
+    SCENE.disconnect(source_node, source_attribute, destination_node, destination_attribute)
+
+
+def listConnections(*objects, **kwargs):
+    source = kwargs.get('source', kwargs.get('s', True))
+    destination = kwargs.get('destination', kwargs.get('d', True))
+    skip_conversion = kwargs.get('skipConversionNodes', kwargs.get('scn', False))
+    node_type = kwargs.get('type', kwargs.get('t'))
+    plugs = kwargs.get('plugs', kwargs.get('p', False))
+    connections = kwargs.get('connections', kwargs.get('c', False))
+
+    result = []
+    for name in _names(objects):
+        node, attribute = _target(name)
+        for (this, this_attribute), (other, other_attribute) in SCENE.connections(
+                node, attribute, source=source, destination=destination, skip_conversion=skip_conversion):
+            if node_type and not other.is_a(node_type):
+                continue
+            if connections:
+                result.append(_plug_name(this, this_attribute))
+            result.append(_plug_name(other, other_attribute) if plugs else other.name)
+
+    return result or None
+
+
+# Animation
+
+def setKeyframe(*objects, **kwargs):
+    attribute = kwargs.get('attribute', kwargs.get('at'))
+    time = kwargs.get('time', kwargs.get('t'))
+    value = kwargs.get('value', kwargs.get('v'))
+    in_type = kwargs.get('inTangentType', kwargs.get('itt'))
+    out_type = kwargs.get('outTangentType', kwargs.get('ott'))
+
+    time = SCENE.time if time is None else _time_range(time)[0]
+
+    count = 0
+    for name in _names(objects) or [node.name for node in SCENE.selection]:
+        node, target_attribute = _target(name, attribute)
+        curve_node = SCENE.keyed_curve(node, target_attribute, create=not node.is_a('animCurve'))
+        key_value = value
+        if key_value is None:
+            key_value = SCENE.get_value(node, target_attribute or 'output', time=time)
+        SCENE.set_key(curve_node, time, key_value, in_type, out_type)
+        count += 1
+
+    return count
+
+
+def _curves(objects, attribute=None):
+    curves = []
+    for name in _names(objects):
+        node, target_attribute = _target(name, attribute)
+        if node.is_a('animCurve'):
+            curves.append(node)
+        elif target_attribute:
+            curve_node = SCENE.keyed_curve(node, target_attribute)
+            if curve_node is not None:
+                curves.append(curve_node)
+        else:
+            curves.extend(other for _, (other, _) in SCENE.connections(node, source=True, destination=False,
+                                                                       skip_conversion=True)
+                          if other.is_a('animCurve'))
+    return curves
+
+
+def keyframe(*objects, **kwargs):
+    time_range = _time_range(kwargs.get('time', kwargs.get('t')))
+    result = []
+    for curve_node in _curves(objects, kwargs.get('attribute', kwargs.get('at'))):
+        times = SCENE.key_times(curve_node, time_range)
+        if kwargs.get('keyframeCount') or kwargs.get('kc'):
+            result.append(len(times))
+        elif kwargs.get('valueChange') or kwargs.get('vc'):
+            result.extend(curve_node.keys[time].value for time in times)
+        else:
+            result.extend(times)
+
+    if kwargs.get('keyframeCount') or kwargs.get('kc'):
+        return sum(result)
+    return result or None
+
+
+def keyTangent(*objects, **kwargs):
+    query = kwargs.get('query') or kwargs.get('q')
+    weighted = kwargs.get('weightedTangents', kwargs.get('wt'))
+    result = []
+    for curve_node in _curves(objects, kwargs.get('attribute', kwargs.get('at'))):
+        times = SCENE.key_times(curve_node)
+        if weighted is not None:
+            # Weights aren't evaluated, curves only remember being weighted.
+            if query:
+                result.append(bool(SCENE.get_value(curve_node, 'weightedTangents')))
+            else:
+                SCENE.set_value(curve_node, 'weightedTangents', bool(weighted))
+        elif kwargs.get('inAngle') or kwargs.get('outAngle'):
+            in_angles, out_angles = SCENE.tangent_angles(curve_node)
+            result.extend(in_angles if kwargs.get('inAngle') else out_angles)
+        elif kwargs.get('inTangentType'):
+            result.extend(curve_node.keys[time].in_type for time in times)
+        elif kwargs.get('outTangentType'):
+            result.extend(curve_node.keys[time].out_type for time in times)
+    return result or None
+
+
+def cutKey(*objects, **kwargs):
+    time_range = _time_range(kwargs.get('time', kwargs.get('t')))
+    count = 0
+    for curve_node in _curves(objects, kwargs.get('attribute', kwargs.get('at'))):
+        for time in SCENE.key_times(curve_node, time_range):
+            del curve_node.keys[time]
+            count += 1
+        curve_node.curve = None
+    return count
+
+
+def bakeResults(*objects, **kwargs):
+    start, end = _time_range(kwargs.get('time', kwargs.get('t')))
+    step = float(kwargs.get('sampleBy', kwargs.get('sb', 1)))
+    frames = []
+    frame = start
+    while frame <= end + 1e-9:
+        frames.append(frame)
+        frame += step
+
+    plugs = [SCENE.split(name) for name in _names(objects)]
+
+    # Every value is sampled before any key changes, like stepping the timeline once.
+    samples = [[SCENE.get_value(node, attribute, time=frame) for frame in frames] for node, attribute in plugs]
+
+    from maya.api.OpenMayaAnim import MAnimCurveChange
+
+    change = MAnimCurveChange()
+    for (node, attribute), values in zip(plugs, samples):
+        curve_node = SCENE.keyed_curve(node, attribute, create=True)
+        change._record(curve_node)
+        for time in SCENE.key_times(curve_node, (start, end)):
+            del curve_node.keys[time]
+        for frame, value in zip(frames, values):
+            SCENE.set_key(curve_node, frame, value)
+
+    SCENE.record(change.undoIt, change.redoIt, name='bakeResults')
+    return len(plugs)
+
+
+# Time
+
+def playbackOptions(**kwargs):
+    flags = (('minTime', 'min', 'min_time'), ('maxTime', 'max', 'max_time'),
+             ('animationStartTime', 'ast', 'animation_start'), ('animationEndTime', 'aet', 'animation_end'))
+    if kwargs.get('query') or kwargs.get('q'):
+        for long_name, short_name, attribute in flags:
+            if kwargs.get(long_name) or kwargs.get(short_name):
+                return getattr(SCENE, attribute)
+        return None
+    for long_name, short_name, attribute in flags:
+        value = kwargs.get(long_name, kwargs.get(short_name))
+        if value is not None and not isinstance(value, bool):
+            setattr(SCENE, attribute, float(value))
+
+
+def currentTime(*time, **kwargs):
+    if kwargs.get('query') or kwargs.get('q'):
+        return SCENE.time
+    SCENE.time = float(time[0] if time else kwargs.get('time', SCENE.time))
+    return SCENE.time
+
+
+def currentUnit(**kwargs):
+    if kwargs.get('query') or kwargs.get('q'):
+        return SCENE.time_unit if kwargs.get('time') else 'cm'
+    if isinstance(kwargs.get('time'), str):
+        SCENE.time_unit = kwargs['time']
+
+
+# Session
+
+def undoInfo(**kwargs):
+    if kwargs.get('query') or kwargs.get('q'):
+        if kwargs.get('undoName') or kwargs.get('un'):
+            return SCENE.undo_stack[-1][2] if SCENE.undo_stack else ''
+        return True
+    if kwargs.get('openChunk'):
+        SCENE.open_chunk(kwargs.get('chunkName', kwargs.get('cn', '')))
+    if kwargs.get('closeChunk'):
+        SCENE.close_chunk()
+    return None
+
+
+def timeWarpCommit():
+    """ Stand in for the WarpStatus plug-in's commit command."""
+    from timeWarp.scripts import undo as warp_undo
+
+    SCENE.record(*warp_undo.pop(), name='timeWarpCommit')
+
+
+def undo(**kwargs):
+    if SCENE.undo_stack:
+        entry = SCENE.undo_stack.pop()
+        entry[0]()
+        SCENE.redo_stack.append(entry)
+        SCENE.fire('Undo')
+
+
+def redo(**kwargs):
+    if SCENE.redo_stack:
+        entry = SCENE.redo_stack.pop()
+        entry[1]()
+        SCENE.undo_stack.append(entry)
+        SCENE.fire('Redo')
+
+
+def flushUndo():
+    SCENE.undo_stack = []
+    SCENE.redo_stack = []
+
+
+def progressBar(name=None, **kwargs):
+    if kwargs.get('query') or kwargs.get('q'):
+        return False
+    return name
+
+
+def about(**kwargs):
+    if kwargs.get('batch'):
+        return True
+    if kwargs.get('version') or kwargs.get('v'):
+        return '2024'
+    return ''
+
+
+def warning(message, **kwargs):
+    SCENE.warnings.append(message)
+    sys.stderr.write('Warning: {}\n'.format(message))
+
+
+def evaluationManager(**kwargs):
+    if kwargs.get('query') or kwargs.get('q'):
+        return [SCENE.evaluation_mode]
+    if kwargs.get('mode'):
+        SCENE.evaluation_mode = kwargs['mode']
+    return None
+
+
+def file(*path, **kwargs):
+    if kwargs.get('new') or kwargs.get('newFile'):
+        SCENE.fire('beforeNew')
+        SCENE.reset()
+    return ''
+
+
+def loadPlugin(*paths, **kwargs):
+    return ['WarpStatus']
+
+
+def pluginInfo(*names, **kwargs):
+    return True
@@ -0,0 +1,10 @@
+""" Fake maya.mel"""
+
+
+def eval(command):
+    """ Only the global UI variables timeWarp reads are known."""
+    if '$gMainProgressBar' in command:
+        return 'MainProgressBar'
+    if '$gMainWindow' in command:
+        return 'MayaWindow'
+    return ''
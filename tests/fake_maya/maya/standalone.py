@@ -0,0 +1,9 @@
+""" Fake maya.standalone"""
+
+
+def initialize(name='python'):
+    pass
+
+
+def uninitialize():
+    pass
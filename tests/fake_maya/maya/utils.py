@@ -0,0 +1,13 @@
+""" Fake maya.utils"""
+
+
+def executeDeferred(function, *args, **kwargs):
+    """ There is no idle queue in batch, so deferred calls run straight away like in mayapy."""
+    if isinstance(function, str):
+        exec(function, {})
+        return None
+    return function(*args, **kwargs)
+
+
+def executeInMainThreadWithResult(function, *args, **kwargs):
+    return function(*args, **kwargs)
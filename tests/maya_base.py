@@ -14,8 +14,19 @@ base_path = os.path.join(tests_path.rsplit(os.sep, 2)[0], 'scripts', 'python')
 if base_path not in sys.path:
     sys.path.insert(0, base_path)
 
+# Add the folder holding the timeWarp package to system paths, so tests can import timeWarp.
+package_base_path = os.path.dirname(os.path.dirname(tests_path))
+if package_base_path not in sys.path:
+    sys.path.insert(0, package_base_path)
+
+# Fall back to the in memory fake when Maya isn't available.
+try:
+    import maya.standalone
+except ImportError:
+    sys.path.insert(0, os.path.join(tests_path, 'fake_maya'))
+    import maya.standalone
+
 # Initialize Maya - otherwise tests run before Maya is actually ready!
-import maya.standalone
 maya.standalone.initialize()
 import maya.cmds
 
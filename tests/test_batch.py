@@ -0,0 +1,144 @@
+""" Time Warp Batch Tests"""
+
+# python
+import os
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import maya_base
+import maya.cmds
+
+from timeWarp.scripts import batch
+from timeWarp.scripts import core
+
+PLUGIN_PATH = os.path.join(os.path.dirname(maya_base.tests_path), 'plug-ins', 'WarpStatus.py')
+
+
+class TestBatchBase(maya_base.TestMayaBase):
+    """ Scene with two keyed locators and a warp."""
+
+    @classmethod
+    def setUpClass(cls):
+        maya.cmds.loadPlugin(PLUGIN_PATH, quiet=True)
+
+    def setUp(self):
+        self.new_scene()
+        maya.cmds.undoInfo(state=True, infinity=True)
+        maya.cmds.playbackOptions(minTime=1, maxTime=100)
+
+        self.locators = []
+        for name in ('firstLoc', 'secondLoc'):
+            locator = maya.cmds.spaceLocator(name=name)[0]
+            for frame, value in ((1, 0.0), (30, 4.0), (70, -2.0), (100, 10.0)):
+                maya.cmds.setKeyframe(locator, attribute='translateX', time=frame, value=value)
+            self.locators.append(locator)
+
+        self.warp = core.create_warp(warp_name='batchWarp')
+
+
+class TestApplySpec(TestBatchBase):
+    """ Applying warps from specs."""
+
+    def test_apply_spec(self):
+        """ Nodes are warped through the main output and members through their member outputs."""
+        counts = batch.apply_spec(self.warp, {'nodes': [self.locators[0]],
+                                              'members': {'0': {'nodes': [self.locators[1]], 'offset': 5.0}}})
+
+        self.assertEqual(counts, {'added': 2, 'present': 0})
+        self.assertEqual(sorted(core.get_warped_nodes(self.warp)), sorted(self.locators))
+
+    def test_apply_spec_empty(self):
+        """ Specs without nodes warp nothing, rather than selecting and walking every node in the scene."""
+        maya.cmds.select(clear=True)
+        counts = batch.apply_spec(self.warp, {'nodes': [], 'members': {'0': {'nodes': []}}})
+
+        self.assertEqual(counts, {'added': 0, 'present': 0})
+        self.assertEqual(core.get_warped_nodes(self.warp), [])
+        self.assertEqual(maya.cmds.ls(selection=True), [])
+
+
+class TestAudit(TestBatchBase):
+    """ Reporting the warps in a scene."""
+
+    def test_audit(self):
+        """ Warps and warp stacks are both reported with the curves and nodes they drive."""
+        stack = core.create_stack(stack_name='batchStack', warp_curves=[core.get_warp_curve(self.warp)[0]])
+        batch.apply_spec(self.warp, {'nodes': [self.locators[0]]})
+        batch.apply_spec(stack, {'nodes': [self.locators[1]]})
+
+        report = batch.audit()
+
+        self.assertEqual(sorted(report), sorted([self.warp, stack]))
+        self.assertEqual(report[self.warp]['type'], 'WarpStatus')
+        self.assertEqual(report[stack]['type'], 'WarpStack')
+        for node in (self.warp, stack):
+            self.assertEqual((report[node]['curves'], report[node]['members'], report[node]['nodes']), (1, 0, 1))
+
+
+class TestPartition(TestBatchBase):
+    """ Partitioned bakes of a single warp."""
+
+    def test_partition_curves(self):
+        """ Every curve lands in exactly one partition, with the curves of each node kept together."""
+        curve_plugs = dict(('node{}'.format(node), dict(('curve{}_{}'.format(node, index), 'node{}.attr{}'.format(
+            node, index)) for index in range(node + 1))) for node in range(7))
+
+        for count in (1, 3, 7, 20):
+            partitions = batch.partition_curves(curve_plugs, count)
+
+            self.assertEqual(len(partitions), min(count, len(curve_plugs)))
+            self.assertEqual(sorted(curve for partition in partitions for curve in partition),
+                             sorted(curve for curves in curve_plugs.values() for curve in curves))
+            for curves in curve_plugs.values():
+                self.assertEqual(sum(1 for partition in partitions if set(curves) & set(partition)), 1)
+
+    @unittest.skipIf(numpy is None, "Workers read back baked curves with WarpCurve, which needs NumPy.")
+    def test_bake_partitioned(self):
+        """ Merged partitions play what the warp did, and keep the keys outside the baked range."""
+        maya.cmds.setKeyframe(core.get_warp_curve(self.warp)[0], time=50, value=30)
+        for locator in self.locators:
+            maya.cmds.setKeyframe(locator, attribute='translateX', time=150, value=20.0)
+        batch.apply_spec(self.warp, {'nodes': self.locators})
+
+        frames = [float(frame) for frame in range(1, 101)]
+        expected = [[maya.cmds.getAttr(locator + '.translateX', time=frame) for frame in frames]
+                    for locator in self.locators]
+
+        # Workers bake in this session instead of mayapy processes, undoing the bake like a separate scene would.
+        def run_process(mayapy, operation, scene, worker_argv):
+            maya.cmds.undoInfo(openChunk=True)
+            try:
+                keys = batch.bake_partition(worker_argv[worker_argv.index('--partition') + 1])
+            finally:
+                maya.cmds.undoInfo(closeChunk=True)
+            maya.cmds.undo()
+            return {'status': 'ok', 'result': keys}
+
+        self.patch('run_process', run_process)
+        self.patch('map_threads', lambda function, items, workers: [function(item) for item in items])
+
+        self.assertTrue(batch.bake_partitioned(self.warp, workers=2, mayapy='mayapy'))
+
+        self.assertFalse(maya.cmds.objExists(self.warp))
+        for locator, values in zip(self.locators, expected):
+            baked = [maya.cmds.getAttr(locator + '.translateX', time=frame) for frame in frames]
+            numpy.testing.assert_allclose(baked, values, atol=1e-6)
+            self.assertEqual(maya.cmds.keyframe(locator + '.translateX', query=True, time=(150, 150),
+                                                valueChange=True), [20.0])
+
+    def patch(self, name, function):
+        """ Replace a batch function for the rest of the test.
+
+        Args:
+            name (str): Name of batch function.
+            function (callable): Replacement.
+
+        Returns:
+            None
+        """
+        self.addCleanup(setattr, batch, name, getattr(batch, name))
+        setattr(batch, name, function)
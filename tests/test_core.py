@@ -0,0 +1,611 @@
+""" Time Warp Core Tests"""
+
+# python
+import os
+import sys
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import maya_base
+import maya.cmds
+
+from timeWarp.scripts import core
+from timeWarp.scripts import counter
+
+PLUGIN_PATH = os.path.join(os.path.dirname(maya_base.tests_path), 'plug-ins', 'WarpStatus.py')
+
+# Frames the warped values are checked at, between keys as well as on them.
+FRAMES = [1.0, 12.5, 25.0, 40.0, 50.0, 63.25, 80.0, 100.0]
+
+
+class TestCoreBase(maya_base.TestMayaBase):
+    """ Scene with a keyed locator and a warp that slows the first half down."""
+
+    @classmethod
+    def setUpClass(cls):
+        maya.cmds.loadPlugin(PLUGIN_PATH, quiet=True)
+
+    def setUp(self):
+        self.new_scene()
+        maya.cmds.undoInfo(state=True, infinity=True)
+        maya.cmds.playbackOptions(minTime=1, maxTime=100)
+
+        self.locator = maya.cmds.spaceLocator(name='warpedLoc')[0]
+        for frame, value in ((1, 0.0), (30, 4.0), (70, -2.0), (100, 10.0)):
+            maya.cmds.setKeyframe(self.locator, attribute='translateX', time=frame, value=value)
+
+        self.source = [self.get_value(frame) for frame in FRAMES]
+
+        self.warp = core.create_warp(warp_name='testWarp')
+        self.warp_curve = core.get_warp_curve(self.warp)[0]
+        maya.cmds.setKeyframe(self.warp_curve, time=50, value=30)
+
+    def get_value(self, frame):
+        """ Value of the locator's translateX at a frame.
+
+        Args:
+            frame (float): Frame to evaluate.
+
+        Returns:
+            float of value.
+        """
+        return maya.cmds.getAttr('{}.translateX'.format(self.locator), time=frame)
+
+    def get_values(self):
+        """ Values of the locator's translateX at every checked frame.
+
+        Returns:
+            list of values.
+        """
+        return [self.get_value(frame) for frame in FRAMES]
+
+    def get_expected(self, offset=0.0, scale=1.0):
+        """ Values the locator plays through the warp, its source curve at the warp's time. Only valid before the
+        warp is applied, as applying it drives the source curve's time.
+
+        Args:
+            offset (float | 0.0): Frames added to the warp's time, like a member's offset.
+            scale (float | 1.0): Scale of the warp's time, like a member's scale.
+
+        Returns:
+            list of values.
+        """
+        source_curve = maya.cmds.listConnections('{}.translateX'.format(self.locator), source=True,
+                                                 destination=False, type='animCurve')[0]
+        expected = []
+        for frame in FRAMES:
+            warped_time = maya.cmds.getAttr('{}.output'.format(self.warp_curve), time=frame)
+            expected.append(maya.cmds.getAttr('{}.output'.format(source_curve), time=warped_time * scale + offset))
+        return expected
+
+    def get_keys(self):
+        """ Key times and values of the locator's translateX curve.
+
+        Returns:
+            list of tuples of time and value.
+        """
+        curve_node = maya.cmds.listConnections('{}.translateX'.format(self.locator), source=True, destination=False,
+                                               skipConversionNodes=True, type='animCurve')[0]
+        return list(zip(maya.cmds.keyframe(curve_node, query=True, timeChange=True),
+                        maya.cmds.keyframe(curve_node, query=True, valueChange=True)))
+
+    def apply(self):
+        """ Apply the warp to the locator.
+
+        Returns:
+            None
+        """
+        maya.cmds.select(self.locator, replace=True)
+        self.assertTrue(core.apply_warp(self.warp))
+
+    def assert_values(self, expected, places=4):
+        """ Check the locator plays the expected values.
+
+        Args:
+            expected (list): Values at each checked frame.
+            places (int | 4): Decimal places compared.
+
+        Returns:
+            None
+        """
+        for frame, value, expected_value in zip(FRAMES, self.get_values(), expected):
+            self.assertAlmostEqual(value, expected_value, places=places, msg='frame {}'.format(frame))
+
+
+class TestApplyRemove(TestCoreBase):
+    """ Applying and removing warps."""
+
+    def test_create_warp(self):
+        """ A new warp keys its curve at the playback range and drives a settings node."""
+        self.assertEqual(maya.cmds.nodeType(self.warp), 'WarpStatus')
+        self.assertIn(self.warp, core.get_warp_nodes())
+        self.assertEqual(maya.cmds.keyframe(self.warp_curve, query=True, timeChange=True), [1.0, 50.0, 100.0])
+
+    def test_create_warps(self):
+        """ Many warps are made by one DG modifier and keyed by one curve change, so one undo removes them all."""
+        specs = [{'name': 'crowdWarp'}, {'name': 'runWarp', 'start': 10, 'end': 40},
+                 {'name': 'walkWarp', 'keys': [(1, 1), (20, 30), (100, 100)]}]
+
+        counts = core.cmds.begin_phase()
+        try:
+            warps = core.create_warps(specs)
+        finally:
+            core.cmds.end_phase(counts)
+
+        self.assertEqual(len(warps), 3)
+        self.assertEqual(counts['MDGModifier.doIt'], 2)
+        self.assertEqual(counts['MFnAnimCurve.addKeys'], 3)
+        self.assertFalse(any(name in counts for name in ('createNode', 'connectAttr', 'setKeyframe')))
+        self.assertEqual(maya.cmds.keyframe(core.get_warp_curve(warps[1])[0], query=True, timeChange=True),
+                         [10.0, 40.0])
+
+        maya.cmds.undo()
+        self.assertFalse(any(maya.cmds.objExists(warp) for warp in warps))
+        self.assertEqual(core.get_warp_nodes(), [self.warp])
+
+        maya.cmds.redo()
+        self.assertTrue(all(maya.cmds.objExists(warp) for warp in warps))
+        self.assertEqual(maya.cmds.keyframe(core.get_warp_curve(warps[2])[0], query=True, timeChange=True),
+                         [1.0, 20.0, 100.0])
+
+    def test_apply_warp(self):
+        """ Applied warps play the locator's curve at the warp's time."""
+        expected = self.get_expected()
+
+        self.apply()
+
+        self.assertEqual(core.get_warped_nodes(self.warp), [self.locator])
+        self.assertEqual(core.get_node_warps(self.locator), [self.warp])
+        self.assert_values(expected)
+
+    def test_apply_warp_undo(self):
+        """ Applying a warp is one undo step, and redo applies it again."""
+        expected = self.get_expected()
+
+        self.apply()
+        maya.cmds.undo()
+
+        self.assertEqual(core.get_warped_nodes(self.warp), [])
+        self.assert_values(self.source)
+
+        maya.cmds.redo()
+
+        self.assertEqual(core.get_warped_nodes(self.warp), [self.locator])
+        self.assert_values(expected)
+
+    def test_reapply_warp(self):
+        """ Applying a warp again to the same selection only reports the curves it already drives."""
+        maya.cmds.setKeyframe(self.locator, attribute='translateY', time=1, value=2.0)
+        expected = self.get_expected()
+
+        maya.cmds.select(self.locator, replace=True)
+        self.assertEqual(core.apply_warp(self.warp), core.WarpChange(added=2, present=0, removed=0))
+
+        maya.cmds.select(self.locator, replace=True)
+        self.assertEqual(core.apply_warp(self.warp), core.WarpChange(added=0, present=2, removed=0))
+
+        self.assertEqual(len(core.get_driven_curves(self.warp)), 2)
+        self.assertEqual(core.get_warped_nodes(self.warp), [self.locator])
+        self.assert_values(expected)
+
+    def test_apply_empty_member(self):
+        """ A member without nodes walks and warps nothing, rather than walking every node in the scene."""
+        progress = list(core.apply_warp_task(self.warp, members={0: []}))
+
+        self.assertEqual(progress, [core.TaskProgress("Getting Input Nodes.", 0, 0), core.TaskResult(False)])
+        self.assertEqual(core.get_warped_nodes(self.warp), [])
+
+    def test_apply_member(self):
+        """ Members play the warp's time scaled and offset by their timings, which can be changed afterwards."""
+        expected = self.get_expected(offset=5.0, scale=0.5)
+        later = self.get_expected(offset=-2.0, scale=1.5)
+
+        change = core.apply_warp(self.warp, members={0: [self.locator]}, timings={0: (5.0, 0.5)})
+
+        self.assertEqual(change, core.WarpChange(added=1, present=0, removed=0))
+        self.assertEqual(list(core.get_member_curves(self.warp).values()), [0])
+        self.assert_values(expected)
+
+        core.set_member_timings(self.warp, {0: (-2.0, 1.5)})
+        self.assert_values(later)
+
+        maya.cmds.undo()
+        self.assert_values(expected)
+
+    def test_remove_warp(self):
+        """ Removing a warp plays the locator at scene time again, undo puts the warp back."""
+        expected = self.get_expected()
+
+        self.apply()
+        maya.cmds.select(self.locator, replace=True)
+        self.assertTrue(core.remove_warp(self.warp))
+
+        self.assertEqual(core.get_warped_nodes(self.warp), [])
+        self.assert_values(self.source)
+
+        maya.cmds.undo()
+
+        self.assertEqual(core.get_warped_nodes(self.warp), [self.locator])
+        self.assert_values(expected)
+
+    def test_warp_status(self):
+        """ An inactive warp plays scene time."""
+        self.apply()
+        core.set_warp_status(self.warp, False)
+
+        self.assertFalse(core.is_warp_active(self.warp))
+        self.assert_values(self.source)
+
+    def test_task_result(self):
+        """ Tasks only yield progress until their last item, the result run_task returns."""
+        maya.cmds.select(self.locator, replace=True)
+        progress = list(core.apply_warp_task(self.warp))
+
+        self.assertTrue(all(isinstance(item, core.TaskProgress) for item in progress[:-1]))
+        self.assertEqual(progress[-1], core.TaskResult(core.WarpChange(added=1, present=0, removed=0)))
+
+        maya.cmds.select(self.locator, replace=True)
+        self.assertEqual(core.run_task(core.remove_warp_task(self.warp)),
+                         core.WarpChange(added=0, present=0, removed=1))
+
+    def test_cancelled_task(self):
+        """ Closing a task part way undoes what it had done."""
+        maya.cmds.select(self.locator, replace=True)
+        task = core.apply_warp_task(self.warp)
+        next(task)
+        next(task)
+        task.close()
+
+        self.assertEqual(core.get_warped_nodes(self.warp), [])
+        self.assert_values(self.source)
+
+
+class TestWalkInputs(maya_base.TestMayaBase):
+    """ Walking the upstream graph of nodes."""
+
+    def setUp(self):
+        self.new_scene()
+
+        # Two curves drive the locator, both driven by a shared curve upstream.
+        self.locator = maya.cmds.spaceLocator(name='walkedLoc')[0]
+        self.curves = [maya.cmds.createNode('animCurveTU', name=name)
+                       for name in ('leftCurve', 'rightCurve', 'sharedCurve')]
+        maya.cmds.connectAttr(self.curves[0] + '.output', self.locator + '.translateX')
+        maya.cmds.connectAttr(self.curves[1] + '.output', self.locator + '.translateY')
+        maya.cmds.connectAttr(self.curves[2] + '.output', self.curves[0] + '.input')
+        maya.cmds.connectAttr(self.curves[2] + '.output', self.curves[1] + '.input')
+
+    def walk(self):
+        """ Walk the locator's inputs.
+
+        Returns:
+            tuple of last TaskProgress and dict of input nodes to node type.
+        """
+        progress = list(core.walk_inputs_task([self.locator]))
+        self.assertIsInstance(progress[-1], core.TaskResult)
+        return progress[-2], progress[-1].value
+
+    def test_diamond(self):
+        """ A node shared by many downstream nodes is found and walked once."""
+        progress, inputs = self.walk()
+
+        self.assertEqual(inputs, dict((curve, 'animCurveTU') for curve in self.curves))
+        self.assertEqual((progress.done, progress.total), (4, 4))
+
+    def test_cycle(self):
+        """ A cycle ends the walk once every node in it is found."""
+        maya.cmds.connectAttr(self.curves[0] + '.output', self.curves[2] + '.input')
+
+        progress, inputs = self.walk()
+
+        self.assertEqual(inputs, dict((curve, 'animCurveTU') for curve in self.curves))
+        self.assertEqual((progress.done, progress.total), (4, 4))
+
+
+class TestBake(TestCoreBase):
+    """ Baking warps out."""
+
+    def test_bake_simulation(self):
+        """ A simulation bake keys the warped values on every frame and deletes the warp, undo restores it."""
+        self.apply()
+        expected = [self.get_value(frame) for frame in range(1, 101)]
+
+        self.assertTrue(core.bake_warp(self.warp))
+
+        self.assertFalse(maya.cmds.objExists(self.warp))
+        for frame, expected_value in zip(range(1, 101), expected):
+            self.assertAlmostEqual(self.get_value(frame), expected_value, places=4)
+
+        maya.cmds.undo()
+
+        self.assertTrue(maya.cmds.objExists(self.warp))
+        self.assertEqual(core.get_warped_nodes(self.warp), [self.locator])
+
+    def test_bake_simulation_task(self):
+        """ The sliced simulation bake keys exactly what bake_warp does, and is one undo step."""
+        self.apply()
+        warped = self.get_values()
+
+        self.assertTrue(core.bake_warp(self.warp))
+        expected = self.get_keys()
+        maya.cmds.undo()
+
+        self.assertTrue(core.run_task(core.bake_warp_task(self.warp)))
+
+        self.assertFalse(maya.cmds.objExists(self.warp))
+        self.assertEqual(self.get_keys(), expected)
+
+        maya.cmds.undo()
+
+        self.assertTrue(maya.cmds.objExists(self.warp))
+        self.assertEqual(core.get_warped_nodes(self.warp), [self.locator])
+        self.assert_values(warped)
+
+    def test_cancelled_bake_simulation_task(self):
+        """ Closing a simulation bake part way undoes the curves it had baked, and nothing the user did before."""
+        self.apply()
+        warped = self.get_values()
+
+        task = core.bake_warp_task(self.warp)
+        next(task)
+        next(task)
+        task.close()
+
+        self.assertTrue(maya.cmds.objExists(self.warp))
+        self.assert_values(warped)
+
+        # The apply is still there to undo.
+        maya.cmds.undo()
+        self.assertEqual(core.get_warped_nodes(self.warp), [])
+
+    @unittest.skipIf(numpy is None, "Finding where a warp changes time needs NumPy.")
+    def test_warp_range_weighted(self):
+        """ The range is narrowed to where the warp changes time, unless its curve is weighted."""
+        maya.cmds.cutKey(self.warp_curve, time=(50, 50))
+        for frame, value in ((1, 1), (20, 25), (40, 40), (100, 100)):
+            maya.cmds.setKeyframe(self.warp_curve, time=frame, value=value, inTangentType='linear',
+                                  outTangentType='linear')
+        self.apply()
+
+        self.assertEqual(core.get_warp_range(self.warp, handles=0), (1.0, 40.0))
+
+        maya.cmds.keyTangent(self.warp_curve, edit=True, weightedTangents=True)
+        self.assertEqual(core.get_warp_range(self.warp, handles=0), (1.0, 100.0))
+
+    @unittest.skipIf(numpy is None, "Remap bakes need NumPy.")
+    def test_bake_remap(self):
+        """ A remap bake moves the keys to where the warp plays them, curves it can't remap within the tolerance
+        between keys are fitted with new keys."""
+        expected = self.get_expected()
+        self.apply()
+
+        self.assertTrue(core.bake_warp(self.warp, method=core.BAKE_REMAP, tolerance=0.001))
+
+        self.assertFalse(maya.cmds.objExists(self.warp))
+        self.assert_values(expected, places=2)
+
+        maya.cmds.undo()
+
+        self.assertTrue(maya.cmds.objExists(self.warp))
+        self.assert_values(expected)
+
+    @unittest.skipIf(numpy is None, "Remap bakes need NumPy.")
+    def test_bake_remap_exact(self):
+        """ Where the warp only offsets time, remapping is exact and keeps the curve's keys."""
+        maya.cmds.cutKey(self.warp_curve, time=(50, 50))
+        for frame in (1, 100):
+            maya.cmds.setKeyframe(self.warp_curve, time=frame, value=frame + 10)
+        expected = self.get_expected()
+        self.apply()
+
+        self.assertTrue(core.bake_warp(self.warp, method=core.BAKE_REMAP, tolerance=0.001))
+
+        curve_node = maya.cmds.listConnections('{}.translateX'.format(self.locator), type='animCurve')[0]
+        times = maya.cmds.keyframe(curve_node, query=True, timeChange=True)
+        self.assertEqual([round(time, 6) for time in times], [-9.0, 20.0, 60.0, 90.0])
+        self.assert_values(expected)
+
+    @unittest.skipIf(numpy is None, "Remap bakes need NumPy.")
+    def test_bake_remap_weighted(self):
+        """ Curves with weighted tangents can't be remapped, so they're baked by simulation instead."""
+        maya.cmds.cutKey(self.warp_curve, time=(50, 50))
+        for frame in (1, 100):
+            maya.cmds.setKeyframe(self.warp_curve, time=frame, value=frame + 10)
+        maya.cmds.keyTangent(self.locator, attribute='translateX', edit=True, weightedTangents=True)
+        expected = self.get_expected()
+        self.apply()
+
+        self.assertTrue(core.bake_warp(self.warp, method=core.BAKE_REMAP, tolerance=0.001))
+
+        self.assertFalse(maya.cmds.objExists(self.warp))
+        self.assertGreater(len(self.get_keys()), 4)
+        self.assert_values(expected)
+
+    @unittest.skipIf(numpy is None, "Adaptive bakes need NumPy.")
+    def test_bake_adaptive(self):
+        """ An adaptive bake fits keys within the tolerance of the warped curve."""
+        expected = self.get_expected()
+        self.apply()
+
+        self.assertTrue(core.bake_warp(self.warp, method=core.BAKE_ADAPTIVE, tolerance=0.001))
+
+        self.assertFalse(maya.cmds.objExists(self.warp))
+        self.assert_values(expected, places=2)
+
+        maya.cmds.undo()
+
+        self.assertTrue(maya.cmds.objExists(self.warp))
+        self.assert_values(expected)
+
+    @unittest.skipIf(numpy is None, "Adaptive bakes need NumPy.")
+    def test_bake_adaptive_weighted(self):
+        """ A weighted warp curve can't be fitted through, so the warp is baked by simulation instead."""
+        maya.cmds.keyTangent(self.warp_curve, edit=True, weightedTangents=True)
+        expected = self.get_expected()
+        self.apply()
+
+        counts = core.cmds.begin_phase()
+        try:
+            self.assertTrue(core.bake_warp(self.warp, method=core.BAKE_ADAPTIVE, tolerance=0.001))
+        finally:
+            core.cmds.end_phase(counts)
+
+        self.assertFalse(maya.cmds.objExists(self.warp))
+        self.assertEqual(counts['bakeResults'], 1)
+        self.assert_values(expected)
+
+
+class TestPhaseRecords(TestCoreBase):
+    """ Progress phases counting the calls core makes."""
+
+    def test_command_counts(self):
+        """ Phases count commands and the calls of wrapped API objects, maya.cmds itself is left alone."""
+        core.clear_phase_records()
+        self.apply()
+
+        record = core.get_phase_records("Adding Input Nodes.")[-1]
+        self.assertEqual(record['commands']['MDGModifier.connect'], 1)
+        self.assertGreaterEqual(record['commands']['MDGModifier.doIt'], 1)
+        self.assertEqual(record['command_count'], sum(record['commands'].values()))
+        self.assertFalse(isinstance(maya.cmds, counter.CommandCounter))
+        self.assertEqual(core.cmds.phases, [])
+
+    def test_failed_enter(self):
+        """ A progress bar that fails to start leaves nothing counting."""
+        def progress_bar(*args, **kwargs):
+            raise RuntimeError("No progress bar.")
+
+        original = core.get_main_progress_bar, maya.cmds.progressBar
+        core.get_main_progress_bar = lambda: 'mainProgressBar'
+        maya.cmds.progressBar = progress_bar
+        try:
+            self.assertRaises(RuntimeError, core.ProgressBarContextManager(1).__enter__)
+        finally:
+            core.get_main_progress_bar, maya.cmds.progressBar = original
+
+        self.assertEqual(core.cmds.phases, [])
+        self.assertFalse(isinstance(maya.cmds, counter.CommandCounter))
+
+
+class TestAntiWarp(TestCoreBase):
+    """ Anti warps of other warps."""
+
+    def test_inverse_of(self):
+        """ An anti warp of a warp maps its time back onto scene frames."""
+        anti_warp = core.create_warp(warp_name='testWarp', anti_warp=True, inverse_of=self.warp)
+        anti_curve = core.get_warp_curve(anti_warp)[0]
+
+        for frame in FRAMES:
+            warped_time = maya.cmds.getAttr('{}.output'.format(self.warp_curve), time=frame)
+            self.assertAlmostEqual(maya.cmds.getAttr('{}.output'.format(anti_curve), time=warped_time), frame,
+                                   places=2)
+
+    def test_inverse_of_backwards(self):
+        """ A warp that goes back in time can't be inverted and nothing is created."""
+        maya.cmds.setKeyframe(self.warp_curve, time=70, value=20)
+        nodes = set(maya.cmds.ls())
+
+        self.assertRaises(ValueError, core.create_warp, anti_warp=True, inverse_of=self.warp)
+        self.assertEqual(set(maya.cmds.ls()), nodes)
+
+
+class TestCache(TestCoreBase):
+    """ The WarpStatus cache table, built by the plug-in's own code over the scene."""
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCache, cls).setUpClass()
+
+        plugin_folder = os.path.dirname(PLUGIN_PATH)
+        if plugin_folder not in sys.path:
+            sys.path.insert(0, plugin_folder)
+
+        import WarpStatus
+        WarpStatus.WarpStatus.initialize()
+        cls.plugin = WarpStatus
+
+    def get_status(self):
+        """ Plug-in node of the warp.
+
+        Returns:
+            WarpStatus bound to the warp node.
+        """
+        import maya.api.OpenMaya as om
+
+        selection = om.MSelectionList()
+        selection.add(self.warp)
+        return self.plugin.WarpStatus()._bind(selection.getDependNode(0))
+
+    def test_lookup(self):
+        """ The cache gives the same time as the warp curve pulled through the DG."""
+        maya.cmds.setAttr('{}.cacheEnabled'.format(self.warp), True)
+        status = self.get_status()
+        status.build_table()
+
+        self.assertIsNotNone(status.table)
+        for frame in FRAMES:
+            self.assertAlmostEqual(status.lookup(frame), maya.cmds.getAttr('{}.output'.format(self.warp), time=frame),
+                                   places=5, msg='frame {}'.format(frame))
+
+    def test_chained(self):
+        """ A warp curve played by another warp isn't at scene time, so it's never cached."""
+        other_warp = core.create_warp(warp_name='chainWarp')
+        maya.cmds.setKeyframe(core.get_warp_curve(other_warp)[0], time=50, value=70)
+        maya.cmds.connectAttr('{}.output'.format(other_warp), '{}.input'.format(self.warp_curve))
+        maya.cmds.setAttr('{}.cacheEnabled'.format(self.warp), True)
+
+        status = self.get_status()
+        status.build_table()
+
+        self.assertIsNone(status.table)
+        self.assertIsNone(status.lookup(FRAMES[1]))
+
+
+class TestStack(TestCoreBase):
+    """ Baking warp stacks."""
+
+    def setUp(self):
+        super(TestStack, self).setUp()
+
+        self.stack = core.create_stack(stack_name='testStack', warp_curves=[self.warp_curve])
+        maya.cmds.select(self.locator, replace=True)
+        self.assertTrue(core.apply_warp(self.stack))
+
+    @unittest.skipIf(numpy is None, "Finding where a stack changes time needs NumPy.")
+    def test_bake_simulation(self):
+        """ A simulation bake keys what the blended layers play, then deletes the stack."""
+        core.set_stack_layer(self.stack, 0, weight=0.5)
+        expected = self.get_values()
+        self.assertNotEqual(expected, self.source)
+
+        self.assertTrue(core.bake_warp(self.stack))
+
+        self.assertFalse(maya.cmds.objExists(self.stack))
+        self.assert_values(expected)
+
+    @unittest.skipIf(numpy is None, "Remap bakes need NumPy, without it they bake by simulation.")
+    def test_bake_remap(self):
+        """ Stacks have no single warp curve to remap keys through, so the bake is refused."""
+        self.assertRaises(ValueError, core.bake_warp, self.stack, method=core.BAKE_REMAP)
+        self.assertTrue(maya.cmds.objExists(self.stack))
+        self.assertEqual(core.get_warped_nodes(self.stack), [self.locator])
+
+    @unittest.skipIf(numpy is None, "Remap bakes need NumPy, without it they bake by simulation.")
+    def test_bake_warps_remap(self):
+        """ Stacks among many warps are refused before any warp is baked."""
+        other = core.create_warp(warp_name='otherWarp')
+        maya.cmds.setKeyframe(core.get_warp_curve(other)[0], time=50, value=60)
+        locator = maya.cmds.spaceLocator(name='otherLoc')[0]
+        for frame, value in ((1, 0.0), (100, 10.0)):
+            maya.cmds.setKeyframe(locator, attribute='translateX', time=frame, value=value)
+        maya.cmds.select(locator, replace=True)
+        self.assertTrue(core.apply_warp(other))
+
+        self.assertRaises(ValueError, core.bake_warps, [other, self.stack], method=core.BAKE_REMAP)
+        self.assertTrue(maya.cmds.objExists(other))
+        self.assertEqual(core.get_warped_nodes(other), [locator])
+        self.assertTrue(maya.cmds.objExists(self.stack))
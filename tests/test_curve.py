@@ -0,0 +1,265 @@
+""" Warp Curve Tests"""
+
+# python
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import maya_base
+import maya.cmds
+
+
+@unittest.skipIf(numpy is None, "WarpCurve needs NumPy.")
+class TestWarpCurve(maya_base.TestMayaBase):
+    """ Evaluation and inversion of WarpCurve."""
+
+    @classmethod
+    def setUpClass(cls):
+        from timeWarp.scripts import curve
+        cls.curve = curve
+
+    def test_linear(self):
+        """ Linear keys evaluate on the straight line between them and extend it with linear infinity."""
+        warp_curve = self.curve.WarpCurve([0.0, 10.0], [0.0, 20.0], in_types=['linear'] * 2,
+                                          out_types=['linear'] * 2, post_infinity=self.curve.LINEAR)
+
+        numpy.testing.assert_allclose(warp_curve.evaluate([0.0, 2.5, 5.0, 10.0, 15.0]), [0.0, 5.0, 10.0, 20.0, 30.0])
+        numpy.testing.assert_allclose(warp_curve.derivative([1.0, 9.0, 12.0]), [2.0, 2.0, 2.0])
+
+        # Constant infinity holds the first key.
+        self.assertEqual(warp_curve.evaluate(-5.0), 0.0)
+        self.assertEqual(warp_curve.derivative(-5.0), 0.0)
+
+    def test_hermite(self):
+        """ Keys with flat slopes follow the cubic Hermite basis between them."""
+        warp_curve = self.curve.WarpCurve([0.0, 1.0], [0.0, 1.0], in_slopes=[0.0, 0.0], out_slopes=[0.0, 0.0])
+
+        frames = numpy.array([0.0, 0.25, 0.5, 0.75, 1.0])
+        numpy.testing.assert_allclose(warp_curve.evaluate(frames), 3.0 * frames ** 2 - 2.0 * frames ** 3)
+        numpy.testing.assert_allclose(warp_curve.derivative(frames), 6.0 * frames - 6.0 * frames ** 2)
+
+    def test_derivative(self):
+        """ Slopes match finite differences of the values."""
+        warp_curve = self.curve.WarpCurve([1.0, 12.0, 30.0, 41.0], [1.0, 20.0, 22.0, 60.0])
+
+        frames = numpy.linspace(1.5, 40.5, 79)
+        step = 1e-5
+        expected = (warp_curve.evaluate(frames + step) - warp_curve.evaluate(frames - step)) / (2.0 * step)
+
+        numpy.testing.assert_allclose(warp_curve.derivative(frames), expected, rtol=1e-5, atol=1e-6)
+
+    def test_stepped(self):
+        """ Stepped keys hold their value until the next key, stepnext holds the next key's value."""
+        warp_curve = self.curve.WarpCurve([0.0, 10.0, 20.0], [0.0, 5.0, 9.0], out_types=['step', 'stepnext', 'step'])
+
+        numpy.testing.assert_allclose(warp_curve.evaluate([0.0, 9.99, 10.5, 15.0, 19.99, 20.0]),
+                                      [0.0, 0.0, 9.0, 9.0, 9.0, 9.0])
+        self.assertEqual(warp_curve.derivative(5.0), 0.0)
+        self.assertFalse(warp_curve.is_monotonic())
+
+    def test_flat(self):
+        """ A curve that never changes can't be inverted."""
+        warp_curve = self.curve.WarpCurve([0.0, 10.0, 20.0], [5.0, 5.0, 5.0])
+
+        numpy.testing.assert_allclose(warp_curve.evaluate([-1.0, 0.0, 7.0, 20.0, 30.0]), [5.0] * 5)
+        numpy.testing.assert_allclose(warp_curve.derivative([0.0, 7.0, 20.0]), [0.0] * 3)
+        self.assertFalse(warp_curve.is_monotonic())
+        self.assertRaises(ValueError, warp_curve.inverse)
+
+    def test_non_monotonic(self):
+        """ A curve that goes back in time can't be inverted."""
+        warp_curve = self.curve.WarpCurve([0.0, 10.0, 20.0], [0.0, 10.0, 5.0])
+
+        self.assertFalse(warp_curve.is_monotonic())
+        self.assertRaises(ValueError, warp_curve.inverse)
+
+    def test_flat_tangent(self):
+        """ A flat tangent on a key stops time there even when the keys move forward, so it can't be inverted."""
+        warp_curve = self.curve.WarpCurve([0.0, 10.0, 20.0], [0.0, 10.0, 20.0], in_slopes=[1.0, 0.0, 1.0],
+                                          out_slopes=[1.0, 1.0, 1.0])
+
+        self.assertFalse(warp_curve.is_monotonic())
+        with self.assertRaises(ValueError) as context:
+            warp_curve.inverse()
+        self.assertIn('frame 10.0', str(context.exception))
+
+    def test_cycle(self):
+        """ Cycle infinity repeats the keyed range, cycle relative offsets each repeat by the value span."""
+        cycle = self.curve.WarpCurve([0.0, 10.0], [0.0, 4.0], post_infinity=self.curve.CYCLE)
+        relative = self.curve.WarpCurve([0.0, 10.0], [0.0, 4.0], post_infinity=self.curve.CYCLE_RELATIVE)
+
+        numpy.testing.assert_allclose(cycle.evaluate([13.0, 27.5]), cycle.evaluate([3.0, 7.5]))
+        numpy.testing.assert_allclose(relative.evaluate([13.0, 27.5]), relative.evaluate([3.0, 7.5]) + [4.0, 8.0])
+
+    def test_invert(self):
+        """ Inverting a monotonic curve's values gives back the frames, including past its keys."""
+        warp_curve = self.curve.WarpCurve([1.0, 20.0, 40.0], [1.0, 10.0, 40.0], pre_infinity=self.curve.LINEAR,
+                                          post_infinity=self.curve.LINEAR)
+
+        frames = numpy.linspace(-10.0, 50.0, 121)
+        numpy.testing.assert_allclose(warp_curve.invert(warp_curve.evaluate(frames)), frames, atol=1e-9)
+
+    def test_inverse(self):
+        """ The inverse curve maps the curve's values back onto frames within the tolerance."""
+        warp_curve = self.curve.WarpCurve([1.0, 20.0, 40.0], [1.0, 10.0, 40.0])
+        inverse = warp_curve.inverse(tolerance=0.001)
+
+        frames = numpy.linspace(1.0, 40.0, 391)
+        errors = numpy.abs(inverse.evaluate(warp_curve.evaluate(frames)) - frames)
+
+        self.assertLessEqual(errors.max(), 0.001)
+        self.assertEqual(inverse.start, 1.0)
+        self.assertEqual(inverse.end, 40.0)
+
+    def test_retimed(self):
+        """ Retimed curves scale then offset the values and slopes."""
+        warp_curve = self.curve.WarpCurve([0.0, 10.0, 20.0], [0.0, 6.0, 20.0])
+        retimed = warp_curve.retimed(offset=5.0, scale=2.0)
+
+        frames = numpy.linspace(0.0, 20.0, 41)
+        numpy.testing.assert_allclose(retimed.evaluate(frames), warp_curve.evaluate(frames) * 2.0 + 5.0)
+        numpy.testing.assert_allclose(retimed.derivative(frames), warp_curve.derivative(frames) * 2.0)
+
+
+@unittest.skipIf(numpy is None, "WarpCurve needs NumPy.")
+class TestBake(maya_base.TestMayaBase):
+    """ Baking curves played through a warp."""
+
+    @classmethod
+    def setUpClass(cls):
+        from timeWarp.scripts import curve
+        cls.curve = curve
+
+    def test_bake_linear(self):
+        """ A half speed warp on a linear curve bakes to a straight line with two keys."""
+        source = self.curve.WarpCurve([0.0, 100.0], [0.0, 100.0], in_types=['linear'] * 2, out_types=['linear'] * 2)
+        warp = self.curve.WarpCurve([0.0, 100.0], [0.0, 50.0], in_types=['linear'] * 2, out_types=['linear'] * 2)
+
+        baked = self.curve.bake(source, warp, 0.0, 100.0, tolerance=0.01)
+
+        self.assertEqual(len(baked), 2)
+        numpy.testing.assert_allclose(baked.evaluate([0.0, 25.0, 100.0]), [0.0, 12.5, 50.0], atol=1e-9)
+
+    def test_bake_tolerance(self):
+        """ The baked curve stays within tolerance of the warped curve on and between frames."""
+        source = self.curve.WarpCurve([1.0, 15.0, 30.0, 50.0], [0.0, 12.0, -4.0, 8.0])
+        warp = self.curve.WarpCurve([1.0, 25.0, 50.0], [1.0, 12.0, 50.0])
+
+        baked = self.curve.bake(source, warp, 1.0, 50.0, tolerance=0.01)
+
+        frames = numpy.linspace(1.0, 50.0, 981)
+        errors = numpy.abs(baked.evaluate(frames) - source.evaluate(warp.evaluate(frames)))
+
+        self.assertLessEqual(errors.max(), 0.01 * 1.5)
+        self.assertLess(len(baked), 50)
+
+    def test_bake_stepped(self):
+        """ Stepped source keys still land on the warped frame they switch at."""
+        source = self.curve.WarpCurve([0.0, 10.0, 20.0], [0.0, 1.0, 2.0], out_types=['step'] * 3)
+        warp = self.curve.WarpCurve([0.0, 40.0], [0.0, 20.0], in_types=['linear'] * 2, out_types=['linear'] * 2)
+
+        baked = self.curve.bake(source, warp, 0.0, 40.0, tolerance=0.01)
+
+        numpy.testing.assert_allclose(baked.evaluate([0.0, 10.0, 20.0, 30.0, 40.0]), [0.0, 0.0, 1.0, 1.0, 2.0],
+                                      atol=0.01)
+
+    def test_remap_linear_warp(self):
+        """ Remapping through a constant speed warp is exact between keys as well as on them."""
+        source = self.curve.WarpCurve([0.0, 10.0, 20.0], [0.0, 5.0, -3.0])
+        warp = self.curve.WarpCurve([0.0, 40.0], [0.0, 20.0], in_types=['linear'] * 2, out_types=['linear'] * 2)
+
+        remapped, error = self.curve.remap(source, warp, 0.0, 40.0)
+
+        numpy.testing.assert_allclose(remapped.times, [0.0, 20.0, 40.0], atol=1e-9)
+        self.assertLess(error, 1e-9)
+
+    def test_remap_error(self):
+        """ Remapping through a warp that changes speed strays between keys, and the error measures how far."""
+        source = self.curve.WarpCurve([1.0, 30.0, 70.0, 100.0], [0.0, 4.0, -2.0, 10.0])
+        warp = self.curve.WarpCurve([1.0, 50.0, 100.0], [1.0, 30.0, 100.0])
+
+        remapped, error = self.curve.remap(source, warp, 1.0, 100.0)
+
+        frames = numpy.linspace(1.0, 100.0, 397)
+        errors = numpy.abs(remapped.evaluate(frames) - source.evaluate(warp.evaluate(frames)))
+        numpy.testing.assert_allclose(remapped.evaluate(warp.invert(source.times)), source.values, atol=1e-6)
+        self.assertGreater(error, 0.01)
+        self.assertAlmostEqual(error, errors.max(), delta=0.1)
+
+    def test_fit_keys(self):
+        """ Fitting picks a subset of samples that rebuilds them all within tolerance."""
+        frames = numpy.linspace(0.0, 100.0, 401)
+        values = numpy.sin(frames * 0.1) * 10.0
+        slopes = numpy.cos(frames * 0.1)
+
+        fitted = self.curve.fit_keys(frames, values, slopes, 0.01)
+
+        self.assertLessEqual(numpy.abs(fitted.evaluate(frames) - values).max(), 0.01)
+        self.assertLess(len(fitted), len(frames) // 4)
+        self.assertEqual(fitted.in_types, ['fixed'] * len(fitted))
+
+    def test_fit_keys_line(self):
+        """ A straight line only needs its end keys."""
+        frames = numpy.linspace(0.0, 10.0, 21)
+
+        fitted = self.curve.fit_keys(frames, frames * 3.0, numpy.full_like(frames, 3.0), 0.001)
+
+        self.assertEqual(len(fitted), 2)
+
+
+@unittest.skipIf(numpy is None, "WarpCurve needs NumPy.")
+class TestFromMaya(maya_base.TestMayaBase):
+    """ Curves read from the scene evaluate like the scene does."""
+
+    @classmethod
+    def setUpClass(cls):
+        from timeWarp.scripts import curve
+        cls.curve = curve
+
+    def setUp(self):
+        self.new_scene()
+
+    def assert_scene_match(self, curve_node, frames):
+        """ Check a curve read from the scene matches the scene's own evaluation.
+
+        Args:
+            curve_node (str): Maya animCurve node.
+            frames (list): Frames to compare.
+
+        Returns:
+            None
+        """
+        warp_curve = self.curve.WarpCurve.from_maya(curve_node)
+
+        for frame in frames:
+            expected = maya.cmds.getAttr('{}.output'.format(curve_node), time=frame)
+            self.assertAlmostEqual(warp_curve.evaluate(frame), expected, places=4, msg='frame {}'.format(frame))
+
+    def test_tangent_types(self):
+        """ Keys of every tangent type evaluate like the scene, between keys and past them."""
+        locator = maya.cmds.spaceLocator()[0]
+
+        # Stepped tangents only exist on the out side.
+        keys = ((1, 0.0, 'spline', 'spline'), (8, 3.0, 'linear', 'linear'), (15, 3.0, 'flat', 'flat'),
+                (22, -4.0, 'clamped', 'clamped'), (30, 6.0, 'linear', 'step'), (41, 1.0, 'spline', 'spline'))
+        for frame, value, in_tangent, out_tangent in keys:
+            maya.cmds.setKeyframe(locator, attribute='translateY', time=frame, value=value,
+                                  inTangentType=in_tangent, outTangentType=out_tangent)
+
+        curve_node = maya.cmds.listConnections('{}.translateY'.format(locator), type='animCurve')[0]
+        maya.cmds.setAttr('{}.postInfinity'.format(curve_node), self.curve.CYCLE)
+
+        self.assert_scene_match(curve_node, [frame * 0.5 for frame in range(-4, 120)])
+
+    def test_time_curve(self):
+        """ Time to time warp curves evaluate like the scene, including linear infinity."""
+        warp_curve = maya.cmds.createNode('animCurveTT')
+        for frame, value in ((1, 1.0), (24, 10.0), (60, 60.0)):
+            maya.cmds.setKeyframe(warp_curve, time=frame, value=value)
+        maya.cmds.setAttr('{}.preInfinity'.format(warp_curve), self.curve.LINEAR)
+        maya.cmds.setAttr('{}.postInfinity'.format(warp_curve), self.curve.LINEAR)
+
+        self.assert_scene_match(warp_curve, [frame * 0.5 for frame in range(-10, 140)])
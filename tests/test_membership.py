@@ -0,0 +1,107 @@
+""" Time Warp Membership Index Tests"""
+
+# python
+import os
+
+import maya_base
+import maya.cmds
+
+from timeWarp.scripts import core
+from timeWarp.scripts import membership
+
+PLUGIN_PATH = os.path.join(os.path.dirname(maya_base.tests_path), 'plug-ins', 'WarpStatus.py')
+
+
+class TestWarpIndex(maya_base.TestMayaBase):
+    """ Keeping the index current through Maya's callbacks."""
+
+    @classmethod
+    def setUpClass(cls):
+        maya.cmds.loadPlugin(PLUGIN_PATH, quiet=True)
+
+    def setUp(self):
+        self.new_scene()
+        maya.cmds.undoInfo(state=True, infinity=True)
+
+        self.locator = maya.cmds.spaceLocator(name='indexedLoc')[0]
+        maya.cmds.setKeyframe(self.locator, attribute='translateX', time=1, value=0.0)
+        maya.cmds.setKeyframe(self.locator, attribute='translateX', time=10, value=5.0)
+        self.curve = maya.cmds.listConnections(self.locator + '.translateX', source=True, destination=False)[0]
+
+        self.warp = core.create_warp(warp_name='indexWarp')
+
+        # Its own index, so the callbacks are added here rather than by an earlier test.
+        self.index = membership.WarpIndex()
+        self.addCleanup(self.index.reset)
+        self.assertEqual(self.index.warped_nodes(self.warp), [])
+
+    def apply(self):
+        """ Warp the locator.
+
+        Returns:
+            None
+        """
+        maya.cmds.select(self.locator, replace=True)
+        self.assertTrue(core.apply_warp(self.warp))
+
+    def test_connect(self):
+        """ Connecting a warp's output and a warped curve's output both add nodes."""
+        self.apply()
+
+        self.assertEqual(self.index.warped_nodes(self.warp), [self.locator])
+        self.assertEqual(self.index.curves(self.warp), [self.curve])
+        self.assertEqual(self.index.node_warps(self.locator), [self.warp])
+
+        other = maya.cmds.spaceLocator(name='otherLoc')[0]
+        maya.cmds.connectAttr(self.curve + '.output', other + '.translateY')
+
+        self.assertEqual(self.index.count(self.warp), 2)
+        self.assertTrue(self.index.is_warped(other, self.warp))
+
+    def test_disconnect(self):
+        """ Removing a warp drops its nodes."""
+        self.apply()
+        self.assertEqual(self.index.count(self.warp), 1)
+
+        maya.cmds.select(self.locator, replace=True)
+        self.assertTrue(core.remove_warp(self.warp))
+
+        self.assertEqual(self.index.warped_nodes(self.warp), [])
+        self.assertEqual(self.index.node_warps(self.locator), [])
+
+    def test_node_removed(self):
+        """ Deleting a warp drops it from the index, undo brings it back."""
+        self.apply()
+        self.assertEqual(self.index.count(self.warp), 1)
+
+        maya.cmds.delete(self.warp)
+
+        self.assertEqual(self.index.warped_nodes(self.warp), [])
+        self.assertEqual(self.index.node_warps(self.locator), [])
+
+        maya.cmds.undo()
+
+        self.assertEqual(self.index.warped_nodes(self.warp), [self.locator])
+
+    def test_rename(self):
+        """ Renamed warps and nodes are found under their new names."""
+        self.apply()
+        self.assertEqual(self.index.count(self.warp), 1)
+
+        locator = maya.cmds.rename(self.locator, 'renamedLoc')
+        self.assertEqual(self.index.warped_nodes(self.warp), [locator])
+
+        warp = maya.cmds.rename(self.warp, 'renamedWarp')
+        self.assertEqual(self.index.warped_nodes(warp), [locator])
+        self.assertEqual(self.index.warped_nodes(self.warp), [])
+        self.assertEqual(self.index.node_warps(locator), [warp])
+
+    def test_new_scene(self):
+        """ A new scene empties the index."""
+        self.apply()
+        self.assertEqual(self.index.count(self.warp), 1)
+
+        self.new_scene()
+
+        self.assertEqual(self.index.warped_nodes(self.warp), [])
+        self.assertEqual(self.index.node_warps(self.locator), [])